@@ -0,0 +1,64 @@
+#####################################################################################
+#       Dradis-Client: Compressed vs. plain bodies for a large evidence import      #
+#####################################################################################
+# Usage: python benchmarks/bench_compression.py [evidence count] [link speed in KB/s]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dradis import DradisClient  # noqa: E402
+from stub_server import StubDradisServer  # noqa: E402
+
+
+def tool_output(i: int) -> str:
+    """
+    Scanner output like it ends up in evidence: long, repetitive text.
+    """
+    lines = [f'{port}/tcp open  http    nginx 1.18.{i % 7} | http-title: Login | ssl-cert: CN=host-{i}.example.com'
+             for port in range(8000, 8080)]
+    return '\n'.join(lines)
+
+
+def run(count: int, bandwidth: int, compress: bool) -> dict:
+    with StubDradisServer(latency=0.005, bandwidth=bandwidth, compress=compress) as server:
+        pid = server.dradis.add_project('Compression')['id']
+        node_ids = [server.dradis.create_node(pid, {'label': f'10.0.0.{i}'})['id'] for i in range(10)]
+        issue_id = server.dradis.create_issue(pid, '#[Title]#\nOpen ports')['id']
+        evidence = [{'node_id': node_ids[i % len(node_ids)], 'issue_id': issue_id,
+                     'evidence_properties': {'Port': str(8000 + i), 'Output': tool_output(i)}} for i in range(count)]
+
+        with DradisClient('bench', server.url, pool_maxsize=8, compress_min_size=1024 if compress else None) as client:
+            start = time.perf_counter()
+            report = client.bulk_import(pid, evidence=evidence, workers=8)
+            upload = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read = sum(len(client.get_evidence_list(pid, node_id)) for node_id in node_ids)
+            download = time.perf_counter() - start
+
+        errors = sum(1 for item in report['evidence'] if item['error'])
+        return {'upload': upload, 'download': download, 'bytes_in': server.traffic['bytes_in'],
+                'bytes_out': server.traffic['bytes_out'], 'errors': errors, 'read': read}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    bandwidth = int(float(sys.argv[2]) * 1000) if len(sys.argv) > 2 else 1000 * 1000
+
+    plain = run(count, bandwidth, compress=False)
+    compressed = run(count, bandwidth, compress=True)
+
+    print(f'{count} pieces of evidence over a {bandwidth / 1000:.0f} KB/s link')
+    print(f'{"":12} {"upload":>10} {"sent":>12} {"read back":>10} {"received":>12}')
+    for name, result in (('plain', plain), ('compressed', compressed)):
+        print(f'{name:12} {result["upload"]:9.2f}s {result["bytes_in"]:12} {result["download"]:9.2f}s '
+              f'{result["bytes_out"]:12}' + (f'  ({result["errors"]} errors)' if result['errors'] else ''))
+    print(f'{"saving":12} {plain["upload"] / compressed["upload"]:9.1f}x '
+          f'{1 - compressed["bytes_in"] / plain["bytes_in"]:12.0%} '
+          f'{plain["download"] / compressed["download"]:9.1f}x {1 - compressed["bytes_out"] / plain["bytes_out"]:12.0%}')
+
+
+if __name__ == '__main__':
+    main()
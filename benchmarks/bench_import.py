@@ -0,0 +1,51 @@
+#####################################################################################
+#              Dradis-Client: Import time of the dradis package                     #
+#####################################################################################
+# Usage: python benchmarks/bench_import.py [threshold in seconds]
+# Exits with status 1 if "import dradis" takes longer than the threshold (best of N fresh interpreters)
+# or if it pulls in one of the heavy optional dependencies.
+import os
+import subprocess
+import sys
+
+RUNS = 7
+DEFAULT_THRESHOLD = 0.25  # seconds, requests itself accounts for most of it
+HEAVY_MODULES = ('requests_html', 'pyppeteer', 'lxml', 'parse', 'aiohttp', 'asyncio', 'sqlite3', 'concurrent.futures',
+                 'gzip', 'html.parser')
+
+PROBE = f'''
+import sys, time
+start = time.perf_counter()
+import dradis
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+'''
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_THRESHOLD
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+
+    timings = []
+    heavy = ''
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', PROBE], env=env, check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout.split(' ')
+        timings.append(float(output[0]))
+        heavy = output[1].strip()
+
+    best = min(timings)
+    print(f'import dradis: best {best * 1000:.1f} ms, median {sorted(timings)[RUNS // 2] * 1000:.1f} ms '
+          f'(threshold {threshold * 1000:.0f} ms)')
+
+    if heavy:
+        print(f'FAIL: import dradis loaded {heavy}')
+        sys.exit(1)
+    if best > threshold:
+        print('FAIL: import time regressed past the threshold')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#####################################################################################
+#        Dradis-Client: Per-call logging overhead with debug logging disabled       #
+#####################################################################################
+# Usage: python benchmarks/bench_logging.py
+import logging
+import os
+import sys
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dradis import DradisClient  # noqa: E402
+
+SIZES = (1024, 64 * 1024, 1024 * 1024, 4 * 1024 * 1024)
+
+
+def fake_response(size: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b'[' + b'{"id": 1, "content": "x"},' * (size // 27) + b'{}]'
+    response.request = requests.Request('GET', 'http://dradis.local/pro/api/nodes').prepare()
+    return response
+
+
+def main():
+    client = DradisClient('bench', 'http://dradis.local', debug=False)
+    logger = logging.getLogger('PyDradis3ng')
+    logger.setLevel(logging.WARNING)
+
+    def previous(results):
+        # What contact_dradis did before: print the response and format the whole body eagerly.
+        with open(os.devnull, 'w') as devnull:
+            print(results, file=devnull)
+        logger.debug(f'Server Response:\n{results.status_code}\n---\n{results.content}')
+
+    print(f'{"body size":>12} {"previous":>14} {"current":>14}')
+    for size in SIZES:
+        response = fake_response(size)
+        number = 20 if size > 64 * 1024 else 2000
+        old = min(timeit.repeat(lambda: previous(response), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: client._log_response(response), number=number, repeat=3)) / number
+        print(f'{len(response.content):>12} {old * 1e6:>11.2f} us {new * 1e6:>11.2f} us')
+
+
+if __name__ == '__main__':
+    main()
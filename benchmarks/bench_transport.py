@@ -0,0 +1,50 @@
+#####################################################################################
+#     Dradis-Client: Pooled transport vs. one requests.Session() per call           #
+#####################################################################################
+# Usage: python benchmarks/bench_transport.py [number of calls]
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dradis import DradisClient  # noqa: E402
+from stub_server import StubDradisServer  # noqa: E402
+
+
+def per_call_session(url: str, calls: int) -> float:
+    """
+    The previous behaviour of contact_dradis: a fresh Session (and connection) for every call.
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        r = requests.Request('GET', url, headers={'Authorization': 'Token token=bench'}).prepare()
+        s = requests.Session()
+        s.send(r).json()
+        s.close()
+    return calls / (time.perf_counter() - start)
+
+
+def pooled_client(server_url: str, calls: int) -> float:
+    with DradisClient('bench', server_url) as client:
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get_project(pid=1)
+        return calls / (time.perf_counter() - start)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with StubDradisServer() as server:
+        baseline = per_call_session(server.url + DradisClient.project_endpoint + '/1', calls)
+        pooled = pooled_client(server.url, calls)
+
+    print(f'per-call session : {baseline:10.1f} req/s')
+    print(f'pooled transport : {pooled:10.1f} req/s ({pooled / baseline:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#####################################################################################
+#          Dradis-Client: End-to-end benchmark suite against the fake API           #
+#####################################################################################
+# Usage: python benchmarks/run_suite.py [--latency MS] [--scale N] [--output results.json]
+#                                       [--compare baseline.json] [--only name,name]
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dradis import DradisClient, ValidatorStore  # noqa: E402
+from stub_server import StubDradisServer  # noqa: E402
+
+
+def _summary(latencies: list, seconds: float, ops=None) -> dict:
+    """
+    Throughput and latency percentiles (in ms) of a run.
+    """
+    ops = len(latencies) if ops is None else ops
+    result = {'ops': ops, 'seconds': round(seconds, 4), 'ops_per_sec': round(ops / seconds, 1) if seconds else 0.0}
+    if latencies:
+        ordered = sorted(latencies)
+        for name, q in (('p50_ms', 0.50), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+            result[name] = round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000, 3)
+    return result
+
+
+def _timed(calls: int, fn) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    for i in range(calls):
+        call_start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - call_start)
+    return _summary(latencies, time.perf_counter() - start)
+
+
+####################################
+#             Scenarios            #
+####################################
+
+def single_get(client, server, scale):
+    return _timed(500 * scale, lambda i: client.get_project(pid=1))
+
+
+def single_create(client, server, scale):
+    return _timed(200 * scale, lambda i: client.create_issue(pid=1, title=f'Issue {i}',
+                                                             issue_properties={'Rating': 'Low'}))
+
+
+def bulk_import(client, server, scale):
+    pid = server.dradis.add_project('Bulk import')['id']
+    count = 200 * scale
+    nodes = [{'ref': f'n{i}', 'label': f'10.0.{i // 250}.{i % 250}'} for i in range(count)]
+    issues = [{'ref': f'i{i}', 'title': f'Issue {i}', 'issue_properties': {'Rating': 'High'}} for i in range(count // 10)]
+    evidence = [{'node_ref': f'n{i}', 'issue_ref': f'i{i % len(issues)}', 'evidence_properties': {'Port': '443/tcp'}}
+                for i in range(count)]
+    start = time.perf_counter()
+    report = client.bulk_import(pid, nodes=nodes, issues=issues, evidence=evidence, workers=8)
+    result = _summary([], time.perf_counter() - start, ops=len(nodes) + len(issues) + len(evidence))
+    result['errors'] = sum(1 for items in report.values() for item in items if item['error'])
+    return result
+
+
+def _populated(server, scale) -> int:
+    pid = server.dradis.add_project('List scan')['id']
+    server.dradis.populate(pid, nodes=500 * scale, issues=50, evidence_per_node=3, notes_per_node=1, depth=3)
+    return pid
+
+
+def list_scan(client, server, scale):
+    pid = _populated(server, scale)
+    start = time.perf_counter()
+    items = sum(1 for _ in client.iter_nodes(pid)) + sum(1 for _ in client.iter_issues(pid))
+    return _summary([], time.perf_counter() - start, ops=items)
+
+
+def node_walk(client, server, scale):
+    """
+    The N+1 pattern: the evidence and notes of every node, one listing per node.
+    """
+    pid = _populated(server, scale)
+    start = time.perf_counter()
+    items = 0
+    for node in client.iter_nodes(pid):
+        items += len(client.get_evidence_list(pid, node['id'])) + len(client.get_note_list(pid, node['id']))
+    return _summary([], time.perf_counter() - start, ops=items)
+
+
+def incremental_sync(client, server, scale):
+    pid = _populated(server, scale)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest = os.path.join(temp_dir, 'manifest.json')
+        start = time.perf_counter()
+        client.sync_project(pid, manifest)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = client.sync_project(pid, manifest)
+        incremental = time.perf_counter() - start
+    result = _summary([], incremental, ops=report['nodes']['unchanged'])
+    result['full_seconds'] = round(full, 4)
+    return result
+
+
+def conditional_poll(client, server, scale):
+    """
+    Polling unchanged nodes (with their evidence and notes) through conditional GETs; plain_seconds is the same
+    polling without validators.
+    """
+    pid = _populated(server, scale)
+    node_ids = list(server.dradis.data[pid]['nodes'])[:50]
+    calls = 500 * scale
+    result = _timed(calls, lambda i: client.get_node(pid, node_ids[i % len(node_ids)]))
+    with DradisClient('bench', server.url, validators=ValidatorStore()) as conditional_client:
+        conditional = _timed(calls, lambda i: conditional_client.get_node(pid, node_ids[i % len(node_ids)]))
+        stats = conditional_client.validators.stats()
+    conditional['plain_seconds'] = result['seconds']
+    conditional['hit_ratio'] = round(stats['hit_ratio'], 3)
+    conditional['bytes_saved'] = stats['bytes_saved']
+    return conditional
+
+
+def attachment_transfer(client, server, scale):
+    pid = server.dradis.add_project('Attachments')['id']
+    node_ids = [server.dradis.create_node(pid, {'label': f'host-{i}'})['id'] for i in range(4)]
+    size = 1024 * 1024
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(4 * scale):
+            path = os.path.join(temp_dir, f'file-{i}.bin')
+            with open(path, 'wb') as out_file:
+                out_file.write(os.urandom(size))
+            paths.append(path)
+
+        uploads = {node_id: paths[i::len(node_ids)] for i, node_id in enumerate(node_ids)}
+        upload = client.create_attachments(pid, uploads, files_per_request=2, workers=4)
+        download = client.download_attachments(pid, node_ids, os.path.join(temp_dir, 'download'), 'cookie',
+                                               workers=4, skip_existing=False)
+
+    return {'ops': len(paths), 'bytes': upload['bytes'],
+            'upload_mb_per_sec': round(upload['bytes_per_sec'] / 1e6, 2),
+            'download_mb_per_sec': round(download['bytes_per_sec'] / 1e6, 2),
+            'seconds': round(upload['seconds'] + download['seconds'], 4)}
+
+
+SCENARIOS = {'single_get': single_get, 'single_create': single_create, 'bulk_import': bulk_import,
+             'list_scan': list_scan, 'node_walk': node_walk, 'incremental_sync': incremental_sync,
+             'conditional_poll': conditional_poll, 'attachment_transfer': attachment_transfer}
+
+
+####################################
+#             Reporting            #
+####################################
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict):
+    print(f'\n{"scenario":<22} {"metric":<20} {"baseline":>12} {"current":>12} {"change":>9}')
+    for name, metrics in results['results'].items():
+        old_metrics = baseline.get('results', {}).get(name, {})
+        for metric, value in metrics.items():
+            old = old_metrics.get(metric)
+            if metric in ('ops', 'bytes', 'errors', 'bytes_saved') or not isinstance(old, (int, float)) or not old:
+                continue
+            print(f'{name:<22} {metric:<20} {old:>12} {value:>12} {(value - old) / old * 100:>8.1f}%')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmarks of DradisClient against a fake Dradis API.')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency per request in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='additional random latency in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of requests answered with a 503')
+    parser.add_argument('--scale', type=int, default=1, help='multiplies the size of every scenario')
+    parser.add_argument('--only', help='comma separated scenario names')
+    parser.add_argument('--output', default='bench_results.json', help='JSON file for the results')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    args = parser.parse_args()
+
+    names = args.only.split(',') if args.only else list(SCENARIOS)
+    results = {'commit': _commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'python': platform.python_version(), 'platform': platform.platform(),
+               'config': {'latency_ms': args.latency, 'jitter_ms': args.jitter, 'error_rate': args.error_rate,
+                          'scale': args.scale},
+               'results': {}}
+
+    for name in names:
+        with StubDradisServer(latency=args.latency / 1000, jitter=args.jitter / 1000,
+                              error_rate=args.error_rate) as server:
+            with DradisClient('bench', server.url) as client:
+                results['results'][name] = result = SCENARIOS[name](client, server, args.scale)
+        print(f'{name:<22} ' + '  '.join(f'{key}={value}' for key, value in result.items()))
+
+    with open(args.output, 'w') as out_file:
+        json.dump(results, out_file, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.compare:
+        with open(args.compare, 'r') as baseline_file:
+            compare(results, json.load(baseline_file))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,756 @@
+#####################################################################################
+#            Dradis-Client: In-process fake Dradis Pro API for the benchmarks       #
+#####################################################################################
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from dradis import markup  # noqa: E402
+from dradis.metrics import endpoint_template  # noqa: E402
+
+
+class FakeDradis:
+    """
+    In-memory state of the fake server: teams, users, projects and per project nodes, issues, evidence, notes,
+    content blocks, document properties and attachments, plus the IssueLibrary. Responses follow the shape of the
+    Dradis Pro API. Creating, updating or deleting evidence and notes touches updated_at of their node.
+
+    @page_size: items per page when a list is requested with ?page=N (Dradis uses 25).
+    @embed_children: include 'evidence' and 'notes' in the node list, as Dradis does.
+    """
+
+    def __init__(self, page_size=25, embed_children=True):
+        self.page_size = page_size
+        self.embed_children = embed_children
+        self.lock = threading.RLock()
+        self.counts = Counter()  # 'METHOD /endpoint/template' -> number of requests
+        self.__ids = Counter()  # Ids are counted per resource, as in Dradis' tables
+        self.__last_time = datetime.now(timezone.utc)
+
+        self.teams = {}
+        self.users = {}
+        self.projects = {}
+        self.data = {}  # pid -> dict of the project's resources
+        self.issuelib = {}
+
+        team = self.add_team('Stub Team')
+        self.add_user('Stub User', 'stub@example.com')
+        self.add_project('Stub Project', team['id'])
+
+    def next_id(self, resource: str) -> int:
+        with self.lock:
+            self.__ids[resource] += 1
+            return self.__ids[resource]
+
+    def now(self) -> str:
+        # Strictly increasing, so every change gets a new updated_at.
+        with self.lock:
+            current = max(datetime.now(timezone.utc), self.__last_time + timedelta(microseconds=1))
+            self.__last_time = current
+            return current.isoformat()
+
+    ####################################
+    #              Seeding             #
+    ####################################
+
+    def add_team(self, name: str) -> dict:
+        stamp = self.now()
+        team = {'id': self.next_id('teams'), 'name': name, 'team_since': stamp[:10], 'created_at': stamp,
+                'updated_at': stamp}
+        self.teams[team['id']] = team
+        return team
+
+    def add_user(self, name: str, email: str) -> dict:
+        stamp = self.now()
+        user = {'id': self.next_id('users'), 'name': name, 'email': email, 'created_at': stamp, 'updated_at': stamp}
+        self.users[user['id']] = user
+        return user
+
+    def add_project(self, name: str, team_id=None) -> dict:
+        stamp = self.now()
+        team = self.teams.get(team_id)
+        project = {'id': self.next_id('projects'), 'name': name,
+                   'team': {'id': team['id'], 'name': team['name']} if team else None,
+                   'users': [{'id': user['id'], 'email': user['email']} for user in self.users.values()],
+                   'created_at': stamp, 'updated_at': stamp}
+        self.projects[project['id']] = project
+        # 'children' maps node id -> {'evidence': {id: evidence}, 'notes': {id: note}}.
+        self.data[project['id']] = {'nodes': {}, 'issues': {}, 'evidence': {}, 'notes': {}, 'content_blocks': {},
+                                    'document_properties': {}, 'attachments': {}, 'children': {}}
+        return project
+
+    def populate(self, pid: int, nodes=100, issues=20, evidence_per_node=3, notes_per_node=1, content_blocks=5,
+                 depth=2, field_size=200) -> dict:
+        """
+        Fills a project with a node tree of the given depth, issues, evidence, notes, content blocks and
+        document properties. Returns the number of created items per resource.
+        """
+        text = 'x' * field_size
+        issue_ids = [self.create_issue(pid, markup.dumps([('Title', f'Issue {i}'), ('Rating', 'High'),
+                                                          ('Description', text)]))['id']
+                     for i in range(issues)]
+
+        # Level i of the tree gets a share of (i + 1) / (1 + 2 + ... + depth) of the nodes.
+        parents = [None]
+        created = 0
+        for level in range(depth):
+            size = nodes - created if level == depth - 1 else nodes * (level + 1) * 2 // (depth * (depth + 1))
+            children = []
+            for i in range(max(1, size) if size > 0 else 0):
+                node = self.create_node(pid, {'label': f'node-{created}', 'type_id': 1,
+                                              'parent_id': parents[i % len(parents)], 'position': i})
+                children.append(node['id'])
+                created += 1
+            parents = children or parents
+
+        for node_id in list(self.data[pid]['nodes']):
+            for i in range(evidence_per_node if issue_ids else 0):
+                self.create_evidence(pid, node_id, markup.dumps({'Port': f'{i}/tcp', 'Output': text}),
+                                     issue_ids[(node_id + i) % len(issue_ids)])
+            for i in range(notes_per_node):
+                self.create_note(pid, node_id, markup.dumps({'Title': f'Note {i}', 'Text': text}), 1)
+
+        for i in range(content_blocks):
+            self.create_content_block(pid, markup.dumps({'Title': f'Block {i}', 'Text': text}), 'Summary')
+        self.data[pid]['document_properties'].update({'dradis.client': 'ACME', 'dradis.project': f'Project {pid}'})
+
+        return {resource: len(items) for resource, items in self.data[pid].items() if resource != 'children'}
+
+    ####################################
+    #            Resources             #
+    ####################################
+
+    def _touch(self, pid: int, node_id: int):
+        node = self.data[pid]['nodes'].get(node_id)
+        if node is not None:
+            node['updated_at'] = self.now()
+
+    def render_node(self, pid: int, node: dict, children=True) -> dict:
+        result = dict(node)
+        if children:
+            items = self.children(pid, node['id'])
+            result['evidence'] = [self.render_evidence(pid, item) for item in items['evidence'].values()]
+            result['notes'] = [self.render(item) for item in items['notes'].values()]
+        return result
+
+    def children(self, pid: int, node_id: int) -> dict:
+        return self.data[pid]['children'].setdefault(node_id, {'evidence': {}, 'notes': {}})
+
+    def delete_child(self, pid: int, resource: str, item: dict):
+        del self.data[pid][resource][item['id']]
+        self.children(pid, item['node_id'])[resource].pop(item['id'], None)
+        self._touch(pid, item['node_id'])
+
+    def render_evidence(self, pid: int, evidence: dict) -> dict:
+        result = self.render(evidence)
+        issue = self.data[pid]['issues'].get(evidence['issue_id'])
+        result['issue'] = {'id': evidence['issue_id'], 'title': issue['title'] if issue else None,
+                           'url': f'/pro/api/issues/{evidence["issue_id"]}'}
+        del result['issue_id']
+        return result
+
+    @staticmethod
+    def render(item: dict) -> dict:
+        return {key: value for key, value in item.items() if key != 'node_id'}
+
+    def create_node(self, pid: int, data: dict) -> dict:
+        stamp = self.now()
+        parent_id = data.get('parent_id')
+        node = {'id': self.next_id('nodes'), 'label': data.get('label'), 'type_id': int(data.get('type_id') or 0),
+                'parent_id': int(parent_id) if parent_id not in (None, '') else None,
+                'position': int(data.get('position') or 0), 'created_at': stamp, 'updated_at': stamp}
+        self.data[pid]['nodes'][node['id']] = node
+        return node
+
+    def update_node(self, node: dict, data: dict) -> dict:
+        for key in ('type_id', 'parent_id', 'position'):
+            if data.get(key) is not None:
+                node[key] = int(data[key])
+        if data.get('label') is not None:
+            node['label'] = data['label']
+        node['updated_at'] = self.now()
+        return node
+
+    def _text_record(self, resource: str, text_key: str, text: str, **extra) -> dict:
+        stamp = self.now()
+        fields = markup.loads(text)
+        record = {'id': self.next_id(resource), 'title': fields.get('Title'), 'fields': fields, text_key: text,
+                  'created_at': stamp, 'updated_at': stamp}
+        record.update(extra)
+        return record
+
+    def update_text(self, record: dict, text_key: str, text: str, **extra) -> dict:
+        fields = markup.loads(text)
+        record.update({'title': fields.get('Title'), 'fields': fields, text_key: text, 'updated_at': self.now()})
+        record.update(extra)
+        return record
+
+    @staticmethod
+    def _tags(fields: dict) -> list:
+        # Like Dradis, the tags of an issue are listed from its #[Tags]# field.
+        return [{'name': tag.strip()} for tag in fields.get('Tags', '').split(',') if tag.strip()]
+
+    def create_issue(self, pid: int, text: str) -> dict:
+        issue = self._text_record('issues', 'text', text)
+        issue['tags'] = self._tags(issue['fields'])
+        self.data[pid]['issues'][issue['id']] = issue
+        return issue
+
+    def update_issue(self, issue: dict, text: str) -> dict:
+        self.update_text(issue, 'text', text)
+        issue['tags'] = self._tags(issue['fields'])
+        return issue
+
+    def create_evidence(self, pid: int, node_id: int, content: str, issue_id) -> dict:
+        evidence = self._text_record('evidence', 'content', content, node_id=node_id, issue_id=int(issue_id))
+        del evidence['title']
+        self.data[pid]['evidence'][evidence['id']] = evidence
+        self.children(pid, node_id)['evidence'][evidence['id']] = evidence
+        self._touch(pid, node_id)
+        return evidence
+
+    def create_note(self, pid: int, node_id: int, text: str, category_id) -> dict:
+        note = self._text_record('notes', 'text', text, node_id=node_id, category_id=int(category_id or 0))
+        self.data[pid]['notes'][note['id']] = note
+        self.children(pid, node_id)['notes'][note['id']] = note
+        self._touch(pid, node_id)
+        return note
+
+    def create_content_block(self, pid: int, content: str, block_group=None) -> dict:
+        block = self._text_record('content_blocks', 'content', content, block_group=block_group)
+        self.data[pid]['content_blocks'][block['id']] = block
+        return block
+
+    def create_issuelib_entry(self, content: str) -> dict:
+        entry = self._text_record('issuelib', 'content', content, state='published')
+        self.issuelib[entry['id']] = entry
+        return entry
+
+
+def _paginate(items: list, query: dict, page_size: int) -> list:
+    if 'page' not in query or not page_size:
+        return items
+    page = max(1, int(query['page'][0]))
+    return items[(page - 1) * page_size:page * page_size]
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like a real Dradis server behind nginx
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body):
+        payload = json.dumps(body).encode()
+        if self.command == 'GET' and status == 200:
+            # Like Rack::ETag and Rack::ConditionalGet in front of the Rails app.
+            etag = f'W/"{hashlib.md5(payload).hexdigest()}"'
+            if etag in self.headers.get('If-None-Match', ''):
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if self.server.compress and len(payload) >= 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            # Like nginx with gzip on and gzip_min_length 1024.
+            payload = gzip.compress(payload, compresslevel=6)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        if self.command == 'GET' and status == 200:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.server.transfer(len(payload), 'bytes_out')
+        self.wfile.write(payload)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    body = b''.join(chunks)
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+        else:
+            length = int(self.headers.get('Content-Length', 0))
+            body = self.rfile.read(length) if length else b''
+
+        self.server.transfer(len(body), 'bytes_in')
+        if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        return body
+
+    def _json_body(self) -> dict:
+        body = self._read_body()
+        return json.loads(body) if body else {}
+
+    def _dispatch(self, method: str):
+        server = self.server
+        store = server.dradis
+        parts = urlsplit(self.path)
+        path, query = unquote(parts.path), parse_qs(parts.query)
+
+        with store.lock:
+            store.counts[f'{method} {endpoint_template(path)}'] += 1
+        server.delay()
+        status = server.take_error(method, path)
+        if status is not None:
+            if method in ('POST', 'PUT'):
+                self._read_body()
+            return self._send_json(status, {'message': 'Injected error'})
+
+        for route_method, pattern, handler in _ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match is not None:
+                with store.lock:
+                    return handler(self, store, query, *match.groups())
+
+        if method in ('POST', 'PUT'):
+            self._read_body()
+        self._send_json(404, {'message': 'Resource not found'})
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_HEAD(self):
+        self._dispatch('HEAD')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _project(self, store: FakeDradis):
+        """
+        Returns the resources of the project in the Dradis-Project-Id header, or sends a 404 and returns None.
+        """
+        pid = self.headers.get('Dradis-Project-Id')
+        project = store.data.get(int(pid)) if pid and pid.isdigit() else None
+        if project is None:
+            if self.command in ('POST', 'PUT'):
+                self._read_body()
+            self._send_json(404, {'message': 'Project not found'})
+        return project
+
+    ####################################
+    #     Teams, Users and Projects    #
+    ####################################
+
+    def _collection(self, store: FakeDradis, items: dict, query: dict, item_id, data_key, create, update):
+        """
+        Shared CRUD handling of teams, projects and IssueLibrary entries.
+        """
+        if item_id is None:
+            if self.command == 'GET':
+                return self._send_json(200, _paginate(list(items.values()), query, store.page_size))
+            return self._send_json(201, create(self._json_body().get(data_key, {})))
+
+        item = items.get(int(item_id))
+        if item is None:
+            if self.command == 'PUT':
+                self._read_body()
+            return self._send_json(404, {'message': 'Resource not found'})
+        if self.command == 'GET':
+            return self._send_json(200, item)
+        if self.command == 'PUT':
+            return self._send_json(200, update(item, self._json_body().get(data_key, {})))
+        del items[int(item_id)]
+        return self._send_json(200, {'message': 'Resource deleted successfully'})
+
+    def teams(self, store, query, team_id=None):
+        def update(team, data):
+            team.update({'name': data.get('name', team['name']), 'updated_at': store.now()})
+            return team
+
+        self._collection(store, store.teams, query, team_id, 'team',
+                         lambda data: store.add_team(data.get('name')), update)
+
+    def users(self, store, query, user_id=None):
+        if user_id is None:
+            return self._send_json(200, list(store.users.values()))
+        user = store.users.get(int(user_id))
+        self._send_json(200 if user else 404, user or {'message': 'Resource not found'})
+
+    def projects(self, store, query, pid=None):
+        def update(project, data):
+            team = store.teams.get(int(data['team_id'])) if data.get('team_id') else None
+            project['name'] = data.get('name', project['name'])
+            if team is not None:
+                project['team'] = {'id': team['id'], 'name': team['name']}
+            project['updated_at'] = store.now()
+            return project
+
+        def create(data):
+            return store.add_project(data.get('name'), int(data['team_id']) if data.get('team_id') else None)
+
+        self._collection(store, store.projects, query, pid, 'project', create, update)
+        if pid is not None and self.command == 'DELETE':
+            store.data.pop(int(pid), None)
+
+    def issuelib(self, store, query, entry_id=None):
+        self._collection(store, store.issuelib, query, entry_id, 'entry',
+                         lambda data: store.create_issuelib_entry(data.get('content', '')),
+                         lambda entry, data: store.update_text(entry, 'content', data.get('content', '')))
+
+    ####################################
+    #         Project resources        #
+    ####################################
+
+    def nodes(self, store, query, node_id=None):
+        project = self._project(store)
+        if project is None:
+            return
+        pid = int(self.headers['Dradis-Project-Id'])
+
+        if node_id is None:
+            if self.command == 'GET':
+                nodes = _paginate(list(project['nodes'].values()), query, store.page_size)
+                return self._send_json(200, [store.render_node(pid, node, store.embed_children) for node in nodes])
+            return self._send_json(201, store.create_node(pid, self._json_body().get('node', {})))
+
+        node = project['nodes'].get(int(node_id))
+        if node is None:
+            if self.command == 'PUT':
+                self._read_body()
+            return self._send_json(404, {'message': 'Resource not found'})
+        if self.command == 'GET':
+            return self._send_json(200, store.render_node(pid, node))
+        if self.command == 'PUT':
+            return self._send_json(200, store.update_node(node, self._json_body().get('node', {})))
+
+        for resource, items in project['children'].pop(node['id'], {}).items():
+            for item_id in items:
+                del project[resource][item_id]
+        project['attachments'].pop(node['id'], None)
+        del project['nodes'][node['id']]
+        self._send_json(200, {'message': 'Resource deleted successfully'})
+
+    def _project_items(self, store, query, resource: str, item_id, data_key: str, create, update, render,
+                       node_id=None):
+        """
+        Shared CRUD handling of issues, content blocks, evidence and notes.
+        """
+        project = self._project(store)
+        if project is None:
+            return
+        pid = int(self.headers['Dradis-Project-Id'])
+        if node_id is not None and int(node_id) not in project['nodes']:
+            if self.command in ('POST', 'PUT'):
+                self._read_body()
+            return self._send_json(404, {'message': 'Node not found'})
+
+        items = project[resource]
+        if item_id is None:
+            if self.command == 'GET':
+                listed = list((items if node_id is None else store.children(pid, int(node_id))[resource]).values())
+                return self._send_json(200, [render(pid, item)
+                                             for item in _paginate(listed, query, store.page_size)])
+            return self._send_json(201, render(pid, create(pid, self._json_body().get(data_key, {}))))
+
+        item = items.get(int(item_id))
+        if item is None or (node_id is not None and item['node_id'] != int(node_id)):
+            if self.command == 'PUT':
+                self._read_body()
+            return self._send_json(404, {'message': 'Resource not found'})
+        if self.command == 'GET':
+            return self._send_json(200, render(pid, item))
+        if self.command == 'PUT':
+            return self._send_json(200, render(pid, update(pid, item, self._json_body().get(data_key, {}))))
+
+        if node_id is None:
+            del items[item['id']]
+        else:
+            store.delete_child(pid, resource, item)
+        self._send_json(200, {'message': 'Resource deleted successfully'})
+
+    def issues(self, store, query, issue_id=None):
+        self._project_items(store, query, 'issues', issue_id, 'issue',
+                            lambda pid, data: store.create_issue(pid, data.get('text', '')),
+                            lambda pid, issue, data: store.update_issue(issue, data.get('text', '')),
+                            lambda pid, issue: issue)
+
+    def content_blocks(self, store, query, block_id=None):
+        self._project_items(store, query, 'content_blocks', block_id, 'content_block',
+                            lambda pid, data: store.create_content_block(pid, data.get('content', ''),
+                                                                         data.get('block_group')),
+                            lambda pid, block, data: store.update_text(block, 'content', data.get('content', ''),
+                                                                       block_group=data.get('block_group')),
+                            lambda pid, block: block)
+
+    def evidence(self, store, query, node_id, evidence_id=None):
+        def update(pid, evidence, data):
+            store._touch(pid, evidence['node_id'])
+            return store.update_text(evidence, 'content', data.get('content', ''),
+                                     issue_id=int(data.get('issue_id') or evidence['issue_id']))
+
+        self._project_items(store, query, 'evidence', evidence_id, 'evidence',
+                            lambda pid, data: store.create_evidence(pid, int(node_id), data.get('content', ''),
+                                                                    data.get('issue_id') or 0),
+                            update, store.render_evidence, node_id)
+
+    def notes(self, store, query, node_id, note_id=None):
+        def update(pid, note, data):
+            store._touch(pid, note['node_id'])
+            return store.update_text(note, 'text', data.get('text', ''),
+                                     category_id=int(data.get('category_id') or note['category_id']))
+
+        self._project_items(store, query, 'notes', note_id, 'note',
+                            lambda pid, data: store.create_note(pid, int(node_id), data.get('text', ''),
+                                                                data.get('category_id')),
+                            update, lambda pid, note: store.render(note), node_id)
+
+    def document_properties(self, store, query, key=None):
+        project = self._project(store)
+        if project is None:
+            return
+        properties = project['document_properties']
+
+        if key is None:
+            if self.command == 'GET':
+                return self._send_json(200, properties)
+            properties.update(self._json_body().get('document_properties', {}))
+            return self._send_json(201, properties)
+
+        if key not in properties:
+            if self.command == 'PUT':
+                self._read_body()
+            return self._send_json(404, {'message': 'Resource not found'})
+        if self.command == 'GET':
+            return self._send_json(200, {key: properties[key]})
+        if self.command == 'PUT':
+            properties[key] = self._json_body().get('document_property', {}).get('value')
+            return self._send_json(200, {key: properties[key]})
+        del properties[key]
+        self._send_json(200, {'message': 'Resource deleted successfully'})
+
+    ####################################
+    #           Attachments            #
+    ####################################
+
+    @staticmethod
+    def _attachment(pid: int, node_id: int, filename: str) -> dict:
+        return {'filename': filename, 'link': f'/pro/projects/{pid}/nodes/{node_id}/attachments/{filename}'}
+
+    def attachments(self, store, query, node_id, filename=None):
+        project = self._project(store)
+        if project is None:
+            return
+        pid = int(self.headers['Dradis-Project-Id'])
+        node_id = int(node_id)
+        if node_id not in project['nodes']:
+            if self.command in ('POST', 'PUT'):
+                self._read_body()
+            return self._send_json(404, {'message': 'Node not found'})
+        files = project['attachments'].setdefault(node_id, {})
+
+        if filename is None:
+            if self.command == 'GET':
+                return self._send_json(200, [self._attachment(pid, node_id, name) for name in files])
+            message = BytesParser(policy=policy.default).parsebytes(
+                b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + self._read_body())
+            created = []
+            for part in message.iter_parts():
+                name = os.path.basename(part.get_filename() or 'upload')
+                files[name] = part.get_payload(decode=True)
+                created.append(self._attachment(pid, node_id, name))
+            return self._send_json(201, created)
+
+        if filename not in files:
+            if self.command == 'PUT':
+                self._read_body()
+            return self._send_json(404, {'message': 'Resource not found'})
+        if self.command == 'GET':
+            return self._send_json(200, self._attachment(pid, node_id, filename))
+        if self.command == 'PUT':
+            new_name = self._json_body().get('attachment', {}).get('filename', filename)
+            files[new_name] = files.pop(filename)
+            return self._send_json(200, self._attachment(pid, node_id, new_name))
+        del files[filename]
+        self._send_json(200, {'message': 'Resource deleted successfully'})
+
+    def download(self, store, query, pid, node_id, filename):
+        """
+        The attachment link of the web UI, with HEAD, Content-MD5, ETag and Range / If-Range support.
+        """
+        content = store.data.get(int(pid), {}).get('attachments', {}).get(int(node_id), {}).get(filename)
+        if content is None:
+            return self._send_json(404, {'message': 'Resource not found'})
+
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        status, start, end = 200, 0, len(content)
+        requested = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if requested and self.headers.get('If-Range', etag) != etag:
+            requested = None  # The file changed since the partial download, send all of it.
+        if requested:
+            start = int(requested.group(1))
+            end = min(len(content), int(requested.group(2)) + 1) if requested.group(2) else len(content)
+            if start >= len(content):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(content)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start))
+        self.send_header('Content-MD5', base64.b64encode(hashlib.md5(content).digest()).decode())
+        self.send_header('ETag', etag)
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(content)}')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content[start:end])
+
+
+_ROUTES = []
+for _method in ('GET', 'POST', 'PUT', 'DELETE'):
+    _ROUTES.extend([
+        (_method, re.compile(r'/pro/api/teams(?:/(\d+))?'), _StubHandler.teams),
+        (_method, re.compile(r'/pro/api/projects(?:/(\d+))?'), _StubHandler.projects),
+        (_method, re.compile(r'/pro/api/nodes(?:/(\d+))?'), _StubHandler.nodes),
+        (_method, re.compile(r'/pro/api/issues(?:/(\d+))?'), _StubHandler.issues),
+        (_method, re.compile(r'/pro/api/nodes/(\d+)/evidence(?:/(\d+))?'), _StubHandler.evidence),
+        (_method, re.compile(r'/pro/api/nodes/(\d+)/notes(?:/(\d+))?'), _StubHandler.notes),
+        (_method, re.compile(r'/pro/api/nodes/(\d+)/attachments(?:/([^/]+))?'), _StubHandler.attachments),
+        (_method, re.compile(r'/pro/api/content_blocks(?:/(\d+))?'), _StubHandler.content_blocks),
+        (_method, re.compile(r'/pro/api/document_properties(?:/([^/]+))?'), _StubHandler.document_properties),
+        (_method, re.compile(r'/pro/api/addons/issuelib/entries(?:/(\d+))?'), _StubHandler.issuelib),
+    ])
+_ROUTES.extend([
+    ('GET', re.compile(r'/pro/api/users(?:/(\d+))?'), _StubHandler.users),
+    ('GET', re.compile(r'/pro/projects/(\d+)/nodes/(\d+)/attachments/([^/]+)'), _StubHandler.download),
+    ('HEAD', re.compile(r'/pro/projects/(\d+)/nodes/(\d+)/attachments/([^/]+)'), _StubHandler.download),
+])
+
+
+class _FakeServer(ThreadingMixIn, HTTPServer):  # http.server.ThreadingHTTPServer needs Python 3.7
+    daemon_threads = True
+
+    def __init__(self, address, dradis: FakeDradis, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 bandwidth=None, compress=True):
+        super().__init__(address, _StubHandler)
+        self.dradis = dradis
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bandwidth = bandwidth
+        self.compress = compress
+        self.forced_errors = []
+        self.traffic = Counter()  # bytes_in / bytes_out of request bodies and JSON responses (as sent)
+        self.__link_free = {}  # direction -> time the throttled link is idle again
+        self.__random = random.Random(0)
+        self.__lock = threading.Lock()
+
+    def delay(self):
+        seconds = self.latency + (self.__random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def transfer(self, size: int, direction: str):
+        """
+        Counts a body and, on a throttled link, waits until it would have been sent. Concurrent requests share the
+        bandwidth of each direction.
+        """
+        with self.__lock:
+            self.traffic[direction] += size
+            if not self.bandwidth:
+                return
+            now = time.monotonic()
+            done = max(now, self.__link_free.get(direction, 0.0)) + size / self.bandwidth
+            self.__link_free[direction] = done
+        time.sleep(done - now)
+
+    def take_error(self, method: str, path: str):
+        with self.__lock:
+            for index, (status, pattern) in enumerate(self.forced_errors):
+                if pattern is None or re.search(pattern, f'{method} {path}'):
+                    del self.forced_errors[index]
+                    return status
+            if self.error_rate and self.__random.random() < self.error_rate:
+                return self.error_status
+        return None
+
+
+class StubDradisServer:
+    """
+    In-process fake Dradis Pro API server. Use it as a context manager; the base url is available as .url and the
+    in-memory data as .dradis (a FakeDradis with one team, user and project to start with).
+
+    @latency: seconds added to every request, plus a random delay of up to jitter seconds.
+    @error_rate: share of requests answered with error_status instead, see also fail_next().
+    @bandwidth: bytes per second of a simulated slow link for request bodies and JSON responses (None: unlimited).
+    @compress: gzip JSON responses of 1 KiB and more if the client accepts it. Gzip request bodies are always accepted.
+    @page_size, @embed_children: see FakeDradis.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503,
+                 page_size=25, embed_children=True, bandwidth=None, compress=True):
+        self.dradis = FakeDradis(page_size=page_size, embed_children=embed_children)
+        self.__server = _FakeServer((host, port), self.dradis, latency=latency, jitter=jitter,
+                                    error_rate=error_rate, error_status=error_status, bandwidth=bandwidth,
+                                    compress=compress)
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.url = f'http://{host}:{self.__server.server_address[1]}'
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def traffic(self) -> Counter:
+        return self.__server.traffic
+
+    def configure(self, latency=None, jitter=None, error_rate=None, error_status=None, bandwidth=None,
+                  compress=None):
+        for name, value in (('latency', latency), ('jitter', jitter), ('error_rate', error_rate),
+                            ('error_status', error_status), ('bandwidth', bandwidth), ('compress', compress)):
+            if value is not None:
+                setattr(self.__server, name, value)
+
+    def fail_next(self, count=1, status=503, match=None):
+        """
+        Answers the next count requests with status.
+
+        @match: only fail requests whose 'METHOD /path' matches this regular expression, e.g. 'GET .*/evidence$'.
+        """
+        self.__server.forced_errors.extend([(status, match)] * count)
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -20,10 +20,80 @@
 #     along with Pydradis.  If not, see <http://www.gnu.org/licenses/>.             #
 #####################################################################################
 import requests
-from requests_html import HTMLSession
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+import base64
+import hashlib
 import json
-import shutil
+import os
 import logging
+import sys
+import threading
+import time
+from contextlib import ExitStack
+from typing import TYPE_CHECKING
+
+# The feature modules (attachments, bulk, clone, fanout, snapshot, sync, tree, upsert, writequeue) and the standard
+# library modules only they need (sqlite3, concurrent.futures, ...) are imported by the methods using them, so a
+# plain "import dradis" stays fast. See benchmarks/bench_import.py.
+from dradis import jsonstream, markup, records
+from dradis.cache import ResponseCache, ValidatorStore, resource_of
+from dradis.errors import DradisAPIError
+from dradis.index import NameIndex
+from dradis.metrics import (Instrumentation, InstrumentedHTTPAdapter, RequestMetrics, endpoint_template,
+                            pop_connection_timings, reset_connection_timings)
+from dradis.retry import RetryPolicy, TokenBucket
+
+if TYPE_CHECKING:
+    from dradis.snapshot import ProjectSnapshot
+    from dradis.tree import NodeTree
+    from dradis.writequeue import WriteQueue
+
+_LAZY_EXPORTS = {'AsyncDradisClient': 'dradis.aio', 'NodeTree': 'dradis.tree', 'ProjectSnapshot': 'dradis.snapshot',
+                 'WriteQueue': 'dradis.writequeue'}
+
+
+def __getattr__(name: str):
+    """
+    Imports the classes of the optional features on first access, e.g. "from dradis import AsyncDradisClient".
+    """
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    import importlib
+
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+if sys.version_info < (3, 7):  # Module __getattr__ (PEP 562) needs Python 3.7
+    import types
+
+    class _LazyModule(types.ModuleType):
+        def __getattr__(self, name: str):
+            return __getattr__(name)
+
+    sys.modules[__name__].__class__ = _LazyModule
+
+
+def _csrf_token(page: str):
+    """
+    Returns the content of <meta name="csrf-token" content="..."> of the Dradis login page, or None.
+    """
+    from html.parser import HTMLParser
+
+    class CsrfTokenParser(HTMLParser):
+        token = None
+
+        def handle_starttag(self, tag, attrs):
+            if tag == 'meta' and self.token is None:
+                attrs = dict(attrs)
+                if attrs.get('name') == 'csrf-token':
+                    self.token = attrs.get('content')
+
+    parser = CsrfTokenParser()
+    parser.feed(page)
+    return parser.token
 
 
 class DradisClient:
@@ -41,25 +111,102 @@ class DradisClient:
     document_properties_endpoint = '/pro/api/document_properties'
     issue_library_endpoint = '/pro/api/addons/issuelib/entries'
 
-    def __init__(self, api_token: str, url: str, debug=False, verify=True):
+    def __init__(self, api_token: str, url: str, debug=False, verify=True, pool_connections=10, pool_maxsize=10,
+                 cache: ResponseCache = None, index_ttl=300, retry: RetryPolicy = None,
+                 rate_limit: TokenBucket = None, log_body_limit=1024, instrumentation: Instrumentation = None,
+                 validators: ValidatorStore = None, compress_min_size=None):
         self.__apiToken = api_token  # API Token
         self.__url = url  # Dradis URL (eg. https://your_dradis_server.com)
         self.__header = {'Authorization': f'Token token={self.__apiToken}'}
         self.__headerCt = {'Authorization': f'Token token={self.__apiToken}', 'Content-type': 'application/json'}
         self.__debug = debug  # Debugging True?
         self.__verify = verify  # Path to SSL certificate
-        self.__logger = self._set_logging()  # configure logging
+        self.__log_body_limit = log_body_limit  # Number of response bytes written to the debug log
+        self.__logger = self._set_logging(debug)  # configure logging
+        self.__instrumentation = instrumentation  # Optional per-request timing and metrics hooks
+        self.__session = self._create_session(pool_connections, pool_maxsize)  # Keep-alive connection pool
+        self.__cache = cache  # Optional ResponseCache for GET requests
+        self.__validators = validators  # Optional ValidatorStore for conditional GET requests
+        self.__compress_min_size = compress_min_size  # Gzip request bodies of at least this many bytes (None: never)
+        self.__index_ttl = index_ttl  # Seconds until the name indexes are rebuilt
+        self.__indexes = {}  # (resource, pid) -> NameIndex
+        self.__retry = retry  # Optional RetryPolicy for 429 / 5xx responses and connection errors
+        self.__rate_limit = rate_limit  # Optional TokenBucket throttling all API requests
+        self.__last_error = threading.local()  # Last failed request of the current thread, see pop_last_error()
+        self.__write_queue = None  # Background WriteQueue, created by write_queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def debug(self, val: bool):
         self.__debug = val
 
-    def _set_logging(self):
+    @property
+    def cache(self) -> ResponseCache:
+        return self.__cache
+
+    @property
+    def validators(self) -> ValidatorStore:
+        return self.__validators
+
+    @property
+    def instrumentation(self) -> Instrumentation:
+        return self.__instrumentation
+
+    def write_queue(self, workers=4, batch_size=50, flush_interval=1.0, retry: RetryPolicy = None,
+                    max_pending=None) -> 'WriteQueue':
+        """
+        Returns the client's write-behind queue for creates and updates, creating it with the given options on the
+        first call. close() flushes it. See dradis.writequeue.WriteQueue.
+        """
+        if self.__write_queue is None:
+            from dradis.writequeue import WriteQueue
+
+            self.__write_queue = WriteQueue(self, workers=workers, batch_size=batch_size,
+                                            flush_interval=flush_interval, retry=retry, max_pending=max_pending)
+        return self.__write_queue
+
+    def close(self):
+        """
+        Flushes the write queue (if any) and closes the pooled HTTP session and all of its open connections.
+        """
+        if self.__write_queue is not None:
+            self.__write_queue.close()
+        self.__session.close()
+
+    def _create_session(self, pool_connections: int, pool_maxsize: int) -> requests.Session:
+        """
+        Creates the long-lived session shared by all endpoint methods.
+
+        @pool_connections: Number of connection pools to cache (one per host).
+        @pool_maxsize: Maximum number of keep-alive connections kept per pool. The parallel helpers (bulk_import,
+        fan_out, write_queue, ...) should run at most this many workers: connections opened beyond it are closed
+        after each request instead of being reused.
+        """
+        session = requests.Session()
+        adapter_class = HTTPAdapter if self.__instrumentation is None else InstrumentedHTTPAdapter
+        adapter = adapter_class(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.verify = self.__verify
+        return session
+
+    @staticmethod
+    def _set_logging(debug: bool) -> logging.Logger:
         logger = logging.getLogger('PyDradis3ng')
-        # create console handler with a higher log level
-        ch = logging.StreamHandler()
-        if self.__debug:
+        if debug:
             logger.setLevel(logging.DEBUG)
-            ch.setLevel(logging.DEBUG)
+
+        # The logger is shared by all clients, so the console handler is only attached once.
+        if any(getattr(handler, '_dradis_handler', False) for handler in logger.handlers):
+            return logger
+
+        # create console handler
+        ch = logging.StreamHandler()
+        ch._dradis_handler = True
         # create formatter and add it to the handlers
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         ch.setFormatter(formatter)
@@ -67,24 +214,317 @@ class DradisClient:
         logger.addHandler(ch)
         return logger
 
+    def _log_response(self, results: requests.Response):
+        """
+        Writes status and (truncated) body of a response to the debug log. Costs a single level check if debug
+        logging is disabled.
+        """
+        if not self.__logger.isEnabledFor(logging.DEBUG):
+            return
+
+        content = results.content
+        if self.__log_body_limit is not None and len(content) > self.__log_body_limit:
+            content = content[:self.__log_body_limit] + f'... ({len(content)} bytes)'.encode()
+        self.__logger.debug('Server Response:\n%s %s\n---\n%s', results.request.method, results.status_code,
+                            content)
+
     def contact_dradis(self, url: str, header: dict, req_type: str, response_code: str, data=""):
         """
         Send Requests to Dradis (& DebugCheck for Error Codes)
         """
-        r = requests.Request(req_type, url, headers=header, data=data)
-        r = r.prepare()
+        path = url[len(self.__url):]
+        pid = header.get('Dradis-Project-Id')
+
+        if self.__cache is not None and req_type == 'GET':
+            body = self.__cache.get((path, pid))
+            if body is not None:
+                return json.loads(body)
 
-        s = requests.Session()
-        results = s.send(r, verify=self.__verify)
+        conditional = {}
+        if self.__validators is not None and req_type == 'GET':
+            conditional = self.__validators.conditional_headers((path, pid))
 
-        print(results)
-        self.__logger.debug(f'Server Response:\n{results.status_code}\n---\n{results.content}')
+        results = self._send(req_type, url, {**header, **conditional} if conditional else header, data)
+        self._log_response(results)
+
+        if conditional and results.status_code == 304:
+            body = self.__validators.not_modified((path, pid))
+            if body is None:  # Evicted meanwhile, fetch it again without validators
+                conditional = {}
+                results = self._send(req_type, url, header, data)
+                self._log_response(results)
+            else:
+                if self.__cache is not None:
+                    self.__cache.set((path, pid), resource_of(path), pid, body)
+                return json.loads(body)
 
         if str(results.status_code) != str(response_code):
+            self.__last_error.value = DradisAPIError(req_type, path, results.status_code)
             return None
 
+        if self.__validators is not None and req_type == 'GET':
+            self.__validators.store((path, pid), results.headers, results.content, conditional=bool(conditional))
+
+        if self.__cache is not None:
+            if req_type == 'GET':
+                self.__cache.set((path, pid), resource_of(path), pid, results.content)
+            else:
+                self.__cache.invalidate(resource_of(path), pid)
+
+        if req_type != 'GET' and self.__indexes:
+            self._invalidate_index(resource_of(path), pid)
+
         return results.json()
 
+    def pop_last_error(self):
+        """
+        Returns a description of the last request of the current thread that got an unexpected status code, and
+        clears it. None if there was none. Methods signal such failures only by their return value (-1, {}, [], ...).
+        """
+        failure = self.pop_last_failure()
+        return None if failure is None else str(failure)
+
+    def pop_last_failure(self) -> DradisAPIError:
+        """
+        Like pop_last_error, but returns the DradisAPIError itself (with method, path and status).
+        """
+        failure = getattr(self.__last_error, 'value', None)
+        self.__last_error.value = None
+        return failure
+
+    def _send(self, req_type: str, url: str, header: dict, data="", stream=False) -> requests.Response:
+        """
+        Sends a request through the pooled session, applying the rate limit and the retry policy.
+
+        @stream: Return as soon as the headers arrived and leave the body unread. The caller has to close the response
+        and pass it to _record with the start time in its _dradis_started attribute.
+        @data: str, bytes or a streamed body with a rewind() method (attachments.MultipartFileStream), which is called
+        before the request is sent again.
+        """
+        # Prepared requests do not get the session's default headers, so compressed responses are asked for here
+        # (gzip and deflate, plus br and zstd if brotli and zstandard are installed). urllib3 decodes them.
+        header = {'Accept-Encoding': DEFAULT_ACCEPT_ENCODING, **header}
+        if self.__compress_min_size is not None and isinstance(data, (str, bytes)) and data:
+            body = data.encode() if isinstance(data, str) else data
+            if len(body) >= self.__compress_min_size:
+                import gzip
+
+                data = gzip.compress(body, compresslevel=6)
+                header['Content-Encoding'] = 'gzip'
+
+        r = requests.Request(req_type, url, headers=header, data=data)
+        r = r.prepare()
+
+        retry = self.__retry if self.__retry is not None and self.__retry.is_retryable(req_type) else None
+        attempt = 0
+
+        while True:
+            if self.__rate_limit is not None:
+                self.__rate_limit.acquire()
+            if attempt and hasattr(data, 'rewind'):
+                data.rewind()
+
+            if self.__instrumentation is not None:
+                reset_connection_timings()
+            started = time.perf_counter()
+
+            try:
+                results = self.__session.send(r, verify=self.__verify, stream=stream)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                if retry is None or attempt >= retry.max_retries:
+                    raise
+                delay = retry.backoff(attempt)
+                self.__logger.warning(f'{req_type} {url} failed ({err}), retrying in {delay:.2f}s.')
+            else:
+                if stream:
+                    # The body is not read yet, the caller records the request once it is, see _iter_stream_pages.
+                    results._dradis_started = started
+                else:
+                    # Bytes received on the wire, i.e. before decompression.
+                    self._record(req_type, url, results, started, r.body, results.raw.tell() or len(results.content))
+                if retry is None or attempt >= retry.max_retries or results.status_code not in retry.status_forcelist:
+                    return results
+                delay = retry.retry_after(results)
+                if delay is None:
+                    delay = retry.backoff(attempt)
+                elif delay > retry.max_backoff:
+                    self.__logger.warning(f'{req_type} {url} returned {results.status_code} with Retry-After '
+                                          f'{delay:.0f}s, longer than max_backoff, not retrying.')
+                    return results
+                self.__logger.warning(f'{req_type} {url} returned {results.status_code}, retrying in {delay:.2f}s.')
+                if stream:
+                    self._record(req_type, url, results, started, r.body, 0)  # Discarded unread
+                results.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def _record(self, method: str, url: str, results: requests.Response, started: float, request_body,
+                response_bytes: int):
+        """
+        Passes the timings and sizes of a finished request to the instrumentation hooks, if any.
+        """
+        if self.__instrumentation is None:
+            return
+
+        if isinstance(request_body, str):
+            request_bytes = len(request_body.encode())
+        elif isinstance(request_body, int):
+            request_bytes = request_body
+        else:
+            request_bytes = len(request_body or b'')
+
+        path = url[len(self.__url):] if url.startswith(self.__url) else url
+        self.__instrumentation.emit(RequestMetrics(method, url, endpoint_template(path), results.status_code,
+                                                   results.elapsed.total_seconds(), time.perf_counter() - started,
+                                                   request_bytes, response_bytes, pop_connection_timings()))
+
+    def _iter_pages(self, url: str, header: dict, prefetch=False, stream=False, fields=None):
+        """
+        Yields the items of a paginated list endpoint one by one, requesting ?page=1, 2, ... lazily.
+        Only the current page (and the next one if prefetch is set) is held in memory.
+
+        @prefetch: Fetch the next page in a background thread while the current one is consumed.
+        @stream: Decode every page incrementally while it is received, see _iter_stream_pages.
+        @fields: Keep only these fields of every item ('id' is always kept).
+        Raises DradisAPIError if a page can not be fetched, the items yielded so far are then incomplete.
+        """
+        if fields is not None:
+            fields = ('id',) + tuple(field for field in fields if field != 'id')
+        if stream:
+            yield from self._iter_stream_pages(url, header, fields)
+            return
+
+        def fetch(page_number):
+            page = self.contact_dradis(f'{url}?page={page_number}', header, "GET", "200")
+            if page is None:
+                raise self.pop_last_failure() or DradisAPIError('GET', url[len(self.__url):], None)
+            return page
+
+        executor = None
+        if prefetch:
+            from concurrent.futures import ThreadPoolExecutor
+
+            executor = ThreadPoolExecutor(max_workers=1)
+        page_number = 1
+        page = fetch(page_number)
+        page_size = len(page) if page else 0
+        previous_first = None
+
+        try:
+            while page:
+                next_page = executor.submit(fetch, page_number + 1) if executor else None
+
+                # A server without pagination support answers every page with the complete list.
+                first = page[0].get('id') if isinstance(page[0], dict) else page[0]
+                if first == previous_first:
+                    break
+                previous_first = first
+
+                if fields is None:
+                    yield from page
+                else:
+                    for item in page:
+                        yield jsonstream.project(item, fields)
+
+                if len(page) < page_size:
+                    break
+                page_number += 1
+                page = next_page.result() if next_page else fetch(page_number)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def _iter_stream_pages(self, url: str, header: dict, fields=None, chunk_size=65536):
+        """
+        Like _iter_pages, but decodes every page from the socket while it is received (bypassing the response cache),
+        so only one item and one chunk are in memory at a time, independent of the page size.
+        """
+        page_number = 1
+        page_size = None
+        previous_first = None
+
+        def counted(chunks, received: list):
+            # Streamed responses often come without Content-Length (chunked or compressed), so the bytes are counted.
+            for chunk in chunks:
+                received[0] += len(chunk)
+                yield chunk
+
+        while True:
+            page_url = f'{url}?page={page_number}'
+            results = self._send("GET", page_url, header, stream=True)
+            received = [0]
+            count = 0
+            try:
+                if results.status_code != 200:
+                    self._log_response(results)
+                    raise DradisAPIError('GET', f'{url[len(self.__url):]}?page={page_number}', results.status_code)
+
+                for item in jsonstream.iter_array(counted(results.iter_content(chunk_size), received), fields):
+                    if count == 0:
+                        # A server without pagination support answers every page with the complete list.
+                        first = item.get('id') if isinstance(item, dict) else item
+                        if first == previous_first:
+                            return
+                        previous_first = first
+                    count += 1
+                    yield item
+            finally:
+                # Bytes received on the wire as in _send, falling back to the bytes read from the body.
+                self._record('GET', page_url, results, results._dradis_started, None, results.raw.tell() or received[0])
+                results.close()
+
+            if page_size is None:
+                page_size = count
+            if count == 0 or count < page_size:
+                return
+            page_number += 1
+
+    def _name_index(self, resource: str, pid=None):
+        """
+        Returns the name index of 'teams', 'projects' or the node labels of a project ('nodes'),
+        (re)building it from the list endpoint when it is missing or older than index_ttl.
+        Returns None if the list could not be fetched.
+        """
+        pid = None if pid is None else str(pid)
+        index = self.__indexes.get((resource, pid))
+
+        if index is None:
+            index = NameIndex(key='label' if resource == 'nodes' else 'name', ttl=self.__index_ttl)
+            self.__indexes[(resource, pid)] = index
+
+        if index.is_stale():
+            if resource == 'nodes':
+                try:
+                    listing = list(self.iter_nodes(pid))
+                except DradisAPIError as err:
+                    self.__logger.warning(f'Could not list the nodes: {err}')
+                    return None
+            elif resource == 'teams':
+                listing = self.contact_dradis(self.__url + self.team_endpoint, self.__headerCt, "GET", "200")
+            else:
+                listing = self.contact_dradis(self.__url + self.project_endpoint, self.__header, "GET", "200")
+
+            if not listing:
+                return None
+            index.rebuild(listing)
+
+        return index
+
+    def _invalidate_index(self, resource: str, pid=None):
+        if resource in ('teams', 'projects'):
+            pid = None
+        index = self.__indexes.get((resource, pid))
+        if index is not None:
+            index.invalidate()
+
+    def refresh_indexes(self):
+        """
+        Marks all name indexes as stale, they are rebuilt on the next lookup.
+        """
+        for index in self.__indexes.values():
+            index.invalidate()
+
     def get_dradis_cookie(self, username: str, password: str):
         """
         Receive the dradis session cookie '_dradis_cookie' from the login page.
@@ -94,16 +534,18 @@ class DradisClient:
         login_url = self.__url + self.login_endpoint
         sessions_url = self.__url + self.sessions_endpoint
 
-        session = HTMLSession(verify=self.__verify)
-        init_resp = session.get(login_url)
-        token = init_resp.html.xpath('//meta[@name="csrf-token"]/@content')
+        with requests.Session() as session:
+            session.verify = self.__verify
+            init_resp = session.get(login_url)
 
-        if token is None:
-            self.__logger.warning('PyDradis3ng was not able to fetch CSRF token from login page.')
-            return None
+            token = _csrf_token(init_resp.text)
+
+            if token is None:
+                self.__logger.warning('PyDradis3ng was not able to fetch CSRF token from login page.')
+                return None
 
-        data = f'utf8=%E2%9C%93&authenticity_token={requests.utils.quote(token[0])}&login={username}&password={password}'
-        login_resp = session.post(url=sessions_url, data=data)
+            data = f'utf8=%E2%9C%93&authenticity_token={requests.utils.quote(token)}&login={username}&password={password}'
+            login_resp = session.post(url=sessions_url, data=data)
 
         if login_resp.status_code == 200:
             return login_resp.cookies.get('_dradis_session')
@@ -114,9 +556,10 @@ class DradisClient:
     #         Teams Endpoint           #
     ####################################
 
-    def get_teams_list(self) -> list:
+    def get_teams_list(self, full=False) -> list:
         """
         Retrieves all teams as list, reduced by name and team id.
+        @full: Return Team records with all fields of the response instead.
         """
         url = self.__url + self.team_endpoint
         r = self.contact_dradis(url, self.__headerCt, "GET", "200")
@@ -125,6 +568,9 @@ class DradisClient:
             self.__logger.warning(f'No teams found.')
             return []
 
+        if full:
+            return [records.Team(i) for i in r]
+
         result = []
         for i in r:
             result.append([[i["name"], i["id"]]])
@@ -144,13 +590,17 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _team_data(team_name: str) -> dict:
+        return {"team": {"name": team_name}}
+
     def create_team(self, team_name: str) -> int:
         """
         # Creates a team based on the name.
         Returns the new created team id.
         """
         url = self.__url + self.team_endpoint
-        data = {"team": {"name": team_name}}
+        data = self._team_data(team_name)
 
         r = self.contact_dradis(url, self.__headerCt, "POST", "201", json.dumps(data))
 
@@ -166,7 +616,7 @@ class DradisClient:
         Return the new created team id.
         """
         url = f'{self.__url}{self.team_endpoint}/{team_id}'
-        data = {"team": {"name": team_name}}
+        data = self._team_data(team_name)
 
         r = self.contact_dradis(url, self.__headerCt, "PUT", "200", json.dumps(data))
 
@@ -192,28 +642,37 @@ class DradisClient:
         """
         Search for Team by team name.
         """
-        url = self.__url + self.team_endpoint
-        r = self.contact_dradis(url, self.__headerCt, "GET", "200")
-
-        if not r:
-            self.__logger.warning(f'No team with team name {team_name} found.')
-            return {}
-
-        result = list((filter(lambda x: x.get('name') == team_name, r)))
+        index = self._name_index('teams')
+        result = index.get(team_name) if index else None
 
         if result:
-            return result[0]
+            return result
         else:
             self.__logger.warning(f'No team with team name {team_name} found.')
             return {}
 
+    def find_teams_by_prefix(self, prefix: str) -> list:
+        """
+        Search for Teams whose name starts with prefix, ignoring case.
+        """
+        index = self._name_index('teams')
+        return index.prefix(prefix) if index else []
+
+    def resolve_teams(self, team_names: list) -> dict:
+        """
+        Resolves many team names at once. Returns a dict team name -> team id (None if not found).
+        """
+        index = self._name_index('teams')
+        return {name: (index.get(name) or {}).get('id') if index else None for name in team_names}
+
     ####################################
     #         Users Endpoint           #
     ####################################
 
-    def get_users_list(self) -> list:
+    def get_users_list(self, full=False) -> list:
         """
         Retrieves all users.
+        @full: Return User records with all fields of the response instead.
         """
         url = self.__url + self.user_endpoint
         r = self.contact_dradis(url, self.__headerCt, "GET", "200")
@@ -222,6 +681,9 @@ class DradisClient:
             self.__logger.warning(f'No users found.')
             return []
 
+        if full:
+            return [records.User(i) for i in r]
+
         result = []
         for i in r:
             result.append([[i["name"], i["id"]]])
@@ -245,9 +707,10 @@ class DradisClient:
     #         Projects Endpoint        #
     ####################################
 
-    def get_project_list(self) -> list:
+    def get_project_list(self, full=False) -> list:
         """
         Retrieves all projects, reduced by name and project id.
+        @full: Return Project records with all fields of the response instead.
         """
         url = self.__url + self.project_endpoint
         r = self.contact_dradis(url, self.__header, "GET", "200")
@@ -256,6 +719,9 @@ class DradisClient:
             self.__logger.warning(f'No projects found.')
             return []
 
+        if full:
+            return [records.Project(i) for i in r]
+
         result = []
         for i in r:
             result.append([[i["name"], i["id"]]])
@@ -275,17 +741,9 @@ class DradisClient:
 
         return r
 
-    def create_project(self, project_name: str, team_id=None, report_template_properties_id=None, author_ids=None,
-                       template=None) -> int:
-        """
-        Creates a project.
-        @project_name: Pass it the name of the project you want to create within Dradis
-        @team_id: Assigns the project to a client. Pass it the ID number of the client the project should be associated with within Dradis.
-        @report_template_properties_id: Assigns a default report template to the project
-        @author_ids: Assigns users as authors to the project. If not specified, only the user performing the request will be added as author.
-        @template: Associate with a project template to pre-populate the project with data. Pass this the project template name.
-        """
-        url = self.__url + self.project_endpoint
+    @staticmethod
+    def _project_data(project_name: str, team_id=None, report_template_properties_id=None, author_ids=None,
+                      template=None) -> dict:
         data = {"project": {"name": project_name}}
 
         if team_id is not None:
@@ -300,6 +758,21 @@ class DradisClient:
         if template is not None:
             data['project']['template'] = str(template)
 
+        return data
+
+    def create_project(self, project_name: str, team_id=None, report_template_properties_id=None, author_ids=None,
+                       template=None) -> int:
+        """
+        Creates a project.
+        @project_name: Pass it the name of the project you want to create within Dradis
+        @team_id: Assigns the project to a client. Pass it the ID number of the client the project should be associated with within Dradis.
+        @report_template_properties_id: Assigns a default report template to the project
+        @author_ids: Assigns users as authors to the project. If not specified, only the user performing the request will be added as author.
+        @template: Associate with a project template to pre-populate the project with data. Pass this the project template name.
+        """
+        url = self.__url + self.project_endpoint
+        data = self._project_data(project_name, team_id, report_template_properties_id, author_ids, template)
+
         r = self.contact_dradis(url, self.__headerCt, "POST", "201", json.dumps(data))
 
         if r is None:
@@ -314,19 +787,7 @@ class DradisClient:
         Updates a project.
         """
         url = f'{self.__url}{self.project_endpoint}/{pid}'
-        data = {"project": {"name": project_name}}
-
-        if team_id is not None:
-            data['project']['team_id'] = str(team_id)
-
-        if report_template_properties_id is not None:
-            data['project']['report_template_properties_id'] = str(report_template_properties_id)
-
-        if author_ids is list and not None:
-            data['project']['author_ids'] = author_ids
-
-        if template is not None:
-            data['project']['template'] = str(template)
+        data = self._project_data(project_name, team_id, report_template_properties_id, author_ids, template)
 
         r = self.contact_dradis(url, self.__headerCt, "PUT", "200", json.dumps(data))
 
@@ -353,28 +814,101 @@ class DradisClient:
         """
         Search for a Project by project name
         """
-        url = self.__url + self.project_endpoint
-        r = self.contact_dradis(url, self.__header, "GET", "200")
+        index = self._name_index('projects')
+        result = index.get(project_name) if index else None
 
-        if not r:
+        if result:
+            return result
+        else:
             self.__logger.warning(f'No project with project name {project_name} found.')
             return {}
 
-        result = list((filter(lambda x: x.get('name') == project_name, r)))
+    def find_projects_by_prefix(self, prefix: str) -> list:
+        """
+        Search for Projects whose name starts with prefix, ignoring case.
+        """
+        index = self._name_index('projects')
+        return index.prefix(prefix) if index else []
 
-        if result:
-            return result[0]
+    def resolve_projects(self, project_names: list) -> dict:
+        """
+        Resolves many project names at once. Returns a dict project name -> project id (None if not found).
+        """
+        index = self._name_index('projects')
+        return {name: (index.get(name) or {}).get('id') if index else None for name in project_names}
+
+    def sync_project(self, pid: int, manifest_path: str = None, deep=False, workers=8) -> dict:
+        """
+        Incrementally mirrors a project. Only nodes, issues, evidence and notes that changed since the sync recorded
+        in manifest_path are reported (with their content) as created, updated or deleted.
+        See dradis.sync.ProjectSync for the manifest and report format.
+
+        @deep: Fetch the evidence and notes of every node, not only of new or changed nodes.
+        """
+        from dradis.sync import ProjectSync
+
+        return ProjectSync(self, pid, manifest_path=manifest_path, workers=workers).run(deep=deep)
+
+    def snapshot_project(self, pid: int, path: str, attachments=True, workers=8) -> 'ProjectSnapshot':
+        """
+        Dumps a project into the SQLite file at path for offline queries. An existing snapshot of the same project
+        is refreshed incrementally instead, see dradis.snapshot.ProjectSnapshot.
+        """
+        from dradis.snapshot import ProjectSnapshot
+
+        snapshot = ProjectSnapshot(path)
+        if snapshot.pid == pid:
+            snapshot.refresh(self, attachments=attachments, workers=workers)
         else:
-            self.__logger.warning(f'No project with project name {project_name} found.')
-            return {}
+            snapshot.dump(self, pid, attachments=attachments, workers=workers)
+        return snapshot
+
+    def clone_project(self, src_pid: int, new_name: str, team_id=None, report_template_properties_id=None,
+                      author_ids=None, attachments=False, cookie=None, checkpoint_path=None, workers=8) -> dict:
+        """
+        Creates a project and copies nodes, issues, evidence, notes, content blocks, document properties and
+        optionally attachments of src_pid into it, in parallel across the node tree.
+        With checkpoint_path an interrupted clone resumes where it stopped. See dradis.clone.clone_project.
+
+        @cookie: '_dradis_session' cookie, only needed with attachments=True.
+        """
+        from dradis import clone
+
+        return clone.clone_project(self, src_pid, new_name, team_id=team_id,
+                                   report_template_properties_id=report_template_properties_id,
+                                   author_ids=author_ids, attachments=attachments, cookie=cookie,
+                                   checkpoint_path=checkpoint_path, workers=workers)
+
+    def fan_out(self, fn, pids=None, max_workers=8, timeout=None, **kwargs):
+        """
+        Runs a per-project operation across many projects concurrently and yields
+        {'pid', 'result', 'error', 'seconds'} per project as soon as it completes. See dradis.fanout.fan_out.
+
+        @fn: callable taking a project id, or the name of a client method such as 'get_issue_list'. Extra keyword
+        arguments are passed on to it.
+        @pids: project ids, all projects if omitted.
+        @timeout: seconds per project before it is reported as failed.
+        Raises DradisAPIError if pids is omitted and the project listing fails.
+        """
+        from dradis import fanout
+
+        if pids is None:
+            self.pop_last_failure()
+            projects = self.get_project_list(full=True)
+            failure = self.pop_last_failure()
+            if failure is not None:
+                raise failure
+            pids = [project.id for project in projects]
+        return fanout.fan_out(self, fn, pids, max_workers=max_workers, timeout=timeout, **kwargs)
 
     ####################################
     #         Nodes Endpoint           #
     ####################################
 
-    def get_node_list(self, pid: int) -> list:
+    def get_node_list(self, pid: int, full=False) -> list:
         """
         Retrieves all the Nodes in your specific project, reduced by label and node id.
+        @full: Return Node records with all fields of the response instead.
         """
         url = self.__url + self.node_endpoint
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
@@ -385,12 +919,61 @@ class DradisClient:
             self.__logger.warning(f'No nodes found.')
             return []
 
+        if full:
+            return [records.Node(i) for i in r]
+
         result = []
         for i in r:
             result.append([[i["label"], i["id"]]])
 
         return result
 
+    def iter_nodes(self, pid: int, prefetch=False, stream=False, fields=None):
+        """
+        Yields all the Nodes in your specific project, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = self.__url + self.node_endpoint
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        return self._iter_pages(url, header, prefetch, stream, fields)
+
+    def get_node_tree(self, pid: int, prefetch=True) -> 'NodeTree':
+        """
+        Builds the node hierarchy of your project from one paginated listing. The NodeTree is indexed by id, parent
+        and label and resolves label paths such as '10.0.0.0/24 > 10.0.0.5 > 443/tcp'.
+        Raises DradisAPIError if the listing fails.
+        """
+        from dradis.tree import NodeTree
+
+        return NodeTree(self.iter_nodes(pid, prefetch=prefetch))
+
+    def find_node_by_label(self, pid: int, label: str) -> dict:
+        """
+        Search for a Node in your specific project by its label.
+        """
+        index = self._name_index('nodes', pid)
+        result = index.get(label) if index else None
+
+        if result:
+            return result
+        else:
+            self.__logger.warning(f'No node with label {label} found.')
+            return {}
+
+    def find_nodes_by_prefix(self, pid: int, prefix: str) -> list:
+        """
+        Search for Nodes in your specific project whose label starts with prefix, ignoring case.
+        """
+        index = self._name_index('nodes', pid)
+        return index.prefix(prefix) if index else []
+
+    def resolve_nodes(self, pid: int, labels: list) -> dict:
+        """
+        Resolves many node labels at once. Returns a dict label -> node id (None if not found).
+        """
+        index = self._name_index('nodes', pid)
+        return {label: (index.get(label) or {}).get('id') if index else None for label in labels}
+
     def get_node(self, pid: int, node_id: int) -> dict:
         """
         Retrieves a single Node from your specified project and displays all the Evidence and Notes associated with the Node.
@@ -406,6 +989,27 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _node_data(label: str, type_id=0, parent_id=None, position=1) -> dict:
+        if parent_id != None:  # If None (Meaning its a toplevel node) then dont convert None to string.
+            parent_id = str(parent_id)
+
+        return {"node": {"label": label, "type_id": str(type_id), "parent_id": parent_id, "position": str(position)}}
+
+    @staticmethod
+    def _node_update_data(label=None, type_id=None, parent_id=None, position=None) -> dict:
+        node_data = {}
+        if label is not None:
+            node_data["label"] = str(label)
+        if type_id is not None:
+            node_data["type_id"] = str(type_id)
+        if parent_id is not None:
+            node_data["parent_id"] = str(parent_id)
+        if position is not None:
+            node_data["position"] = str(position)
+
+        return {"node": node_data}
+
     def create_node(self, pid: int, label: str, type_id=0, parent_id=None, position=1) -> int:
         """
         Creates a Node in the specified project.
@@ -419,10 +1023,7 @@ class DradisClient:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
                   'Content-type': 'application/json'}
 
-        if parent_id != None:  # If None (Meaning its a toplevel node) then dont convert None to string.
-            parent_id = str(parent_id)
-
-        data = {"node": {"label": label, "type_id": str(type_id), "parent_id": parent_id, "position": str(position)}}
+        data = self._node_data(label, type_id, parent_id, position)
 
         r = self.contact_dradis(url, header, "POST", "201", json.dumps(data))
 
@@ -443,17 +1044,9 @@ class DradisClient:
             self.__logger.warning(f'Update of the node fails. No valid data were given.')
             return -1
 
-        node_data = {}
-        if label is not None:
-            node_data["label"] = str(label)
-        if type_id is not None:
-            node_data["type_id"] = str(type_id)
-        if parent_id is not None:
-            node_data["parent_id"] = str(parent_id)
-        if position is not None:
-            node_data["position"] = str(position)
+        data = self._node_update_data(label, type_id, parent_id, position)
 
-        r = self.contact_dradis(url, header, "PUT", "200", json.dumps({"node": node_data}))
+        r = self.contact_dradis(url, header, "PUT", "200", json.dumps(data))
 
         if r is None:
             return -1
@@ -478,9 +1071,10 @@ class DradisClient:
     #         Issues Endpoint          #
     ####################################
 
-    def get_issue_list(self, pid: int) -> list:
+    def get_issue_list(self, pid: int, full=False) -> list:
         """
         Retrieves all the Issues in your specific project, reduced by issue name and issue id.
+        @full: Return Issue records with all fields of the response instead.
         """
         url = self.__url + self.issue_endpoint
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
@@ -491,12 +1085,24 @@ class DradisClient:
             self.__logger.warning(f'No issues found.')
             return []
 
+        if full:
+            return [records.Issue(i) for i in r]
+
         result = []
         for i in r:
             result.append([[i["title"], i["id"]]])
 
         return result
 
+    def iter_issues(self, pid: int, prefetch=False, stream=False, fields=None):
+        """
+        Yields all the Issues in your specific project, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = self.__url + self.issue_endpoint
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        return self._iter_pages(url, header, prefetch, stream, fields)
+
     def get_issue(self, pid: int, issue_id: int) -> dict:
         """
         Retrieves a single Issue from your specified project.
@@ -511,20 +1117,19 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _issue_data(title: str, issue_properties: dict, tags=None) -> dict:
+        fields = [('Title', title)]
+        fields.extend(issue_properties.items())
+
+        return {'issue': {'text': markup.dumps(fields, tags)}}
+
     def _issue_request(self, url: str, method: str, return_code: int, pid: int, title: str, issue_properties: dict,
                        tags=None) -> int:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
                   'Content-type': 'application/json'}
 
-        issue_text = f'#[Title]#\r\n{title}\r\n\r\n'
-
-        for key, value in issue_properties.items():
-            issue_text += f'#[{key}]#\r\n{value}\r\n\r\n'
-
-        if isinstance(tags, list) and tags:
-            issue_text += f'#[Tags]#\r\n{",".join(tags)}'
-
-        data = {'issue': {'text': issue_text}}
+        data = self._issue_data(title, issue_properties, tags)
 
         r = self.contact_dradis(url, header, method.upper(), str(return_code), json.dumps(data))
 
@@ -585,6 +1190,15 @@ class DradisClient:
 
         return r
 
+    def iter_evidence(self, pid: int, node_id: int, prefetch=False, stream=False, fields=None):
+        """
+        Yields all the Evidence associated with the specific Node in your project, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = self.__url + self.evidence_endpoint.format(id=node_id)
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        return self._iter_pages(url, header, prefetch, stream, fields)
+
     def get_evidence(self, pid: int, node_id: int, evidence_id: int) -> dict:
         """
         Retrieves a single piece of Evidence from a Node in your project.
@@ -600,22 +1214,18 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _evidence_data(issue_id: int, evidence_properties: dict, tags=None) -> dict:
+        return {'evidence': {
+            'content': markup.dumps(evidence_properties, tags),
+            "issue_id": str(issue_id)}}
+
     def _evidence_request(self, url: str, method: str, return_code: int, pid: int, issue_id: int,
                           evidence_properties: dict, tags=None) -> int:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
                   'Content-type': 'application/json'}
 
-        evidence_content = ''
-
-        for key, value in evidence_properties.items():
-            evidence_content += f'#[{key}]#\r\n{value}\r\n\r\n'
-
-        if isinstance(tags, list) and tags:
-            evidence_content += f'#[Tags]#\r\n{",".join(tags)}'
-
-        data = {'evidence': {
-            'content': evidence_content,
-            "issue_id": str(issue_id)}}
+        data = self._evidence_data(issue_id, evidence_properties, tags)
 
         r = self.contact_dradis(url, header, method, str(return_code), json.dumps(data))
 
@@ -641,6 +1251,34 @@ class DradisClient:
         return self._evidence_request(url=url, method='PUT', return_code=200, pid=pid, issue_id=issue_id,
                                       evidence_properties=evidence_properties, tags=tags)
 
+    def bulk_import(self, pid: int, nodes=None, issues=None, evidence=None, workers=8) -> dict:
+        """
+        Creates many nodes, issues and evidence in parallel. Nodes and issues are created first,
+        evidence can reference them through 'node_ref' and 'issue_ref'.
+        Returns a per-item report, see dradis.bulk.bulk_import for the input and report format.
+        """
+        from dradis import bulk
+
+        return bulk.bulk_import(self, pid, nodes=nodes, issues=issues, evidence=evidence, workers=workers)
+
+    def upsert_issues(self, pid: int, issues: list, key='title', workers=8) -> list:
+        """
+        Creates missing Issues and updates changed ones, matched by key ('title', a field name, 'hash' or a
+        callable). Unchanged Issues are not written. See dradis.upsert.upsert_issues for the report format.
+        """
+        from dradis import upsert
+
+        return upsert.upsert_issues(self, pid, issues, key=key, workers=workers)
+
+    def upsert_evidence(self, pid: int, evidence: list, key=None, workers=8) -> list:
+        """
+        Creates missing Evidence and updates changed ones, matched by node, issue and key (None, a field name,
+        'hash' or a callable). Unchanged Evidence is not written. See dradis.upsert.upsert_evidence.
+        """
+        from dradis import upsert
+
+        return upsert.upsert_evidence(self, pid, evidence, key=key, workers=workers)
+
     def delete_evidence(self, pid: int, node_id: int, evidence_id: int) -> bool:
         """
         Deletes a piece of Evidence from the specified Node in your project.
@@ -676,6 +1314,15 @@ class DradisClient:
 
         return result
 
+    def iter_content_blocks(self, pid: int, prefetch=False, stream=False, fields=None):
+        """
+        Yields all of the Content Blocks in your project, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = self.__url + self.content_blocks_endpoint
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        return self._iter_pages(url, header, prefetch, stream, fields)
+
     def get_content_block(self, pid: int, block_id: int) -> dict:
         '''
         Retrieves a single Content Block from your project.
@@ -690,20 +1337,21 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _content_block_data(block_properties: dict, block_group=None) -> dict:
+        data = {'content_block': {'content': markup.dumps(block_properties)}}
+
+        if block_group:
+            data["content_block"]["block_group"] = block_group
+
+        return data
+
     def _content_block_request(self, url: str, method: str, return_code: int, pid: int,
                                block_properties: dict, block_group=None) -> int:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
                   'Content-type': 'application/json'}
 
-        block_content = ''
-
-        for key, value in block_properties.items():
-            block_content += f'#[{key}]#\r\n{value}\r\n\r\n'
-
-        data = {'content_block': {'content': block_content}}
-
-        if block_group:
-            data["content_block"]["block_group"] = block_group
+        data = self._content_block_data(block_properties, block_group)
 
         r = self.contact_dradis(url, header, method, str(return_code), json.dumps(data))
 
@@ -770,6 +1418,15 @@ class DradisClient:
 
         return result
 
+    def iter_notes(self, pid: int, node_id: int, prefetch=False, stream=False, fields=None):
+        """
+        Yields all of the Notes associated with the specific Node in your project, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = f'{self.__url}{self.note_endpoint.format(id=node_id)}'
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        return self._iter_pages(url, header, prefetch, stream, fields)
+
     def get_note(self, pid: int, node_id: int, note_id: int) -> dict:
         """
         Retrieves a single Note from the specific Node in your project.
@@ -784,17 +1441,16 @@ class DradisClient:
 
         return r
 
+    @staticmethod
+    def _note_data(note_properties: dict, category_id=0) -> dict:
+        return {'note': {'text': markup.dumps(note_properties), 'category_id': str(category_id)}}
+
     def _note_request(self, url: str, method: str, return_code: int, pid: int,
                       note_properties: dict, category_id=0) -> int:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
                   'Content-type': 'application/json'}
 
-        note_content = ''
-
-        for key, value in note_properties.items():
-            note_content += f'#[{key}]#\r\n{value}\r\n\r\n'
-
-        data = {'note': {'text': note_content, 'category_id': str(category_id)}}
+        data = self._note_data(note_properties, category_id)
 
         r = self.contact_dradis(url, header, method, str(return_code), json.dumps(data))
 
@@ -953,7 +1609,8 @@ class DradisClient:
 
         return r
 
-    def download_attachment(self, pid: int, node_id: int, attachment_name: str, cookie: str, output_file=None) -> bool:
+    def download_attachment(self, pid: int, node_id: int, attachment_name: str, cookie: str, output_file=None,
+                            chunk_size=65536) -> bool:
         '''
         Download a single attachment from a Node in your project. Fetching the file / attachment from the
         the API is not possible. Therefore, a valid '_dradis_session' cookie is necessary. The value can
@@ -963,47 +1620,177 @@ class DradisClient:
         header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
         r = self.contact_dradis(url, header, "GET", "200")
 
-        cookies = {'_dradis_session': cookie}
-
         try:
             download = r["link"]
 
-            response = requests.get(self.__url + download, cookies=cookies, stream=True, verify=self.__verify)
             if output_file is None:
                 output_file = r["filename"]
 
-            with open(output_file, "wb") as out_file:
-                shutil.copyfileobj(response.raw, out_file)
-            del response
+            self._stream_download(download, output_file, cookie, chunk_size=chunk_size, resume=False,
+                                  skip_existing=False)
         except Exception as err:
             self.__logger.warning("Unexpected exception: {0}".format(err))
             return False
 
         return True
 
+    def download_attachments(self, pid: int, node_ids: list, dest_dir: str, cookie: str, chunk_size=65536,
+                             workers=8, resume=True, skip_existing=True) -> dict:
+        '''
+        Downloads all attachments of the given Nodes in parallel into dest_dir/<node id>/<filename>.
+        Partial downloads are resumed and files that are already complete are skipped.
+        Needs a valid '_dradis_session' cookie, see self.get_dradis_cookie().
+        Returns a report with one entry per file and the overall throughput, see dradis.attachments.
+        '''
+        from dradis import attachments
+
+        return attachments.download_attachments(self, pid, node_ids, dest_dir, cookie, chunk_size=chunk_size,
+                                                workers=workers, resume=resume, skip_existing=skip_existing)
+
+    def _stream_download(self, link: str, output_file: str, cookie: str, chunk_size=65536, resume=True,
+                         skip_existing=True) -> dict:
+        """
+        Streams the file behind an attachment link to output_file in chunks of chunk_size bytes.
+
+        @resume: Continue an interrupted download from output_file + '.part' using an HTTP Range request. The request
+        carries If-Range with the ETag (or Last-Modified) of the interrupted download, kept in output_file + '.part.json',
+        so a file that changed meanwhile is downloaded again in full instead of being spliced. A resumed file is
+        checked against Content-MD5 if the server sends it.
+        @skip_existing: Do not download if output_file exists and matches the remote size or Content-MD5.
+        Returns a dict with 'path', 'status' (downloaded, resumed or skipped), 'bytes', 'seconds' and 'bytes_per_sec'.
+        """
+        url = self.__url + link
+        cookies = {'_dradis_session': cookie}
+        part_file = output_file + '.part'
+        result = {'path': output_file, 'status': 'downloaded', 'bytes': 0, 'seconds': 0.0, 'bytes_per_sec': 0.0}
+        start = time.perf_counter()
+
+        if skip_existing and os.path.exists(output_file):
+            with self.__session.head(url, cookies=cookies, allow_redirects=True, verify=self.__verify) as head:
+                remote_md5 = head.headers.get('Content-MD5')
+                remote_size = head.headers.get('Content-Length')
+
+            if remote_md5 is not None:
+                with open(output_file, 'rb') as local_file:
+                    digest = hashlib.md5()
+                    for chunk in iter(lambda: local_file.read(chunk_size), b''):
+                        digest.update(chunk)
+                unchanged = base64.b64encode(digest.digest()).decode() == remote_md5
+            else:
+                unchanged = remote_size is not None and int(remote_size) == os.path.getsize(output_file)
+
+            if unchanged:
+                result['status'] = 'skipped'
+                return result
+
+        # Only resume if the version of the partial download is known, otherwise If-Range can not guard it.
+        state_file = part_file + '.json'
+        state = {}
+        if resume and os.path.exists(part_file) and os.path.exists(state_file):
+            with open(state_file, 'r') as in_file:
+                state = json.load(in_file)
+        offset = os.path.getsize(part_file) if state.get('validator') else 0
+        header = {'Range': f'bytes={offset}-', 'If-Range': state['validator']} if offset else {}
+
+        if self.__instrumentation is not None:
+            reset_connection_timings()
+
+        with self.__session.get(url, cookies=cookies, headers=header, stream=True, verify=self.__verify) as response:
+            if response.status_code == 416 and offset:  # The partial file sent in Range is already complete.
+                result['status'] = 'resumed'
+            else:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    result['status'] = 'resumed'
+                    mode = 'ab'
+                else:
+                    mode = 'wb'
+                    etag = response.headers.get('ETag')
+                    state = {'validator': etag if etag and not etag.startswith('W/')
+                             else response.headers.get('Last-Modified'),
+                             'md5': response.headers.get('Content-MD5')}
+                    with open(state_file, 'w') as out_file:
+                        json.dump(state, out_file)
+
+                with open(part_file, mode) as out_file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        out_file.write(chunk)
+                        result['bytes'] += len(chunk)
+
+        if result['status'] == 'resumed' and state.get('md5'):
+            with open(part_file, 'rb') as in_file:
+                digest = hashlib.md5()
+                for chunk in iter(lambda: in_file.read(chunk_size), b''):
+                    digest.update(chunk)
+            if base64.b64encode(digest.digest()).decode() != state['md5']:
+                os.remove(part_file)
+                os.remove(state_file)
+                raise IOError(f'The resumed download of {output_file} does not match its Content-MD5.')
+
+        os.replace(part_file, output_file)
+        if os.path.exists(state_file):
+            os.remove(state_file)
+        self._record('GET', url, response, start, 0, result['bytes'])
+
+        result['seconds'] = time.perf_counter() - start
+        result['bytes_per_sec'] = result['bytes'] / result['seconds'] if result['seconds'] else 0.0
+        return result
+
     def create_attachment(self, pid: int, node_id: int, attachment_filename: str) -> list:
         """
         Creates an Attachment on the specified Node in your project.
         """
-        url = self.__url + self.attachment_endpoint.format(id=node_id)
-        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
-
         try:
-            files = [('files[]', open(attachment_filename, 'rb'))]
-
-            r = requests.post(url, headers=header, files=files, verify=self.__verify)
-            if r.status_code != 201:
+            r = self._upload_files(pid, node_id, [attachment_filename])['attachments']
+            if r is None:
                 self.__logger.warning(
-                    f'It was not possible to rename the attachment {attachment_filename}. See the response '
-                    f'for further details:\n{r}')
+                    f'It was not possible to create the attachment {attachment_filename}.')
                 return []
             else:
-                r = r.json()
                 return [r[0]["filename"], r[0]["link"]]
         except Exception as err:
             self.__logger.warning("Unexpected exception: {0}".format(err))
             return []
 
+    def create_attachments(self, pid: int, uploads: dict, files_per_request=10, workers=4) -> dict:
+        """
+        Uploads many files to many Nodes in your project. Up to files_per_request files are sent per request
+        and the requests run in parallel.
+
+        @uploads: dict node id -> list of file paths.
+        Returns a report with one entry per request and the overall throughput, see dradis.attachments.
+        """
+        from dradis import attachments
+
+        return attachments.create_attachments(self, pid, uploads, files_per_request=files_per_request,
+                                              workers=workers)
+
+    def _upload_files(self, pid: int, node_id: int, paths: list) -> dict:
+        """
+        Uploads the files in one multipart request, streaming them from disk. The files are closed afterwards.
+        Returns {'attachments': <parsed response or None if Dradis rejected the upload>, 'bytes': <bytes sent>}.
+        """
+        url = self.__url + self.attachment_endpoint.format(id=node_id)
+
+        from dradis import attachments
+
+        with ExitStack() as stack:
+            files = [('files[]', os.path.basename(path), stack.enter_context(open(path, 'rb'))) for path in paths]
+            body = attachments.MultipartFileStream(files)
+            header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid),
+                      'Content-Type': body.content_type}
+            # Goes through _send like every other write: rate limit, retry policy and instrumentation.
+            r = self._send('POST', url, header, body)
+
+        if r.status_code != 201:
+            self.__logger.warning(f'Upload to node {node_id} failed with status code {r.status_code}.')
+            return {'attachments': None, 'bytes': body.bytes_read}
+
+        if self.__cache is not None:
+            self.__cache.invalidate('attachments', str(pid))
+
+        return {'attachments': r.json(), 'bytes': body.bytes_read}
+
     def rename_attachment(self, pid: int, node_id: int, attachment_filename: str, new_attachment_filename: str) -> dict:
         """
         Renames a specific Attachment on a Node in your project.
@@ -1052,6 +1839,14 @@ class DradisClient:
 
         return r
 
+    def iter_issue_library(self, prefetch=False, stream=False, fields=None):
+        """
+        Yields all of the IssueLibrary entries from your instance, fetching them page by page.
+        Raises DradisAPIError if a page can not be fetched.
+        """
+        url = self.__url + self.issue_library_endpoint
+        return self._iter_pages(url, self.__header, prefetch, stream, fields)
+
     def get_issue_library_entry(self, issuelib_id: int) -> dict:
         """
         Retrieves a single IssueLibrary entry.
@@ -1065,14 +1860,12 @@ class DradisClient:
 
         return r
 
-    def _issue_library_request(self, url: str, method: str, return_code: int, issue_library_properties: dict) -> int:
+    @staticmethod
+    def _issue_library_data(issue_library_properties: dict) -> dict:
+        return {'entry': {'content': markup.dumps(issue_library_properties)}}
 
-        issue_library_content = ''
-
-        for key, value in issue_library_properties.items():
-            issue_library_content += f'#[{key}]#\r\n{value}\r\n\r\n'
-
-        data = {'entry': {'content': issue_library_content}}
+    def _issue_library_request(self, url: str, method: str, return_code: int, issue_library_properties: dict) -> int:
+        data = self._issue_library_data(issue_library_properties)
 
         r = self.contact_dradis(url, self.__headerCt, method, str(return_code), json.dumps(data))
 
@@ -1110,3 +1903,4 @@ class DradisClient:
             return False
 
         return True
+
@@ -0,0 +1,918 @@
+#####################################################################################
+#                  Dradis-Client: asyncio API Wrapper for Dradis                    #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import json
+import logging
+import ssl
+
+from dradis import DradisClient, records
+
+
+class AsyncDradisClient:
+    """
+    asyncio flavour of DradisClient. Every endpoint method is a coroutine with the same name,
+    parameters and return values as its DradisClient counterpart. Requires the optional
+    dependency aiohttp (pip install dradis-client[async]).
+    """
+    team_endpoint = DradisClient.team_endpoint
+    user_endpoint = DradisClient.user_endpoint
+    project_endpoint = DradisClient.project_endpoint
+    node_endpoint = DradisClient.node_endpoint
+    issue_endpoint = DradisClient.issue_endpoint
+    evidence_endpoint = DradisClient.evidence_endpoint
+    note_endpoint = DradisClient.note_endpoint
+    attachment_endpoint = DradisClient.attachment_endpoint
+    content_blocks_endpoint = DradisClient.content_blocks_endpoint
+    document_properties_endpoint = DradisClient.document_properties_endpoint
+    issue_library_endpoint = DradisClient.issue_library_endpoint
+
+    def __init__(self, api_token: str, url: str, debug=False, verify=True, pool_maxsize=10, concurrency=10):
+        self.__apiToken = api_token  # API Token
+        self.__url = url  # Dradis URL (eg. https://your_dradis_server.com)
+        self.__header = {'Authorization': f'Token token={self.__apiToken}'}
+        self.__headerCt = {'Authorization': f'Token token={self.__apiToken}', 'Content-type': 'application/json'}
+        self.__debug = debug  # Debugging True?
+        self.__verify = verify  # Path to SSL certificate
+        self.__pool_maxsize = pool_maxsize  # Maximum number of open connections
+        self.__concurrency = concurrency  # Maximum number of requests in flight
+        self.__logger = DradisClient._set_logging(debug)  # Shared with DradisClient
+        self.__session = None  # Created lazily inside the running event loop
+        self.__semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def debug(self, val: bool):
+        self.__debug = val
+        self.__logger.setLevel(logging.DEBUG if val else logging.INFO)
+
+    async def close(self):
+        """
+        Closes the connection pool.
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def _ssl_context(self):
+        if self.__verify is False:
+            return False
+        if isinstance(self.__verify, str):
+            return ssl.create_default_context(cafile=self.__verify)
+        return None
+
+    def _get_session(self):
+        if self.__session is None:
+            import asyncio
+
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError('AsyncDradisClient requires aiohttp. Install it with '
+                                  '"pip install dradis-client[async]".')
+
+            connector = aiohttp.TCPConnector(limit=self.__pool_maxsize, ssl=self._ssl_context())
+            self.__session = aiohttp.ClientSession(connector=connector)
+            self.__semaphore = asyncio.Semaphore(self.__concurrency)
+        return self.__session
+
+    def _project_header(self, pid: int, content_type=False) -> dict:
+        header = {'Authorization': f'Token token="{self.__apiToken}"', 'Dradis-Project-Id': str(pid)}
+        if content_type:
+            header['Content-type'] = 'application/json'
+        return header
+
+    async def contact_dradis(self, url: str, header: dict, req_type: str, response_code: str, data=""):
+        """
+        Send Requests to Dradis (& DebugCheck for Error Codes)
+        """
+        session = self._get_session()
+
+        async with self.__semaphore:
+            async with session.request(req_type, url, headers=header, data=data or None) as results:
+                content = await results.read()
+                status = results.status
+
+        if self.__logger.isEnabledFor(logging.DEBUG):
+            self.__logger.debug('Server Response:\n%s %s\n---\n%s', req_type, status, content[:1024])
+
+        if str(status) != str(response_code):
+            return None
+
+        return json.loads(content)
+
+    ####################################
+    #         Teams Endpoint           #
+    ####################################
+
+    async def get_teams_list(self, full=False) -> list:
+        """
+        Retrieves all teams as list, reduced by name and team id.
+        @full: Return Team records with all fields of the response instead.
+        """
+        url = self.__url + self.team_endpoint
+        r = await self.contact_dradis(url, self.__headerCt, "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No teams found.')
+            return []
+
+        if full:
+            return [records.Team(i) for i in r]
+
+        return [[[i["name"], i["id"]]] for i in r]
+
+    async def get_team(self, team_id: int) -> dict:
+        """
+        Retrieves a single team.
+        """
+        url = f'{self.__url}{self.team_endpoint}/{team_id}'
+        r = await self.contact_dradis(url, self.__headerCt, "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No team with team id {team_id} found.')
+            return {}
+
+        return r
+
+    async def create_team(self, team_name: str) -> int:
+        """
+        Creates a team based on the name.
+        Returns the new created team id.
+        """
+        url = self.__url + self.team_endpoint
+        data = DradisClient._team_data(team_name)
+        r = await self.contact_dradis(url, self.__headerCt, "POST", "201", json.dumps(data))
+
+        if r is None:
+            self.__logger.warning('Creation of the team fails.')
+            return -1
+
+        return r['id']
+
+    async def update_team(self, team_id: int, team_name: str) -> int:
+        """
+        Updates a team. Pass the name of the team.
+        """
+        url = f'{self.__url}{self.team_endpoint}/{team_id}'
+        data = DradisClient._team_data(team_name)
+        r = await self.contact_dradis(url, self.__headerCt, "PUT", "200", json.dumps(data))
+
+        if r is None:
+            self.__logger.warning('Update of the team fails.')
+            return -1
+
+        return r['id']
+
+    async def delete_team(self, team_id: int) -> bool:
+        """
+        Deletes a team.
+        """
+        url = f'{self.__url}{self.team_endpoint}/{team_id}'
+        r = await self.contact_dradis(url, self.__header, "DELETE", "200")
+        return r is not None
+
+    async def find_team_by_name(self, team_name: str) -> dict:
+        """
+        Search for Team by team name.
+        """
+        url = self.__url + self.team_endpoint
+        r = await self.contact_dradis(url, self.__headerCt, "GET", "200")
+
+        for team in r or []:
+            if team.get('name') == team_name:
+                return team
+
+        self.__logger.warning(f'No team with team name {team_name} found.')
+        return {}
+
+    ####################################
+    #         Users Endpoint           #
+    ####################################
+
+    async def get_users_list(self, full=False) -> list:
+        """
+        Retrieves all users.
+        @full: Return User records with all fields of the response instead.
+        """
+        url = self.__url + self.user_endpoint
+        r = await self.contact_dradis(url, self.__headerCt, "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No users found.')
+            return []
+
+        if full:
+            return [records.User(i) for i in r]
+
+        return [[[i["name"], i["id"]]] for i in r]
+
+    async def get_user(self, user_id: int) -> dict:
+        """
+        Retrieves a single user.
+        """
+        url = f'{self.__url}{self.user_endpoint}/{user_id}'
+        r = await self.contact_dradis(url, self.__headerCt, "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No user with user id {user_id} found.')
+            return {}
+
+        return r
+
+    ####################################
+    #         Projects Endpoint        #
+    ####################################
+
+    async def get_project_list(self, full=False) -> list:
+        """
+        Retrieves all projects, reduced by name and project id.
+        @full: Return Project records with all fields of the response instead.
+        """
+        url = self.__url + self.project_endpoint
+        r = await self.contact_dradis(url, self.__header, "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No projects found.')
+            return []
+
+        if full:
+            return [records.Project(i) for i in r]
+
+        return [[[i["name"], i["id"]]] for i in r]
+
+    async def get_project(self, pid: int) -> dict:
+        """
+        Retrieves a single project.
+        """
+        url = f'{self.__url}{self.project_endpoint}/{pid}'
+        r = await self.contact_dradis(url, self.__header, "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No project with project id {pid} found.')
+            return {}
+
+        return r
+
+    async def create_project(self, project_name: str, team_id=None, report_template_properties_id=None,
+                             author_ids=None, template=None) -> int:
+        """
+        Creates a project. See DradisClient.create_project for the parameters.
+        """
+        url = self.__url + self.project_endpoint
+        data = DradisClient._project_data(project_name, team_id, report_template_properties_id, author_ids, template)
+        r = await self.contact_dradis(url, self.__headerCt, "POST", "201", json.dumps(data))
+
+        if r is None:
+            self.__logger.warning('Creation of the project fails.')
+            return -1
+
+        return r['id']
+
+    async def update_project(self, pid: int, project_name: str, team_id=None, report_template_properties_id=None,
+                             author_ids=None, template=None) -> int:
+        """
+        Updates a project.
+        """
+        url = f'{self.__url}{self.project_endpoint}/{pid}'
+        data = DradisClient._project_data(project_name, team_id, report_template_properties_id, author_ids, template)
+        r = await self.contact_dradis(url, self.__headerCt, "PUT", "200", json.dumps(data))
+
+        if r is None:
+            self.__logger.warning(f'Update of the project with the project id {pid} fails.')
+            return -1
+
+        return r['id']
+
+    async def delete_project(self, pid: int) -> bool:
+        """
+        Deletes a project.
+        """
+        url = f'{self.__url}{self.project_endpoint}/{pid}'
+        r = await self.contact_dradis(url, self.__header, "DELETE", "200")
+        return r is not None
+
+    async def find_project_by_name(self, project_name: str) -> dict:
+        """
+        Search for a Project by project name
+        """
+        url = self.__url + self.project_endpoint
+        r = await self.contact_dradis(url, self.__header, "GET", "200")
+
+        for project in r or []:
+            if project.get('name') == project_name:
+                return project
+
+        self.__logger.warning(f'No project with project name {project_name} found.')
+        return {}
+
+    ####################################
+    #         Nodes Endpoint           #
+    ####################################
+
+    async def get_node_list(self, pid: int, full=False) -> list:
+        """
+        Retrieves all the Nodes in your specific project, reduced by label and node id.
+        @full: Return Node records with all fields of the response instead.
+        """
+        url = self.__url + self.node_endpoint
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No nodes found.')
+            return []
+
+        if full:
+            return [records.Node(i) for i in r]
+
+        return [[[i["label"], i["id"]]] for i in r]
+
+    async def get_node(self, pid: int, node_id: int) -> dict:
+        """
+        Retrieves a single Node with all the Evidence and Notes associated with the Node.
+        """
+        url = f'{self.__url}{self.node_endpoint}/{node_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No node with node id {node_id} found.')
+            return {}
+
+        return r
+
+    async def create_node(self, pid: int, label: str, type_id=0, parent_id=None, position=1) -> int:
+        """
+        Creates a Node in the specified project. See DradisClient.create_node for the parameters.
+        """
+        url = self.__url + self.node_endpoint
+        data = DradisClient._node_data(label, type_id, parent_id, position)
+        r = await self.contact_dradis(url, self._project_header(pid, True), "POST", "201", json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def update_node(self, pid: int, node_id: int, label=None, type_id=None, parent_id=None,
+                          position=None) -> int:
+        """
+        Updates a Node in your specified project. You can update some or all of the Node attributes
+        """
+        url = f'{self.__url}{self.node_endpoint}/{node_id}'
+
+        if label == type_id == parent_id == position is None:
+            self.__logger.warning('Update of the node fails. No valid data were given.')
+            return -1
+
+        data = DradisClient._node_update_data(label, type_id, parent_id, position)
+        r = await self.contact_dradis(url, self._project_header(pid, True), "PUT", "200", json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def delete_node(self, pid: int, node_id: int) -> bool:
+        """
+        Deletes a Node from your specified project.
+        """
+        url = f'{self.__url}{self.node_endpoint}/{node_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #         Issues Endpoint          #
+    ####################################
+
+    async def get_issue_list(self, pid: int, full=False) -> list:
+        """
+        Retrieves all the Issues in your specific project, reduced by issue name and issue id.
+        @full: Return Issue records with all fields of the response instead.
+        """
+        url = self.__url + self.issue_endpoint
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No issues found.')
+            return []
+
+        if full:
+            return [records.Issue(i) for i in r]
+
+        return [[[i["title"], i["id"]]] for i in r]
+
+    async def get_issue(self, pid: int, issue_id: int) -> dict:
+        """
+        Retrieves a single Issue from your specified project.
+        """
+        url = f'{self.__url}{self.issue_endpoint}/{issue_id}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No issue with issue id {issue_id} found.')
+            return {}
+
+        return r
+
+    async def _issue_request(self, url: str, method: str, return_code: int, pid: int, title: str,
+                             issue_properties: dict, tags=None) -> int:
+        data = DradisClient._issue_data(title, issue_properties, tags)
+        r = await self.contact_dradis(url, self._project_header(pid, True), method.upper(), str(return_code),
+                                      json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def create_issue(self, pid: int, title: str, issue_properties: dict, tags=None) -> int:
+        """
+        Creates an Issue in the specified project.
+        """
+        url = self.__url + self.issue_endpoint
+        return await self._issue_request(url=url, method='POST', return_code=201, pid=pid, title=title,
+                                         issue_properties=issue_properties, tags=tags)
+
+    async def update_issue(self, pid: int, issue_id: int, title: str, issue_properties: dict, tags) -> int:
+        """
+        Updates an Issue in the specified project.
+        """
+        url = f'{self.__url}{self.issue_endpoint}/{issue_id}'
+        return await self._issue_request(url=url, method='PUT', return_code=200, pid=pid, title=title,
+                                         issue_properties=issue_properties, tags=tags)
+
+    async def delete_issue(self, pid: int, issue_id: int) -> bool:
+        """
+        Deletes an Issue from your specified project.
+        """
+        url = f'{self.__url}{self.issue_endpoint}/{issue_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #         Evidence Endpoint        #
+    ####################################
+
+    async def get_evidence_list(self, pid: int, node_id: int) -> list:
+        """
+        Retrieves all the Evidence associated with the specific Node in your project.
+        """
+        url = self.__url + self.evidence_endpoint.format(id=node_id)
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No evidences found.')
+            return []
+
+        return r
+
+    async def get_evidence(self, pid: int, node_id: int, evidence_id: int) -> dict:
+        """
+        Retrieves a single piece of Evidence from a Node in your project.
+        """
+        url = f'{self.__url}{self.evidence_endpoint.format(id=node_id)}/{evidence_id}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No evidences with evidence id {evidence_id} found.')
+            return {}
+
+        return r
+
+    async def _evidence_request(self, url: str, method: str, return_code: int, pid: int, issue_id: int,
+                                evidence_properties: dict, tags=None) -> int:
+        data = DradisClient._evidence_data(issue_id, evidence_properties, tags)
+        r = await self.contact_dradis(url, self._project_header(pid, True), method, str(return_code),
+                                      json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def create_evidence(self, pid: int, node_id: int, issue_id: int, evidence_properties: dict,
+                              tags=None) -> int:
+        """
+        Creates a piece of Evidence on the specified Node in your project.
+        """
+        url = self.__url + self.evidence_endpoint.format(id=node_id)
+        return await self._evidence_request(url=url, method='POST', return_code=201, pid=pid, issue_id=issue_id,
+                                            evidence_properties=evidence_properties, tags=tags)
+
+    async def update_evidence(self, pid: int, node_id: str, issue_id: int, evidence_id: str,
+                              evidence_properties: dict, tags=None) -> int:
+        """
+        Updates a specific piece of Evidence on a Node in your project.
+        """
+        url = f'{self.__url}{self.evidence_endpoint.format(id=node_id)}/{evidence_id}'
+        return await self._evidence_request(url=url, method='PUT', return_code=200, pid=pid, issue_id=issue_id,
+                                            evidence_properties=evidence_properties, tags=tags)
+
+    async def delete_evidence(self, pid: int, node_id: int, evidence_id: int) -> bool:
+        """
+        Deletes a piece of Evidence from the specified Node in your project.
+        """
+        url = f'{self.__url}{self.evidence_endpoint.format(id=node_id)}/{evidence_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #    Content Blocks Endpoint       #
+    ####################################
+
+    async def get_content_blocks(self, pid: int) -> list:
+        """
+        Retrieves all of the Content Blocks in your project, ordered by the Content Block id, ascending.
+        """
+        url = self.__url + self.content_blocks_endpoint
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No content blocks found.')
+            return []
+
+        return [[[i["title"], i["block_group"], i["id"]]] for i in r]
+
+    async def get_content_block(self, pid: int, block_id: int) -> dict:
+        """
+        Retrieves a single Content Block from your project.
+        """
+        url = f'{self.__url}{self.content_blocks_endpoint}/{block_id}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No content block with block id {block_id} found.')
+            return {}
+
+        return r
+
+    async def _content_block_request(self, url: str, method: str, return_code: int, pid: int,
+                                     block_properties: dict, block_group=None) -> int:
+        data = DradisClient._content_block_data(block_properties, block_group)
+        r = await self.contact_dradis(url, self._project_header(pid, True), method, str(return_code),
+                                      json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def create_content_block(self, pid: int, block_properties: dict, block_group=None) -> int:
+        """
+        Creates a Content Block in your project.
+        """
+        url = self.__url + self.content_blocks_endpoint
+        return await self._content_block_request(url=url, method='POST', return_code=201, pid=pid,
+                                                 block_properties=block_properties, block_group=block_group)
+
+    async def update_content_block(self, pid: int, block_id: int, block_properties: dict, block_group=None) -> int:
+        """
+        Updates a specific Content Block in your project.
+        """
+        url = f'{self.__url}{self.content_blocks_endpoint}/{block_id}'
+        return await self._content_block_request(url=url, method='PUT', return_code=200, pid=pid,
+                                                 block_properties=block_properties, block_group=block_group)
+
+    async def delete_content_block(self, pid: int, block_id: int) -> bool:
+        """
+        Deletes a specific Content Block from your project.
+        """
+        url = f'{self.__url}{self.content_blocks_endpoint}/{block_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #         Notes Endpoint           #
+    ####################################
+
+    async def get_note_list(self, pid: int, node_id: int) -> list:
+        """
+        Retrieves all of the Notes associated with the specific Node in your project.
+        """
+        url = f'{self.__url}{self.note_endpoint.format(id=node_id)}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No notes found.')
+            return []
+
+        return [[[i["title"], i["id"]]] for i in r]
+
+    async def get_note(self, pid: int, node_id: int, note_id: int) -> dict:
+        """
+        Retrieves a single Note from the specific Node in your project.
+        """
+        url = f'{self.__url}{self.note_endpoint.format(id=node_id)}/{note_id}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No notes with note id {note_id} on node id {node_id} found.')
+            return {}
+
+        return r
+
+    async def _note_request(self, url: str, method: str, return_code: int, pid: int,
+                            note_properties: dict, category_id=0) -> int:
+        data = DradisClient._note_data(note_properties, category_id)
+        r = await self.contact_dradis(url, self._project_header(pid, True), method, str(return_code),
+                                      json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def create_note(self, pid: int, node_id: int, note_properties: dict, category=0) -> int:
+        """
+        Creates a Note on the specified Node in your project.
+        """
+        url = self.__url + self.note_endpoint.format(id=node_id)
+        return await self._note_request(url=url, method="POST", return_code=201, pid=pid,
+                                        note_properties=note_properties, category_id=category)
+
+    async def update_note(self, pid: int, node_id: int, note_id: int, note_properties: dict, category=0) -> int:
+        """
+        Updates a Note on the specified Node in your project.
+        """
+        url = f'{self.__url}{self.note_endpoint.format(id=node_id)}/{note_id}'
+        return await self._note_request(url=url, method="PUT", return_code=200, pid=pid,
+                                        note_properties=note_properties, category_id=category)
+
+    async def delete_note(self, pid: int, node_id: int, note_id: int) -> bool:
+        """
+        Deletes a Note from the specified Node in your project.
+        """
+        url = f'{self.__url}{self.note_endpoint.format(id=node_id)}/{note_id}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #    Document Properties Endpoint  #
+    ####################################
+
+    async def get_document_properties(self, pid: int) -> list:
+        """
+        Retrieves all of the Document Properties associated with the specific project.
+        """
+        url = self.__url + self.document_properties_endpoint
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No document properties found.')
+            return []
+
+        return r
+
+    async def get_document_property(self, pid: int, property_key: str) -> dict:
+        """
+        Retrieves a single Document Property from your project.
+        """
+        url = f'{self.__url}{self.document_properties_endpoint}/{property_key}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No property with document property id {property_key} found.')
+            return {}
+
+        return r
+
+    async def create_document_properties(self, pid: int, document_properties: dict) -> bool:
+        """
+        Creates a Document Property in your project.
+        """
+        url = self.__url + self.document_properties_endpoint
+        data = {'document_properties': document_properties}
+        r = await self.contact_dradis(url, self._project_header(pid, True), 'POST', '201', json.dumps(data))
+
+        if r is None:
+            self.__logger.warning('It was not possible to create document properties.')
+            return False
+
+        return True
+
+    async def update_document_property(self, pid: int, property_key: str, property_value: str) -> bool:
+        """
+        Updates a Document Property in your project.
+        """
+        url = f'{self.__url}{self.document_properties_endpoint}/{property_key}'
+        data = {'document_property': {'value': property_value}}
+        r = await self.contact_dradis(url, self._project_header(pid, True), 'PUT', '200', json.dumps(data))
+
+        if r is None:
+            self.__logger.warning('It was not possible to update document properties.')
+            return False
+
+        return True
+
+    async def delete_document_property(self, pid: int, property_key: str) -> bool:
+        """
+        Deletes a Document Property in your project.
+        """
+        url = f'{self.__url}{self.document_properties_endpoint}/{property_key}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #       Attachments Endpoint       #
+    ####################################
+
+    async def get_attachment_list(self, pid: int, node_id: int) -> list:
+        """
+        Retrieves all the Attachments associated with the specific Node in your project.
+        """
+        url = self.__url + self.attachment_endpoint.format(id=node_id)
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No attachments found.')
+            return []
+
+        return r
+
+    async def get_attachment(self, pid: int, node_id: int, attachment_name: str) -> dict:
+        """
+        Retrieves a single attachment from a Node in your project.
+        """
+        url = f'{self.__url}{self.attachment_endpoint.format(id=node_id)}/{attachment_name}'
+        r = await self.contact_dradis(url, self._project_header(pid), "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No attachments found.')
+            return {}
+
+        return r
+
+    async def download_attachment(self, pid: int, node_id: int, attachment_name: str, cookie: str,
+                                  output_file=None, chunk_size=65536) -> bool:
+        """
+        Download a single attachment from a Node in your project. A valid '_dradis_session' cookie is
+        necessary, see DradisClient.get_dradis_cookie().
+        The file is written to output_file + '.part' on the default executor, off the event loop, and only renamed
+        to output_file once the whole body arrived, so a failed or cancelled download never looks complete.
+        """
+        import asyncio
+        import os
+
+        r = await self.get_attachment(pid, node_id, attachment_name)
+        loop = asyncio.get_event_loop()
+        part_file = None
+        complete = False
+
+        try:
+            download = r["link"]
+
+            if output_file is None:
+                output_file = r["filename"]
+            part_file = output_file + '.part'
+
+            session = self._get_session()
+            async with self.__semaphore:
+                async with session.get(self.__url + download, cookies={'_dradis_session': cookie}) as response:
+                    if response.status != 200:
+                        # An error page (e.g. the login page for an expired cookie) is not the attachment.
+                        self.__logger.warning(f'Download of {attachment_name} failed with status code '
+                                              f'{response.status}.')
+                        return False
+                    out_file = await loop.run_in_executor(None, open, part_file, 'wb')
+                    try:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            await loop.run_in_executor(None, out_file.write, chunk)
+                    finally:
+                        await loop.run_in_executor(None, out_file.close)
+
+            await loop.run_in_executor(None, os.replace, part_file, output_file)
+            complete = True
+        except Exception as err:
+            self.__logger.warning("Unexpected exception: {0}".format(err))
+            return False
+        finally:
+            # Also runs when the task is cancelled, where a further await could be cancelled in turn.
+            if not complete and part_file is not None and os.path.exists(part_file):
+                os.remove(part_file)
+
+        return True
+
+    async def create_attachment(self, pid: int, node_id: int, attachment_filename: str) -> list:
+        """
+        Creates an Attachment on the specified Node in your project.
+        """
+        import aiohttp
+
+        url = self.__url + self.attachment_endpoint.format(id=node_id)
+
+        try:
+            session = self._get_session()
+            with open(attachment_filename, 'rb') as attachment:
+                form = aiohttp.FormData()
+                form.add_field('files[]', attachment)
+
+                async with self.__semaphore:
+                    async with session.post(url, headers=self._project_header(pid), data=form) as response:
+                        status = response.status
+                        r = await response.json(content_type=None)
+
+            if status != 201:
+                self.__logger.warning(f'It was not possible to create the attachment {attachment_filename}.')
+                return []
+
+            return [r[0]["filename"], r[0]["link"]]
+        except Exception as err:
+            self.__logger.warning("Unexpected exception: {0}".format(err))
+            return []
+
+    async def rename_attachment(self, pid: int, node_id: int, attachment_filename: str,
+                                new_attachment_filename: str) -> dict:
+        """
+        Renames a specific Attachment on a Node in your project.
+        """
+        url = f'{self.__url}{self.attachment_endpoint.format(id=node_id)}/{attachment_filename}'
+        data = {"attachment": {"filename": new_attachment_filename}}
+        r = await self.contact_dradis(url, self._project_header(pid, True), "PUT", "200", json.dumps(data))
+
+        if r is None:
+            self.__logger.warning(f'It was not possible to rename the attachment {attachment_filename}.')
+            return {}
+
+        return r
+
+    async def delete_attachment(self, pid: int, node_id: int, attachment_name: str) -> bool:
+        """
+        Deletes an Attachment from the specified Node in your project.
+        """
+        url = f'{self.__url}{self.attachment_endpoint.format(id=node_id)}/{attachment_name}'
+        r = await self.contact_dradis(url, self._project_header(pid, True), "DELETE", "200")
+        return r is not None
+
+    ####################################
+    #       IssueLibrary Endpoint      #
+    ####################################
+
+    async def get_issue_library_list(self) -> list:
+        """
+        Retrieves all of the IssueLibrary entries from your instance.
+        """
+        url = self.__url + self.issue_library_endpoint
+        r = await self.contact_dradis(url, self.__header, "GET", "200")
+
+        if r is None:
+            self.__logger.warning('No issues in IssueLibrary were found.')
+            return []
+
+        return r
+
+    async def get_issue_library_entry(self, issuelib_id: int) -> dict:
+        """
+        Retrieves a single IssueLibrary entry.
+        """
+        url = f'{self.__url}{self.issue_library_endpoint}/{issuelib_id}'
+        r = await self.contact_dradis(url, self.__header, "GET", "200")
+
+        if r is None:
+            self.__logger.warning(f'No library issue with issuelib id {issuelib_id} found.')
+            return {}
+
+        return r
+
+    async def _issue_library_request(self, url: str, method: str, return_code: int,
+                                     issue_library_properties: dict) -> int:
+        data = DradisClient._issue_library_data(issue_library_properties)
+        r = await self.contact_dradis(url, self.__headerCt, method, str(return_code), json.dumps(data))
+
+        if r is None:
+            return -1
+
+        return r['id']
+
+    async def create_issue_library_entry(self, issue_library_properties: dict) -> int:
+        """
+        Creates an IssueLibrary entry.
+        """
+        url = self.__url + self.issue_library_endpoint
+        return await self._issue_library_request(url=url, method="POST", return_code=201,
+                                                 issue_library_properties=issue_library_properties)
+
+    async def update_issue_library_entry(self, issue_library_properties: dict, issuelib_id: int) -> int:
+        """
+        Updates a specific IssueLibrary entry.
+        """
+        url = f'{self.__url}{self.issue_library_endpoint}/{issuelib_id}'
+        return await self._issue_library_request(url=url, method="PUT", return_code=200,
+                                                 issue_library_properties=issue_library_properties)
+
+    async def delete_issue_library_entry(self, issuelib_id: int) -> bool:
+        """
+        Deletes a specific IssueLibrary entry from your instance.
+        """
+        url = f'{self.__url}{self.issue_library_endpoint}/{issuelib_id}'
+        r = await self.contact_dradis(url, self.__header, "DELETE", "200")
+        return r is not None
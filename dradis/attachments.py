@@ -0,0 +1,190 @@
+#####################################################################################
+#              Dradis-Client: Parallel attachment downloads and uploads             #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import mimetypes
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from dradis.bulk import run_parallel
+
+
+class MultipartFileStream:
+    """
+    multipart/form-data body that reads the files from disk while it is sent instead of building the whole body in
+    memory. requests streams it because it is iterable, and sends a Content-Length because it has a length.
+
+    @files: list of (field name, filename, binary file object) tuples. The file objects are not closed.
+    rewind() starts the body over, so a failed request can be sent again.
+    """
+
+    def __init__(self, files: list, chunk_size=65536):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f'multipart/form-data; boundary={self.boundary}'
+        self.chunk_size = chunk_size
+        self.__parts = []  # bytes and file objects, sent in order
+        self.__offsets = {}  # part index -> start position of a file object
+        self.__length = 0
+
+        for field, filename, file_object in files:
+            content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            filename = filename.replace('"', '%22')
+            head = (f'--{self.boundary}\r\n'
+                    f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                    f'Content-Type: {content_type}\r\n\r\n').encode()
+            self.__add(head)
+            self.__offsets[len(self.__parts)] = file_object.tell()
+            self.__parts.append(file_object)
+            self.__length += os.fstat(file_object.fileno()).st_size - file_object.tell()
+            self.__add(b'\r\n')
+        self.__add(f'--{self.boundary}--\r\n'.encode())
+
+        self.__original = list(self.__parts)
+        self.__current = 0
+        self.__bytes_read = 0
+
+    def __add(self, data: bytes):
+        self.__parts.append(data)
+        self.__length += len(data)
+
+    def __len__(self):
+        return self.__length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    @property
+    def bytes_read(self) -> int:
+        return self.__bytes_read
+
+    def rewind(self):
+        self.__parts = list(self.__original)
+        for index, offset in self.__offsets.items():
+            self.__parts[index].seek(offset)
+        self.__current = 0
+        self.__bytes_read = 0
+
+    def read(self, size=-1) -> bytes:
+        if size is None or size < 0:
+            size = self.__length
+        chunks = []
+        while size > 0 and self.__current < len(self.__parts):
+            part = self.__parts[self.__current]
+            if isinstance(part, bytes):
+                chunk, self.__parts[self.__current] = part[:size], part[size:]
+                if not self.__parts[self.__current]:
+                    self.__current += 1
+            else:
+                chunk = part.read(size)
+                if not chunk:
+                    self.__current += 1
+                    continue
+            chunks.append(chunk)
+            size -= len(chunk)
+
+        data = b''.join(chunks)
+        self.__bytes_read += len(data)
+        return data
+
+
+def create_attachments(client, pid: int, uploads: dict, files_per_request=10, workers=4) -> dict:
+    """
+    Uploads many files to many nodes, sending up to files_per_request files per request and running the requests
+    of all nodes on a thread pool.
+
+    @uploads: dict node id -> list of file paths.
+    Returns {'requests': [...], 'bytes': int, 'seconds': float, 'bytes_per_sec': float}. Every request entry holds
+    'node_id', 'files', 'attachments' (list of [filename, link]), 'bytes' and 'error'.
+    """
+    start = time.perf_counter()
+    batches = []
+    for node_id, paths in uploads.items():
+        for offset in range(0, len(paths), files_per_request):
+            batches.append((node_id, list(paths[offset:offset + files_per_request])))
+
+    def upload(batch):
+        node_id, paths = batch
+        return client._upload_files(pid, node_id, paths)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = run_parallel(executor, upload, batches)
+
+    report = []
+    for (node_id, paths), (result, error) in zip(batches, results):
+        entry = {'node_id': node_id, 'files': paths, 'attachments': [], 'bytes': 0, 'error': None}
+        if error is not None:
+            entry['error'] = str(error)
+        elif result['attachments'] is None:
+            entry['error'] = 'Dradis rejected the upload.'
+            entry['bytes'] = result['bytes']
+        else:
+            entry['attachments'] = [[a['filename'], a['link']] for a in result['attachments']]
+            entry['bytes'] = result['bytes']
+        report.append(entry)
+
+    seconds = time.perf_counter() - start
+    total = sum(entry['bytes'] for entry in report if entry['error'] is None)
+    return {'requests': report, 'bytes': total, 'seconds': seconds,
+            'bytes_per_sec': total / seconds if seconds else 0.0}
+
+
+def download_attachments(client, pid: int, node_ids: list, dest_dir: str, cookie: str, chunk_size=65536,
+                         workers=8, resume=True, skip_existing=True) -> dict:
+    """
+    Lists the attachments of every node and downloads them in parallel over the client's connection pool
+    into dest_dir/<node id>/<filename>.
+
+    Returns {'files': [...], 'bytes': int, 'seconds': float, 'bytes_per_sec': float}. Every file entry holds
+    'node_id', 'filename', 'path', 'status' (downloaded, resumed, skipped or failed), 'bytes', 'seconds',
+    'bytes_per_sec' and 'error'. A node whose attachments can not be listed gets one failed entry with filename None.
+    """
+    start = time.perf_counter()
+
+    def list_node(node_id):
+        client.pop_last_failure()
+        listing = client.get_attachment_list(pid=pid, node_id=node_id)
+        failure = client.pop_last_failure()
+        if failure is not None:
+            raise failure
+        return listing
+
+    def download(job):
+        node_id, attachment = job
+        directory = os.path.join(dest_dir, str(node_id))
+        os.makedirs(directory, exist_ok=True)
+        output_file = os.path.join(directory, os.path.basename(attachment['filename']))
+        return client._stream_download(attachment['link'], output_file, cookie, chunk_size=chunk_size,
+                                       resume=resume, skip_existing=skip_existing)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = []
+        files = []
+        for node_id, (listing, error) in zip(node_ids, run_parallel(executor, list_node, node_ids)):
+            if error is not None:
+                files.append({'node_id': node_id, 'filename': None, 'path': None, 'status': 'failed', 'bytes': 0,
+                              'seconds': 0.0, 'bytes_per_sec': 0.0,
+                              'error': f'Could not list the attachments: {error}'})
+            jobs.extend((node_id, attachment) for attachment in listing or [])
+
+        for (node_id, attachment), (result, error) in zip(jobs, run_parallel(executor, download, jobs)):
+            if error is not None:
+                result = {'path': None, 'status': 'failed', 'bytes': 0, 'seconds': 0.0, 'bytes_per_sec': 0.0}
+            result.update({'node_id': node_id, 'filename': attachment['filename'],
+                           'error': None if error is None else str(error)})
+            files.append(result)
+
+    seconds = time.perf_counter() - start
+    total = sum(result['bytes'] for result in files)
+    return {'files': files, 'bytes': total, 'seconds': seconds, 'bytes_per_sec': total / seconds if seconds else 0.0}
@@ -0,0 +1,144 @@
+#####################################################################################
+#              Dradis-Client: Bulk import of nodes, issues and evidence             #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_parallel(executor: ThreadPoolExecutor, fn, items: list) -> list:
+    """
+    Calls fn(item) for every item on the executor and returns (result, error) tuples in input order.
+    An exception raised by fn is returned as error instead of aborting the other calls.
+    """
+    futures = [executor.submit(fn, item) for item in items]
+    results = []
+    for future in futures:
+        try:
+            results.append((future.result(), None))
+        except Exception as err:
+            results.append((None, err))
+    return results
+
+
+def _result(index: int, spec: dict, new_id=-1, error=None) -> dict:
+    return {'index': index, 'ref': spec.get('ref'), 'id': new_id, 'error': error}
+
+
+def _resolve(spec: dict, ref_key: str, id_key: str, refs: dict):
+    """
+    Returns the id referenced by spec, either directly (id_key) or via a ref created in this import (ref_key).
+    """
+    if spec.get(ref_key) is not None:
+        return refs.get(spec[ref_key], -1)
+    return spec.get(id_key)
+
+
+def bulk_import(client, pid: int, nodes=None, issues=None, evidence=None, workers=8) -> dict:
+    """
+    Creates nodes, issues and evidence in a project using a pool of worker threads.
+
+    Nodes are created tier by tier: top-level nodes (and all issues) first, then the children of nodes created in
+    the previous tier. Evidence is created last, once all node and issue ids are known.
+
+    @nodes: list of dicts with 'label' and optional 'ref', 'type_id', 'position' and either 'parent_ref' (ref of a
+    node in this import) or 'parent_id' (id of an existing node).
+    @issues: list of dicts with 'title', 'issue_properties' and optional 'ref' and 'tags'.
+    @evidence: list of dicts with 'evidence_properties', optional 'tags', 'node_ref' or 'node_id' and 'issue_ref'
+    or 'issue_id'.
+    @workers: number of requests sent in parallel, see pool_maxsize of DradisClient._create_session.
+
+    Returns a report {'nodes': [...], 'issues': [...], 'evidence': [...]} with one entry per input item, in input
+    order: {'index', 'ref', 'id', 'error'}. Failed items have id -1 and an error message.
+    """
+    nodes = nodes or []
+    issues = issues or []
+    evidence = evidence or []
+
+    report = {'nodes': [None] * len(nodes), 'issues': [None] * len(issues), 'evidence': [None] * len(evidence)}
+    node_refs = {}
+    issue_refs = {}
+
+    def create_node(item):
+        index, spec, parent_id = item
+        return client.create_node(pid=pid, label=spec['label'], type_id=spec.get('type_id', 0),
+                                  parent_id=parent_id, position=spec.get('position', 1))
+
+    def create_issue(item):
+        index, spec = item
+        return client.create_issue(pid=pid, title=spec['title'], issue_properties=spec.get('issue_properties', {}),
+                                   tags=spec.get('tags'))
+
+    def create_evidence(item):
+        index, spec, node_id, issue_id = item
+        return client.create_evidence(pid=pid, node_id=node_id, issue_id=issue_id,
+                                      evidence_properties=spec.get('evidence_properties', {}), tags=spec.get('tags'))
+
+    def record(tier: str, refs: dict, index: int, spec: dict, value, error):
+        if error is not None:
+            report[tier][index] = _result(index, spec, error=str(error))
+        elif value == -1:
+            report[tier][index] = _result(index, spec, error='Dradis rejected the request.')
+        else:
+            report[tier][index] = _result(index, spec, value)
+            if spec.get('ref') is not None:
+                refs[spec['ref']] = value
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Tier 0 issues are independent of the node tree and run alongside the top-level nodes.
+        issue_items = list(enumerate(issues))
+        issue_futures = [executor.submit(create_issue, item) for item in issue_items]
+
+        batch_refs = {spec['ref'] for spec in nodes if spec.get('ref') is not None}
+        failed_refs = set()
+        pending = list(enumerate(nodes))
+        while pending:
+            ready, waiting = [], []
+            for index, spec in pending:
+                parent_ref = spec.get('parent_ref')
+                if parent_ref is None:
+                    ready.append((index, spec, spec.get('parent_id')))
+                elif parent_ref in node_refs:
+                    ready.append((index, spec, node_refs[parent_ref]))
+                elif parent_ref in batch_refs and parent_ref not in failed_refs:
+                    waiting.append((index, spec))
+                else:
+                    report['nodes'][index] = _result(index, spec, error=f'Parent node {parent_ref} was not created.')
+                    failed_refs.add(spec.get('ref'))
+
+            if not ready:
+                for index, spec in waiting:
+                    report['nodes'][index] = _result(index, spec, error='Circular parent_ref.')
+                break
+
+            for (index, spec, _), (value, error) in zip(ready, run_parallel(executor, create_node, ready)):
+                record('nodes', node_refs, index, spec, value, error)
+                if spec.get('ref') not in node_refs:
+                    failed_refs.add(spec.get('ref'))
+            pending = waiting
+
+        for (index, spec), future in zip(issue_items, issue_futures):
+            try:
+                record('issues', issue_refs, index, spec, future.result(), None)
+            except Exception as err:
+                record('issues', issue_refs, index, spec, None, err)
+
+        evidence_items = []
+        for index, spec in enumerate(evidence):
+            node_id = _resolve(spec, 'node_ref', 'node_id', node_refs)
+            issue_id = _resolve(spec, 'issue_ref', 'issue_id', issue_refs)
+            if node_id in (None, -1) or issue_id in (None, -1):
+                report['evidence'][index] = _result(index, spec, error='Referenced node or issue was not created.')
+            else:
+                evidence_items.append((index, spec, node_id, issue_id))
+
+        for (index, spec, _, _), (value, error) in zip(evidence_items,
+                                                       run_parallel(executor, create_evidence, evidence_items)):
+            record('evidence', {}, index, spec, value, error)
+
+    return report
@@ -0,0 +1,203 @@
+#####################################################################################
+#                 Dradis-Client: Read-through cache for GET responses               #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import threading
+import time
+from collections import OrderedDict
+
+# Cached resources that embed data of the changed resource and have to be dropped with it.
+# get_node returns the evidence and notes of the node, issues list their evidence and projects show their team.
+RELATED_RESOURCES = {
+    'teams': {'teams', 'projects'},
+    'projects': {'projects'},
+    'nodes': {'nodes', 'evidence', 'notes', 'attachments'},
+    'issues': {'issues', 'evidence', 'nodes'},
+    'evidence': {'evidence', 'nodes', 'issues'},
+    'notes': {'notes', 'nodes'},
+    'attachments': {'attachments'},
+    'content_blocks': {'content_blocks'},
+    'document_properties': {'document_properties'},
+    'issuelib': {'issuelib'},
+}
+
+
+def resource_of(path: str) -> str:
+    """
+    Maps an API path to its resource type, e.g. '/pro/api/nodes/5/evidence/3?page=2' -> 'evidence'.
+    """
+    path = path.split('?', 1)[0]
+    segments = [segment for segment in path.split('/') if segment]
+    if 'api' in segments:
+        segments = segments[segments.index('api') + 1:]
+    if not segments:
+        return ''
+    if segments[0] == 'addons':
+        return 'issuelib'
+    if segments[0] == 'nodes' and len(segments) > 2:
+        return segments[2]
+    return segments[0]
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of raw response bodies with a time to live per resource type.
+
+    @maxsize: Maximum number of cached responses. The least recently used entry is evicted first.
+    @ttl: Default time to live in seconds.
+    @resource_ttl: Optional TTL per resource type ('projects', 'nodes', 'issues', ...). A TTL of 0 disables caching
+    for that resource.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, resource_ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.resource_ttl = resource_ttl or {}
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()  # key -> (expires_at, resource, pid, body)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, key):
+        """
+        Returns the cached body for key or None if it is missing or expired.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.__entries[key]
+                self.misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def set(self, key, resource: str, pid, body: bytes):
+        ttl = self.resource_ttl.get(resource, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + ttl, resource, pid, body)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, resource: str, pid=None):
+        """
+        Drops all entries of resource and its related resources. If pid is given, only entries of that project
+        (and entries that are not bound to a project) are dropped.
+        """
+        resources = RELATED_RESOURCES.get(resource, {resource})
+        with self.__lock:
+            stale = [key for key, entry in self.__entries.items()
+                     if entry[1] in resources and (pid is None or entry[2] in (pid, None))]
+            for key in stale:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the hit and miss counters, the hit ratio and the current number of entries.
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'hit_ratio': self.hits / total if total else 0.0,
+                'size': len(self.__entries)}
+
+
+class ValidatorStore:
+    """
+    Remembers the ETag / Last-Modified validators and the body of GET responses, so the client can revalidate them
+    with a conditional request. A 304 Not Modified answer costs a header exchange instead of the full body.
+
+    Unlike ResponseCache nothing is served without asking the server, so writes by other clients are always seen.
+
+    @maxsize: Maximum number of stored responses. The least recently used entry is evicted first.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.revalidated = 0  # Conditional requests answered with 304
+        self.modified = 0  # Conditional requests answered with a new body
+        self.bytes_saved = 0  # Body bytes not transferred thanks to a 304
+        self.__entries = OrderedDict()  # key -> (etag, last_modified, body)
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def conditional_headers(self, key) -> dict:
+        """
+        Returns the If-None-Match / If-Modified-Since headers for key, empty if nothing is stored.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry[0]:
+            headers['If-None-Match'] = entry[0]
+        if entry[1]:
+            headers['If-Modified-Since'] = entry[1]
+        return headers
+
+    def not_modified(self, key):
+        """
+        Returns the stored body for a 304 answer to key (None if it has been evicted meanwhile).
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            self.__entries.move_to_end(key)
+            self.revalidated += 1
+            self.bytes_saved += len(entry[2])
+            return entry[2]
+
+    def store(self, key, headers, body: bytes, conditional=False):
+        """
+        Stores the validators and body of a 200 response. Responses without validators are not stored.
+
+        @conditional: The request that got this response carried validators, i.e. the stored body was out of date.
+        False for the unconditional refetch after a 304 whose body had been evicted.
+        """
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        with self.__lock:
+            if conditional:
+                self.modified += 1
+            if not etag and not last_modified or self.maxsize <= 0:
+                self.__entries.pop(key, None)
+                return
+            self.__entries[key] = (etag, last_modified, body)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the revalidation counters, the share of conditional requests answered with 304, the body bytes
+        saved and the current number of entries.
+        """
+        total = self.revalidated + self.modified
+        return {'revalidated': self.revalidated, 'modified': self.modified,
+                'hit_ratio': self.revalidated / total if total else 0.0, 'bytes_saved': self.bytes_saved,
+                'size': len(self.__entries)}
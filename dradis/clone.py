@@ -0,0 +1,296 @@
+#####################################################################################
+#            Dradis-Client: Cloning a project (e.g. from a template project)        #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from dradis import markup
+from dradis.bulk import run_parallel
+from dradis.errors import DradisAPIError
+from dradis.sync import NODE_CHILDREN
+
+_MAPPINGS = ('nodes', 'issues', 'evidence', 'notes', 'content_blocks', 'attachments')
+
+
+class CloneCheckpoint:
+    """
+    Maps source ids to the ids created in the clone so far. Saved as JSON after every write, so an interrupted clone
+    resumes without creating anything twice. set() and save() may be called from several threads.
+
+    @path: JSON file of the checkpoint. Without it nothing is saved.
+    """
+
+    def __init__(self, path=None, src_pid=None):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.state = {'src_pid': src_pid, 'pid': None, 'document_properties': False}
+        self.state.update({mapping: {} for mapping in _MAPPINGS})
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as checkpoint_file:
+                state = json.load(checkpoint_file)
+            if state.get('src_pid') == src_pid:
+                self.state = state
+
+    @property
+    def pid(self):
+        return self.state['pid']
+
+    def get(self, mapping: str, src_id):
+        return self.state[mapping].get(str(src_id))
+
+    def set(self, mapping: str, src_id, new_id):
+        with self.__lock:
+            self.state[mapping][str(src_id)] = new_id
+
+    def save(self):
+        if self.path is None:
+            return
+
+        with self.__lock:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w') as checkpoint_file:
+                json.dump(self.state, checkpoint_file)
+            os.replace(temp_path, self.path)
+
+
+def _depths(nodes: list) -> dict:
+    """
+    Returns node id -> depth in the node tree. Nodes whose parent is not in the list count as top-level nodes.
+    """
+    parents = {node['id']: node.get('parent_id') for node in nodes}
+    depths = {}
+    for node_id in parents:
+        chain = []
+        current = node_id
+        while current in parents and current not in depths and current not in chain:
+            chain.append(current)
+            current = parents[current]
+        depth = depths.get(current, -1)
+        for item in reversed(chain):
+            depth += 1
+            depths[item] = depth
+    return depths
+
+
+def _batches(items: list, size: int):
+    for offset in range(0, len(items), size):
+        yield items[offset:offset + size]
+
+
+def clone_project(client, src_pid: int, new_name: str, team_id=None, report_template_properties_id=None,
+                  author_ids=None, attachments=False, cookie=None, checkpoint_path=None, workers=8) -> dict:
+    """
+    Creates a new project and copies the node tree, issues, evidence, notes, content blocks, document properties
+    and optionally attachments of src_pid into it.
+
+    Nodes are created tier by tier (all nodes of one depth in parallel) keeping their type and position. Issues are
+    created alongside the node tiers, evidence and notes once their node exists. Every write is recorded in the
+    checkpoint as soon as it returns, calling clone_project again with the same checkpoint_path resumes an interrupted
+    clone.
+
+    @attachments: Also copy attachments. Needs a '_dradis_session' cookie, see DradisClient.get_dradis_cookie().
+    @checkpoint_path: JSON file to keep the progress in.
+    @workers: number of requests sent in parallel.
+
+    Returns {'pid': new project id (-1 on failure), 'copied': {resource: count}, 'errors': [{'resource', 'id',
+    'error'}], 'seconds': float}. Counts include items copied by an earlier, interrupted run. If the nodes or issues
+    of the source project can not be listed, errors holds a 'project' entry and nothing is copied; calling again with
+    the same checkpoint_path resumes.
+    """
+    start = time.perf_counter()
+    checkpoint = CloneCheckpoint(checkpoint_path, src_pid)
+    errors = []
+    report = {'pid': checkpoint.pid, 'copied': {}, 'errors': errors}
+
+    if checkpoint.pid is None:
+        pid = client.create_project(new_name, team_id=team_id,
+                                    report_template_properties_id=report_template_properties_id,
+                                    author_ids=author_ids)
+        if pid == -1:
+            report.update({'pid': -1, 'seconds': time.perf_counter() - start})
+            return report
+        checkpoint.state['pid'] = report['pid'] = pid
+        checkpoint.save()
+    pid = checkpoint.pid
+
+    def submit(executor: ThreadPoolExecutor, resource: str, fn, items: list, key) -> list:
+        """
+        Calls fn(item) for every item on the executor. The worker records each result in the checkpoint as soon as
+        the call returns, before its future is done.
+        """
+        def run(item):
+            try:
+                value = fn(item)
+            except Exception as err:
+                errors.append({'resource': resource, 'id': key(item), 'error': str(err)})
+                return
+            if value in (None, -1):
+                errors.append({'resource': resource, 'id': key(item), 'error': 'Dradis rejected the request.'})
+                return
+            checkpoint.set(resource, key(item), value)
+            checkpoint.save()
+
+        return [executor.submit(run, item) for item in items]
+
+    def create_node(node):
+        parent_id = node.get('parent_id')
+        return client.create_node(pid=pid, label=node['label'], type_id=node.get('type_id') or 0,
+                                  parent_id=checkpoint.get('nodes', parent_id) if parent_id is not None else None,
+                                  position=1 if node.get('position') is None else node['position'])
+
+    def create_issue(issue):
+        fields = markup.loads(issue.get('text'))
+        title = fields.pop('Title', issue.get('title', ''))
+        fields.pop('Tags', None)  # Written from the issue's tags instead
+        tags = [tag['name'] if isinstance(tag, dict) else tag for tag in issue.get('tags') or []]
+        return client.create_issue(pid=pid, title=title, issue_properties=fields, tags=tags)
+
+    def create_child(item):
+        resource, node_id, child = item
+        new_node_id = checkpoint.get('nodes', node_id)
+        if resource == 'notes':
+            return client.create_note(pid=pid, node_id=new_node_id, note_properties=markup.loads(child.get('text')),
+                                      category=child.get('category_id') or 0)
+
+        issue = child.get('issue')
+        issue_id = checkpoint.get('issues', issue.get('id') if isinstance(issue, dict) else child.get('issue_id'))
+        if issue_id is None:
+            raise ValueError('The issue of this evidence was not copied.')
+        return client.create_evidence(pid=pid, node_id=new_node_id, issue_id=issue_id,
+                                      evidence_properties=markup.loads(child.get('content')))
+
+    def create_block(block):
+        return client.create_content_block(pid=pid, block_properties=markup.loads(block.get('content')),
+                                           block_group=block.get('block_group'))
+
+    def list_children(node):
+        if all(node.get(child) is not None for child in NODE_CHILDREN):
+            return {child: node[child] for child in NODE_CHILDREN}
+        return {'evidence': list(client.iter_evidence(src_pid, node['id'])),
+                'notes': list(client.iter_notes(src_pid, node['id']))}
+
+    def finish():
+        report['copied'] = {mapping: len(checkpoint.state[mapping]) for mapping in _MAPPINGS}
+        report['seconds'] = time.perf_counter() - start
+        return report
+
+    batch_size = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            nodes = list(client.iter_nodes(src_pid))
+            issues = [issue for issue in client.iter_issues(src_pid)
+                      if checkpoint.get('issues', issue['id']) is None]
+        except DradisAPIError as err:
+            # Copying from a cut-off listing would look like a complete clone. Calling again resumes.
+            errors.append({'resource': 'project', 'id': src_pid, 'error': f'Could not list the source project: {err}'})
+            return finish()
+        issue_futures = submit(executor, 'issues', create_issue, issues, lambda issue: issue['id'])
+
+        depths = _depths(nodes)
+        tiers = {}
+        for node in sorted(nodes, key=lambda node: (node.get('position') or 0, node['id'])):
+            tiers.setdefault(depths[node['id']], []).append(node)
+
+        for depth in sorted(tiers):
+            ready = []
+            for node in tiers[depth]:
+                parent_id = node.get('parent_id')
+                if checkpoint.get('nodes', node['id']) is not None:
+                    continue
+                if depth and checkpoint.get('nodes', parent_id) is None:
+                    errors.append({'resource': 'nodes', 'id': node['id'], 'error': 'The parent node was not copied.'})
+                    continue
+                ready.append(node)
+            wait(submit(executor, 'nodes', create_node, ready, lambda node: node['id']))
+
+        wait(issue_futures)  # Evidence needs the ids of the copied issues
+
+        copied = [node for node in nodes if checkpoint.get('nodes', node['id']) is not None]
+        for batch in _batches(copied, batch_size):
+            children = []
+            for node, (listing, error) in zip(batch, run_parallel(executor, list_children, batch)):
+                if error is not None:
+                    errors.append({'resource': 'nodes', 'id': node['id'], 'error': str(error)})
+                    continue
+                for resource in NODE_CHILDREN:
+                    children.extend((resource, node['id'], child) for child in listing[resource]
+                                    if checkpoint.get(resource, child['id']) is None)
+            for resource in NODE_CHILDREN:
+                items = [item for item in children if item[0] == resource]
+                wait(submit(executor, resource, create_child, items, lambda item: item[2]['id']))
+
+        try:
+            blocks = [block for block in client.iter_content_blocks(src_pid)
+                      if checkpoint.get('content_blocks', block['id']) is None]
+        except DradisAPIError as err:
+            errors.append({'resource': 'content_blocks', 'id': None, 'error': str(err)})
+            blocks = []
+        wait(submit(executor, 'content_blocks', create_block, blocks, lambda block: block['id']))
+
+    if not checkpoint.state['document_properties']:
+        client.pop_last_failure()
+        properties = client.get_document_properties(src_pid)
+        failure = client.pop_last_failure()
+        if isinstance(properties, list):
+            properties = {key: value for item in properties for key, value in item.items()}
+        if failure is not None:
+            errors.append({'resource': 'document_properties', 'id': None, 'error': str(failure)})
+        elif not properties or client.create_document_properties(pid, properties):
+            checkpoint.state['document_properties'] = True
+            checkpoint.save()
+        else:
+            errors.append({'resource': 'document_properties', 'id': None, 'error': 'Dradis rejected the request.'})
+
+    if attachments:
+        _clone_attachments(client, src_pid, pid, checkpoint, cookie, errors, workers)
+
+    return finish()
+
+
+def _clone_attachments(client, src_pid: int, pid: int, checkpoint: CloneCheckpoint, cookie: str, errors: list,
+                       workers: int):
+    """
+    Downloads the attachments of every copied node into a temporary directory and uploads them to the clone.
+    Nodes whose attachments were uploaded are recorded in the checkpoint.
+    """
+    node_ids = [int(node_id) for node_id in checkpoint.state['nodes']
+                if checkpoint.get('attachments', node_id) is None]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        downloads = client.download_attachments(src_pid, node_ids, temp_dir, cookie, workers=workers,
+                                                skip_existing=False)
+        uploads = {}
+        failed = set()
+        for entry in downloads['files']:
+            if entry['status'] == 'failed':
+                failed.add(entry['node_id'])
+                errors.append({'resource': 'attachments', 'id': entry['node_id'],
+                               'error': entry['error'] if entry['filename'] is None else
+                               f'Download of {entry["filename"]} failed: {entry["error"]}'})
+            else:
+                uploads.setdefault(entry['node_id'], []).append(entry['path'])
+
+        result = client.create_attachments(pid, {checkpoint.get('nodes', node_id): paths
+                                                 for node_id, paths in uploads.items()}, workers=workers)
+        new_to_src = {checkpoint.get('nodes', node_id): node_id for node_id in uploads}
+        for entry in result['requests']:
+            if entry['error'] is not None:
+                failed.add(new_to_src[entry['node_id']])
+                errors.append({'resource': 'attachments', 'id': new_to_src[entry['node_id']], 'error': entry['error']})
+
+    for node_id in node_ids:
+        if node_id not in failed:
+            checkpoint.set('attachments', node_id, len(uploads.get(node_id, [])))
+    checkpoint.save()
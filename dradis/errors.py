@@ -0,0 +1,24 @@
+#####################################################################################
+#                   Dradis-Client: Errors raised by the client                      #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+
+
+class DradisAPIError(Exception):
+    """
+    A request answered with an unexpected status code. Raised by the iter_* generators when a page can not be
+    fetched, so a cut-off listing is never mistaken for the end of the list. The endpoint methods returning
+    sentinels (-1, {}, [], ...) record it instead, see DradisClient.pop_last_failure().
+    """
+
+    def __init__(self, method: str, path: str, status: int):
+        super().__init__(f'{method} {path} returned HTTP {status}')
+        self.method = method
+        self.path = path
+        self.status = status
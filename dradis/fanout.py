@@ -0,0 +1,78 @@
+#####################################################################################
+#              Dradis-Client: Running one operation across many projects            #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def _result(pid: int, result=None, error=None, seconds=0.0) -> dict:
+    return {'pid': pid, 'result': result, 'error': error, 'seconds': seconds}
+
+
+def fan_out(client, fn, pids, max_workers=8, timeout=None, **kwargs):
+    """
+    Calls fn(pid, **kwargs) for every project id on a thread pool and yields the results as they complete.
+
+    @fn: callable taking a project id, or the name of a DradisClient method with a pid parameter,
+    e.g. 'get_issue_list'.
+    @max_workers: number of projects queried at the same time, see pool_maxsize of DradisClient._create_session.
+    @timeout: seconds a single project may take, counted from the moment its call starts. A project over its time
+    is reported as failed right away; its thread finishes in the background and the late result is dropped.
+
+    Yields {'pid', 'result', 'error', 'seconds'} per project. error is None on success, otherwise the exception
+    message, the failed request (if fn returned an empty result after one, see DradisClient.pop_last_error) or a
+    timeout message. Stopping the iteration early cancels the projects that have not started yet.
+    """
+    if isinstance(fn, str):
+        fn = getattr(client, fn)
+    pids = list(dict.fromkeys(pids))
+
+    started = {}
+
+    def call(pid):
+        started[pid] = time.monotonic()
+        client.pop_last_error()
+        result = fn(pid, **kwargs)
+        error = client.pop_last_error()
+        if error is not None and result in (None, -1, {}, [], False):
+            raise RuntimeError(error)
+        return result
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {executor.submit(call, pid): pid for pid in pids}
+    pending = set(futures)
+    try:
+        while pending:
+            wait_for = None
+            if timeout is not None:
+                deadlines = [started[futures[future]] + timeout for future in pending if futures[future] in started]
+                wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else timeout
+
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                pid = futures[future]
+                seconds = time.monotonic() - started.get(pid, time.monotonic())
+                error = future.exception()
+                if error is None:
+                    yield _result(pid, future.result(), seconds=seconds)
+                else:
+                    yield _result(pid, error=str(error) or type(error).__name__, seconds=seconds)
+
+            if timeout is not None:
+                now = time.monotonic()
+                for future in list(pending):
+                    pid = futures[future]
+                    if pid in started and now - started[pid] >= timeout:
+                        pending.discard(future)
+                        yield _result(pid, error=f'Timed out after {timeout} seconds.', seconds=now - started[pid])
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,73 @@
+#####################################################################################
+#               Dradis-Client: Name indexes for teams, projects and nodes           #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import time
+from bisect import bisect_left
+
+
+class NameIndex:
+    """
+    In-memory index of the records of one list endpoint by name (or label).
+    Supports exact lookups and case-insensitive prefix lookups.
+
+    @key: Record field that is indexed, e.g. 'name' for teams and projects or 'label' for nodes.
+    @ttl: Seconds after which the index is considered stale and rebuilt on the next lookup.
+    """
+
+    def __init__(self, key='name', ttl=300):
+        self.key = key
+        self.ttl = ttl
+        self.__exact = {}  # name -> first record with that name
+        self.__keys = []  # sorted casefolded names
+        self.__records = []  # records in the order of self.__keys
+        self.__built_at = None
+
+    def __len__(self):
+        return len(self.__records)
+
+    def is_stale(self) -> bool:
+        return self.__built_at is None or time.monotonic() - self.__built_at > self.ttl
+
+    def invalidate(self):
+        self.__built_at = None
+
+    def rebuild(self, records):
+        exact = {}
+        entries = []
+        for record in records:
+            name = record.get(self.key)
+            if name is None:
+                continue
+            exact.setdefault(name, record)
+            entries.append((str(name).casefold(), len(entries), record))
+
+        entries.sort(key=lambda entry: entry[:2])
+        self.__exact = exact
+        self.__keys = [entry[0] for entry in entries]
+        self.__records = [entry[2] for entry in entries]
+        self.__built_at = time.monotonic()
+
+    def get(self, name: str):
+        """
+        Returns the first record with exactly this name or None.
+        """
+        return self.__exact.get(name)
+
+    def prefix(self, prefix: str) -> list:
+        """
+        Returns all records whose name starts with prefix, ignoring case, ordered by name.
+        """
+        prefix = prefix.casefold()
+        result = []
+        for position in range(bisect_left(self.__keys, prefix), len(self.__keys)):
+            if not self.__keys[position].startswith(prefix):
+                break
+            result.append(self.__records[position])
+        return result
@@ -0,0 +1,99 @@
+#####################################################################################
+#             Dradis-Client: Incremental decoding of JSON list responses            #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def project(item, fields):
+    """
+    Reduces a decoded item to the given fields. Items that are not objects are returned unchanged.
+    """
+    if fields is None or not isinstance(item, dict):
+        return item
+    return {field: item[field] for field in fields if field in item}
+
+
+def iter_array(chunks, fields=None):
+    """
+    Decodes a JSON array from an iterable of bytes chunks (e.g. Response.iter_content()) and yields its elements one
+    by one. Only the undecoded tail of the body and the current element are held in memory.
+
+    @fields: keep only these keys of every object element.
+    Raises ValueError if the body is not a JSON array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    position = 0
+    started = False
+    retry_at = 0  # Buffer length at which an incomplete element is decoded again
+
+    def skip(position):
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        return position
+
+    chunks = iter(chunks)
+    finished = False
+    while not finished:
+        chunk = next(chunks, None)
+        if chunk is None:
+            finished = True
+            buffer += text_decoder.decode(b'', final=True)
+        else:
+            buffer += text_decoder.decode(chunk)
+        if not finished and len(buffer) < retry_at:
+            continue
+
+        while True:
+            position = skip(position)
+            if position >= len(buffer):
+                break
+
+            if not started:
+                if buffer[position] != '[':
+                    raise ValueError('The response is not a JSON array.')
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == ']':
+                return
+            if buffer[position] == ',':
+                position += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise ValueError('The JSON array in the response is truncated.')
+                # Wait until the buffer has doubled, so a large element is not re-parsed for every chunk.
+                retry_at = 2 * len(buffer) - position
+                break
+
+            if not isinstance(item, (dict, list, str)) and not finished and \
+                    (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                break  # A number may continue in the next chunk ('7.' + '5', '1e' + '10'), wait for its delimiter.
+            position = end
+            retry_at = 0
+            yield project(item, fields)
+
+        buffer = buffer[position:]
+        retry_at = max(0, retry_at - position)
+        position = 0
+
+    if started:
+        raise ValueError('The JSON array in the response is truncated.')
+    raise ValueError('The response is empty.')
@@ -0,0 +1,107 @@
+#####################################################################################
+#               Dradis-Client: Serializer and parser for #[Field]# markup           #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import re
+from collections.abc import Mapping
+
+# A field header: #[Name]# followed by the end of the line. Anchoring it to the start of a line with ^ makes the
+# scan about three times slower, so that is checked on the (few) matches instead.
+_FIELD_HEADER = re.compile(r'#\[([^\]\r\n]+)\]#[ \t]*\r?(?:\n|$)')
+
+
+def dumps(fields, tags=None) -> str:
+    """
+    Serializes fields to Dradis field markup: #[key]#\\r\\nvalue\\r\\n\\r\\n for every field, followed by an optional
+    #[Tags]# field.
+
+    The markup has no escaping: a value with a line that is itself a field header (e.g. '#[Output]#') would be read
+    back as a further field, so such values raise ValueError.
+
+    @fields: dict or iterable of (key, value) pairs, serialized in order.
+    @tags: optional list of tags, joined with commas.
+    """
+    if isinstance(fields, Mapping):
+        fields = fields.items()
+
+    parts = []
+    for key, value in fields:
+        value = str(value)
+        if _spans(value):
+            raise ValueError(f'The value of field {key!r} contains a line that would be parsed as a field header.')
+        parts.append(f'#[{key}]#\r\n{value}\r\n\r\n')
+
+    if isinstance(tags, list) and tags:
+        parts.append(f'#[Tags]#\r\n{",".join(tags)}')
+
+    return ''.join(parts)
+
+
+def _spans(text: str) -> dict:
+    """
+    Returns field name -> (value start, value end) in a single scan over text. Later duplicates win.
+    """
+    spans = {}
+    name = start = None
+    for match in _FIELD_HEADER.finditer(text):
+        if match.start() and text[match.start() - 1] != '\n':
+            continue
+        if name is not None:
+            spans[name] = (start, match.start())
+        name, start = match.group(1), match.end()
+    if name is not None:
+        spans[name] = (start, len(text))
+    return spans
+
+
+def loads(text: str, lazy=False):
+    """
+    Parses Dradis field markup into a mapping field name -> value. Values are stripped of surrounding whitespace.
+    Text before the first field header is ignored.
+
+    @lazy: Return a LazyFields mapping that locates the fields on first access and slices each value only when it
+    is read.
+    """
+    if lazy:
+        return LazyFields(text)
+
+    return {name: text[start:end].strip() for name, (start, end) in _spans(text or '').items()}
+
+
+class LazyFields(Mapping):
+    """
+    Read-only mapping over Dradis field markup that defers all parsing until a field is accessed.
+    """
+    __slots__ = ('text', '_spans', '_values')
+
+    def __init__(self, text: str):
+        self.text = text or ''
+        self._spans = None
+        self._values = {}
+
+    def __index(self) -> dict:
+        if self._spans is None:
+            self._spans = _spans(self.text)
+        return self._spans
+
+    def __getitem__(self, name: str) -> str:
+        value = self._values.get(name)
+        if value is None:
+            start, end = self.__index()[name]
+            value = self._values[name] = self.text[start:end].strip()
+        return value
+
+    def __iter__(self):
+        return iter(self.__index())
+
+    def __len__(self):
+        return len(self.__index())
+
+    def __repr__(self):
+        return f'LazyFields({dict(self)!r})'
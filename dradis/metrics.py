@@ -0,0 +1,221 @@
+#####################################################################################
+#             Dradis-Client: Request timing and metrics instrumentation             #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import logging
+import re
+import socket
+import threading
+import time
+from collections import deque
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+_NUMERIC_SEGMENT = re.compile(r'/\d+(?=/|$)')
+_NAMED_SEGMENT = re.compile(r'/(attachments|document_properties)/[^/]+$')
+
+# Connection setup timings of the last connection opened by the current thread.
+_connection_timings = threading.local()
+
+
+def endpoint_template(path: str) -> str:
+    """
+    Reduces an API path to its endpoint template,
+    e.g. '/pro/api/nodes/5/evidence/7' -> '/pro/api/nodes/{id}/evidence/{id}'.
+    """
+    path = path.split('?', 1)[0]
+    path = _NAMED_SEGMENT.sub(lambda match: f'/{match.group(1)}/{{name}}', path)
+    return _NUMERIC_SEGMENT.sub('/{id}', path)
+
+
+def reset_connection_timings():
+    _connection_timings.value = None
+
+
+def pop_connection_timings():
+    """
+    Returns (dns, connect, tls) of the connection opened by the current thread since the last reset,
+    or None if the request reused a pooled connection.
+    """
+    timings = getattr(_connection_timings, 'value', None)
+    _connection_timings.value = None
+    return timings
+
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        # Resolve once up front to time DNS separately, create_connection then hits the resolver cache.
+        start = time.perf_counter()
+        try:
+            socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            pass
+        resolved = time.perf_counter()
+        conn = super()._new_conn()
+        self._timings = [resolved - start, time.perf_counter() - resolved, 0.0]
+        return conn
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timings = getattr(self, '_timings', [0.0, 0.0, 0.0])
+        if isinstance(self, HTTPSConnection):
+            timings[2] = max(0.0, time.perf_counter() - start - timings[0] - timings[1])
+        _connection_timings.value = tuple(timings)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections record DNS, TCP connect and TLS handshake times.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _TimedHTTPConnectionPool,
+                                                   'https': _TimedHTTPSConnectionPool}
+
+
+class RequestMetrics:
+    """
+    Timings and sizes of a single request. All durations are in seconds. dns, connect and tls are None if the
+    request reused a pooled connection; connect is the TCP connect only, tls the handshake only.
+    """
+    __slots__ = ('method', 'url', 'endpoint', 'status_code', 'dns', 'connect', 'tls', 'ttfb', 'total',
+                 'request_bytes', 'response_bytes')
+
+    def __init__(self, method: str, url: str, endpoint: str, status_code: int, ttfb: float, total: float,
+                 request_bytes: int, response_bytes: int, connection_timings=None):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.dns, self.connect, self.tls = connection_timings or (None, None, None)
+        self.ttfb = ttfb
+        self.total = total
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LatencyHistogram:
+    """
+    Keeps the latest sample_size latencies per (method, endpoint) to compute p50 / p95 / p99, plus exact
+    request counts, error counts (status >= 400) and latency sums.
+    """
+
+    def __init__(self, sample_size=2048):
+        self.sample_size = sample_size
+        self.__series = {}  # (method, endpoint) -> [samples, count, errors, total seconds, bytes in, bytes out]
+        self.__lock = threading.Lock()
+
+    def __call__(self, metrics: RequestMetrics):
+        key = (metrics.method, metrics.endpoint)
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = [deque(maxlen=self.sample_size), 0, 0, 0.0, 0, 0]
+            series[0].append(metrics.total)
+            series[1] += 1
+            series[2] += metrics.status_code >= 400
+            series[3] += metrics.total
+            series[4] += metrics.response_bytes
+            series[5] += metrics.request_bytes
+
+    @staticmethod
+    def _quantile(samples: list, q: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(round(q * (len(samples) - 1))))]
+
+    def to_dict(self) -> dict:
+        """
+        Returns {'GET /pro/api/nodes/{id}': {'count', 'errors', 'sum', 'p50', 'p95', 'p99', ...}, ...}.
+        """
+        with self.__lock:
+            snapshot = {key: (sorted(series[0]), *series[1:]) for key, series in self.__series.items()}
+
+        result = {}
+        for (method, endpoint), (samples, count, errors, total, bytes_in, bytes_out) in snapshot.items():
+            result[f'{method} {endpoint}'] = {
+                'method': method, 'endpoint': endpoint, 'count': count, 'errors': errors, 'sum': total,
+                'response_bytes': bytes_in, 'request_bytes': bytes_out,
+                'p50': self._quantile(samples, 0.50), 'p95': self._quantile(samples, 0.95),
+                'p99': self._quantile(samples, 0.99)}
+        return result
+
+    def to_prometheus(self, prefix='dradis_client') -> str:
+        """
+        Renders the histogram in the Prometheus text exposition format (as a summary with quantiles).
+        """
+        lines = [f'# HELP {prefix}_request_seconds Latency of Dradis API requests.',
+                 f'# TYPE {prefix}_request_seconds summary']
+        stats = self.to_dict().values()
+        for entry in stats:
+            labels = f'method="{entry["method"]}",endpoint="{entry["endpoint"]}"'
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                lines.append(f'{prefix}_request_seconds{{{labels},quantile="{quantile}"}} {entry[key]}')
+            lines.append(f'{prefix}_request_seconds_sum{{{labels}}} {entry["sum"]}')
+            lines.append(f'{prefix}_request_seconds_count{{{labels}}} {entry["count"]}')
+
+        lines.append(f'# HELP {prefix}_request_errors_total Dradis API requests answered with HTTP 4xx or 5xx.')
+        lines.append(f'# TYPE {prefix}_request_errors_total counter')
+        for entry in stats:
+            lines.append(f'{prefix}_request_errors_total{{method="{entry["method"]}",endpoint="{entry["endpoint"]}"}} '
+                         f'{entry["errors"]}')
+        return '\n'.join(lines) + '\n'
+
+
+class Instrumentation:
+    """
+    Collects a RequestMetrics record for every request of a DradisClient and passes it to the registered hooks.
+    A LatencyHistogram is registered by default and available as .histogram.
+    """
+
+    def __init__(self, histogram=True):
+        self.hooks = []
+        self.histogram = LatencyHistogram() if histogram else None
+        if self.histogram is not None:
+            self.hooks.append(self.histogram)
+        self.__logger = logging.getLogger('PyDradis3ng')
+
+    def add_hook(self, hook):
+        """
+        Registers a callable that receives the RequestMetrics of every request.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def emit(self, metrics: RequestMetrics):
+        for hook in self.hooks:
+            try:
+                hook(metrics)
+            except Exception as err:
+                self.__logger.warning(f'Instrumentation hook {hook!r} failed: {err}')
@@ -0,0 +1,86 @@
+#####################################################################################
+#              Dradis-Client: Lightweight records over raw API responses            #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+from collections.abc import Mapping
+
+from dradis import markup
+
+
+class Record(Mapping):
+    """
+    Read-only view over one item of a list response. Keeps the decoded JSON dict as is (no copy, no
+    per-field objects) and exposes every server field as attribute and as key: record.id, record['id'].
+    """
+    __slots__ = ('raw',)
+    _label = 'name'  # Field shown by repr()
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+    def __getattr__(self, name: str):
+        # copy and pickle look up __setstate__ & co. before the raw slot is set, so private names are never fields.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return object.__getattribute__(self, 'raw')[name]
+        except KeyError:
+            raise AttributeError(f'{type(self).__name__} has no field {name!r}') from None
+
+    def __getitem__(self, name: str):
+        return self.raw[name]
+
+    def __iter__(self):
+        return iter(self.raw)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(id={self.raw.get("id")!r}, {self._label}={self.raw.get(self._label)!r})'
+
+    def to_dict(self) -> dict:
+        return dict(self.raw)
+
+
+class Team(Record):
+    __slots__ = ()
+
+
+class User(Record):
+    __slots__ = ()
+
+
+class Project(Record):
+    __slots__ = ()
+
+
+class Node(Record):
+    __slots__ = ()
+    _label = 'label'
+
+
+class Issue(Record):
+    """
+    An issue. .fields returns the server's parsed fields or, if the response has none, parses the text on first
+    access.
+    """
+    __slots__ = ('_fields',)
+    _label = 'title'
+
+    def __init__(self, raw: dict):
+        super().__init__(raw)
+        self._fields = None
+
+    @property
+    def fields(self) -> Mapping:
+        if self._fields is None:
+            fields = self.raw.get('fields')
+            self._fields = fields if isinstance(fields, dict) else markup.loads(self.raw.get('text'), lazy=True)
+        return self._fields
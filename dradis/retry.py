@@ -0,0 +1,93 @@
+#####################################################################################
+#             Dradis-Client: Retry policy and client-side rate limiting             #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed request is sent again.
+
+    @max_retries: Number of retries after the first attempt.
+    @backoff_factor: Base delay in seconds, the delay grows as backoff_factor * 2 ** attempt.
+    @max_backoff: Upper bound of a single delay in seconds. A request whose Retry-After asks for a longer wait is
+    not retried, its response is returned as is.
+    @jitter: Pick a random delay between 0 and the exponential delay ("full jitter").
+    @status_forcelist: Response codes that are retried.
+    @retry_post: Also retry POST requests. Only enable this if duplicate creates are acceptable.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30, jitter=True,
+                 status_forcelist=(429, 500, 502, 503, 504), retry_post=False):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.retry_post = retry_post
+
+    def is_retryable(self, method: str) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS or (self.retry_post and method.upper() == 'POST')
+
+    def backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def retry_after(self, response):
+        """
+        Returns the delay requested by the server through the Retry-After header (seconds or HTTP date) or None.
+        The delay is not capped, compare it with max_backoff.
+        """
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+
+        return max(0.0, delay)
+
+
+class TokenBucket:
+    """
+    Client-side rate limiter. Allows bursts of up to capacity requests and rate requests per second on average.
+    acquire() blocks the calling thread until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.__tokens = self.capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+                self.__updated = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                wait = (1 - self.__tokens) / self.rate
+
+            time.sleep(wait)
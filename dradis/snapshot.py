@@ -0,0 +1,362 @@
+#####################################################################################
+#               Dradis-Client: Local SQLite snapshot of a project                   #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dradis import markup, sync
+from dradis.bulk import run_parallel
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS nodes (id INTEGER PRIMARY KEY, label TEXT, type_id INTEGER, parent_id INTEGER,
+                                  position INTEGER, updated_at TEXT, raw TEXT);
+CREATE TABLE IF NOT EXISTS issues (id INTEGER PRIMARY KEY, title TEXT, text TEXT, tags TEXT, updated_at TEXT,
+                                   raw TEXT);
+CREATE TABLE IF NOT EXISTS evidence (id INTEGER PRIMARY KEY, node_id INTEGER, issue_id INTEGER, content TEXT,
+                                     updated_at TEXT, raw TEXT);
+CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, node_id INTEGER, category_id INTEGER, title TEXT,
+                                  text TEXT, updated_at TEXT, raw TEXT);
+CREATE TABLE IF NOT EXISTS content_blocks (id INTEGER PRIMARY KEY, block_group TEXT, title TEXT, content TEXT,
+                                           raw TEXT);
+CREATE TABLE IF NOT EXISTS document_properties (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS attachments (node_id INTEGER, filename TEXT, link TEXT, raw TEXT,
+                                        PRIMARY KEY (node_id, filename));
+CREATE TABLE IF NOT EXISTS fields (resource TEXT, record_id INTEGER, name TEXT, value TEXT);
+CREATE INDEX IF NOT EXISTS nodes_parent ON nodes (parent_id);
+CREATE INDEX IF NOT EXISTS nodes_label ON nodes (label);
+CREATE INDEX IF NOT EXISTS issues_title ON issues (title);
+CREATE INDEX IF NOT EXISTS evidence_issue ON evidence (issue_id, node_id);
+CREATE INDEX IF NOT EXISTS evidence_node ON evidence (node_id);
+CREATE INDEX IF NOT EXISTS notes_node ON notes (node_id);
+CREATE INDEX IF NOT EXISTS fields_record ON fields (resource, record_id);
+CREATE INDEX IF NOT EXISTS fields_name_value ON fields (name, value COLLATE NOCASE);
+'''
+
+# Column holding the field markup of every resource with fields.
+_MARKUP_COLUMNS = {'issues': 'text', 'evidence': 'content', 'notes': 'text', 'content_blocks': 'content'}
+
+
+def _fields(record: dict, resource: str) -> dict:
+    fields = record.get('fields')
+    if isinstance(fields, dict):
+        return fields
+    return markup.loads(record.get(_MARKUP_COLUMNS[resource]) or '')
+
+
+def _issue_id(evidence: dict):
+    issue = evidence.get('issue')
+    return issue.get('id') if isinstance(issue, dict) else evidence.get('issue_id')
+
+
+class ProjectSnapshot:
+    """
+    A project mirrored into a SQLite file for offline queries. dump() streams a project into the file page by page,
+    refresh() applies only the changes since the last dump or refresh (see dradis.sync.ProjectSync).
+    The fields of issues, evidence, notes and content blocks are also stored one row per field in the fields table.
+
+    @path: SQLite database file, created if needed. ':memory:' keeps the snapshot in memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__conn = sqlite3.connect(path, check_same_thread=False)
+        self.__conn.row_factory = sqlite3.Row
+        self.__conn.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.__conn.close()
+
+    @property
+    def pid(self):
+        value = self._meta('pid')
+        return int(value) if value is not None else None
+
+    def _meta(self, key: str):
+        row = self.__conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value):
+        self.__conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    ####################################
+    #             Writing              #
+    ####################################
+
+    def _write_fields(self, resource: str, record: dict):
+        self.__conn.execute('DELETE FROM fields WHERE resource = ? AND record_id = ?', (resource, record['id']))
+        self.__conn.executemany('INSERT INTO fields (resource, record_id, name, value) VALUES (?, ?, ?, ?)',
+                                [(resource, record['id'], name, value)
+                                 for name, value in _fields(record, resource).items()])
+
+    def _write_node(self, node: dict):
+        record = {key: value for key, value in node.items() if key not in sync.NODE_CHILDREN}
+        self.__conn.execute('INSERT OR REPLACE INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (node['id'], node.get('label'), node.get('type_id'), node.get('parent_id'),
+                             node.get('position'), node.get('updated_at'), json.dumps(record)))
+
+    def _write_issue(self, issue: dict):
+        self.__conn.execute('INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?)',
+                            (issue['id'], issue.get('title'), issue.get('text'), json.dumps(issue.get('tags')),
+                             issue.get('updated_at'), json.dumps(issue)))
+        self._write_fields('issues', issue)
+
+    def _write_evidence(self, node_id: int, evidence: dict):
+        self.__conn.execute('INSERT OR REPLACE INTO evidence VALUES (?, ?, ?, ?, ?, ?)',
+                            (evidence['id'], node_id, _issue_id(evidence), evidence.get('content'),
+                             evidence.get('updated_at'), json.dumps(evidence)))
+        self._write_fields('evidence', evidence)
+
+    def _write_note(self, node_id: int, note: dict):
+        self.__conn.execute('INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (note['id'], node_id, note.get('category_id'), note.get('title'), note.get('text'),
+                             note.get('updated_at'), json.dumps(note)))
+        self._write_fields('notes', note)
+
+    def _write_attachments(self, node_id: int, attachments: list):
+        self.__conn.execute('DELETE FROM attachments WHERE node_id = ?', (node_id,))
+        self.__conn.executemany('INSERT OR REPLACE INTO attachments VALUES (?, ?, ?, ?)',
+                                [(node_id, attachment.get('filename'), attachment.get('link'), json.dumps(attachment))
+                                 for attachment in attachments])
+
+    def _delete(self, resource: str, record_ids: list):
+        self.__conn.executemany(f'DELETE FROM {resource} WHERE id = ?', [(record_id,) for record_id in record_ids])
+        if resource in _MARKUP_COLUMNS:
+            self.__conn.executemany('DELETE FROM fields WHERE resource = ? AND record_id = ?',
+                                    [(resource, record_id) for record_id in record_ids])
+        if resource == 'nodes':
+            self.__conn.executemany('DELETE FROM attachments WHERE node_id = ?',
+                                    [(record_id,) for record_id in record_ids])
+
+    def _write_project_wide(self, client, pid: int):
+        """
+        Replaces content blocks and document properties. Both are a single listing and not tracked by the manifest.
+        Both are fetched completely before any row is replaced; raises DradisAPIError if either request fails.
+        """
+        blocks = list(client.iter_content_blocks(pid))
+        client.pop_last_failure()
+        properties = client.get_document_properties(pid)
+        failure = client.pop_last_failure()
+        if failure is not None:
+            raise failure
+
+        self.__conn.execute('DELETE FROM content_blocks')
+        self.__conn.execute("DELETE FROM fields WHERE resource = 'content_blocks'")
+        for block in blocks:
+            self.__conn.execute('INSERT OR REPLACE INTO content_blocks VALUES (?, ?, ?, ?, ?)',
+                                (block['id'], block.get('block_group'), block.get('title'), block.get('content'),
+                                 json.dumps(block)))
+            self._write_fields('content_blocks', block)
+
+        if isinstance(properties, list):
+            properties = {key: value for item in properties for key, value in item.items()}
+        self.__conn.execute('DELETE FROM document_properties')
+        self.__conn.executemany('INSERT INTO document_properties VALUES (?, ?)', list(properties.items()))
+
+    def _fetch_children(self, client, pid: int, nodes: list, attachments: bool, workers: int):
+        """
+        Fetches evidence, notes and attachments of (node id, needs children) pairs in parallel and yields
+        (node id, {'evidence', 'notes', 'attachments'}, error) in node order, a batch of nodes at a time.
+        children is None and error the exception for nodes whose requests failed.
+        """
+        def fetch(item):
+            node_id, needs_children = item
+            children = {}
+            if needs_children:
+                children['evidence'] = list(client.iter_evidence(pid, node_id))
+                children['notes'] = list(client.iter_notes(pid, node_id))
+            if attachments:
+                client.pop_last_failure()
+                children['attachments'] = client.get_attachment_list(pid, node_id)
+                failure = client.pop_last_failure()
+                if failure is not None:
+                    raise failure
+            return children
+
+        batch_size = workers * 4
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for offset in range(0, len(nodes), batch_size):
+                batch = nodes[offset:offset + batch_size]
+                for (node_id, _), (children, error) in zip(batch, run_parallel(executor, fetch, batch)):
+                    yield node_id, children if error is None else None, error
+
+    def dump(self, client, pid: int, attachments=True, workers=8) -> dict:
+        """
+        Replaces the snapshot with the current state of a project. Records are written while the listings are
+        paged through; only node ids are kept in memory.
+
+        @attachments: Also store attachment metadata (one request per node).
+        @workers: number of nodes whose evidence, notes and attachments are fetched in parallel.
+        Returns the number of stored rows per table.
+
+        The dump runs in one transaction: if any request fails, the exception (DradisAPIError or a connection error)
+        is raised and the previous content of the snapshot is kept.
+        """
+        manifest = sync.empty_manifest(pid)
+        pending = []
+
+        with self.__conn:
+            for table in ('nodes', 'issues', 'evidence', 'notes', 'content_blocks', 'document_properties',
+                          'attachments', 'fields', 'meta'):
+                self.__conn.execute(f'DELETE FROM {table}')
+
+            for node in client.iter_nodes(pid):
+                self._write_node(node)
+                node_id = str(node['id'])
+                manifest['nodes'][node_id] = sync.fingerprint(
+                    {key: value for key, value in node.items() if key not in sync.NODE_CHILDREN})
+
+                embedded = all(node.get(child) is not None for child in sync.NODE_CHILDREN)
+                if embedded:
+                    self._write_children(node['id'], node, manifest)
+                if not embedded or attachments:
+                    pending.append((node['id'], not embedded))
+
+            for issue in client.iter_issues(pid):
+                self._write_issue(issue)
+                manifest['issues'][str(issue['id'])] = sync.fingerprint(issue)
+
+            for node_id, children, error in self._fetch_children(client, pid, pending, attachments, workers):
+                if error is not None:
+                    raise error
+                self._write_children(node_id, children, manifest)
+
+            self._write_project_wide(client, pid)
+
+            manifest['synced_at'] = time.time()
+            self._set_meta('pid', str(pid))
+            self._set_meta('manifest', json.dumps(manifest))
+
+        return self.counts()
+
+    def _write_children(self, node_id: int, children: dict, manifest: dict):
+        for evidence in children.get('evidence') or []:
+            self._write_evidence(node_id, evidence)
+            manifest['evidence'][str(evidence['id'])] = [str(node_id)] + sync.fingerprint(evidence)
+        for note in children.get('notes') or []:
+            self._write_note(node_id, note)
+            manifest['notes'][str(note['id'])] = [str(node_id)] + sync.fingerprint(note)
+        if 'attachments' in children:
+            self._write_attachments(node_id, children['attachments'])
+
+    def refresh(self, client, attachments=True, deep=False, workers=8) -> dict:
+        """
+        Applies the changes made to the project since the last dump or refresh.
+        Returns the dradis.sync.ProjectSync report.
+
+        If the node or issue listing, an attachment listing or the project-wide listings fail, the exception is
+        raised and neither rows nor manifest are changed. Nodes whose evidence or notes could not be fetched keep
+        their rows and are fetched again by the next refresh (see the report's 'failed').
+
+        @attachments: Refresh attachment metadata of created and updated nodes.
+        @deep: Check evidence and notes of every node, not only of new or changed nodes.
+        """
+        pid = self.pid
+        if pid is None:
+            raise ValueError('The snapshot is empty, use dump() first.')
+
+        manifest = json.loads(self._meta('manifest') or 'null')
+        project_sync = sync.ProjectSync(client, pid, workers=workers, manifest=manifest)
+        report = project_sync.run(deep=deep)
+        records = report['records']
+        entries = project_sync.manifest
+
+        with self.__conn:
+            for resource in sync.RESOURCES:
+                self._delete(resource, report[resource]['deleted'])
+
+            for node in records['nodes'].values():
+                self._write_node(node)
+            for issue in records['issues'].values():
+                self._write_issue(issue)
+            for evidence_id, evidence in records['evidence'].items():
+                self._write_evidence(int(entries['evidence'][str(evidence_id)][0]), evidence)
+            for note_id, note in records['notes'].items():
+                self._write_note(int(entries['notes'][str(note_id)][0]), note)
+
+            if attachments:
+                changed = [(node_id, False) for node_id in records['nodes']]
+                for node_id, children, error in self._fetch_children(client, pid, changed, True, workers):
+                    if error is not None:
+                        raise error
+                    self._write_children(node_id, children, entries)
+
+            self._write_project_wide(client, pid)
+            self._set_meta('manifest', json.dumps(entries))
+
+        return report
+
+    ####################################
+    #             Queries              #
+    ####################################
+
+    def query(self, sql: str, parameters=()) -> list:
+        """
+        Runs a read query against the snapshot and returns the rows as dicts.
+        """
+        return [dict(row) for row in self.__conn.execute(sql, parameters)]
+
+    def counts(self) -> dict:
+        return {table: self.__conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('nodes', 'issues', 'evidence', 'notes', 'content_blocks', 'document_properties',
+                              'attachments')}
+
+    def fields(self, resource: str, record_id: int) -> dict:
+        """
+        Returns the parsed fields of an issue, evidence, note or content block.
+        """
+        rows = self.__conn.execute('SELECT name, value FROM fields WHERE resource = ? AND record_id = ?',
+                                   (resource, record_id))
+        return {row['name']: row['value'] for row in rows}
+
+    def evidence_for_issue(self, issue) -> list:
+        """
+        All evidence of an issue (id or title) across nodes, with the node label.
+        """
+        column = 'id' if isinstance(issue, int) else 'title'
+        return self.query(f'''
+            SELECT evidence.id, evidence.node_id, nodes.label, evidence.issue_id, evidence.content
+            FROM evidence
+            JOIN issues ON issues.id = evidence.issue_id
+            LEFT JOIN nodes ON nodes.id = evidence.node_id
+            WHERE issues.{column} = ?
+            ORDER BY nodes.label''', (issue,))
+
+    def issues_by_field(self, name: str, value: str) -> list:
+        """
+        Issues whose field name has the given value, ignoring case, e.g. issues_by_field('Rating', 'Critical').
+        """
+        return self.query('''
+            SELECT issues.id, issues.title
+            FROM fields
+            JOIN issues ON issues.id = fields.record_id
+            WHERE fields.resource = 'issues' AND fields.name = ? AND fields.value = ? COLLATE NOCASE
+            ORDER BY issues.title''', (name, value))
+
+    def nodes_with_issue_field(self, name: str, value: str) -> list:
+        """
+        Nodes with evidence for an issue whose field name has the given value, ignoring case,
+        e.g. nodes_with_issue_field('Rating', 'Critical') for all hosts with a critical issue.
+        """
+        return self.query('''
+            SELECT DISTINCT nodes.id, nodes.label
+            FROM fields
+            JOIN evidence ON evidence.issue_id = fields.record_id
+            JOIN nodes ON nodes.id = evidence.node_id
+            WHERE fields.resource = 'issues' AND fields.name = ? AND fields.value = ? COLLATE NOCASE
+            ORDER BY nodes.label''', (name, value))
@@ -0,0 +1,195 @@
+#####################################################################################
+#               Dradis-Client: Incremental project sync with a manifest             #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dradis.bulk import run_parallel
+
+RESOURCES = ('nodes', 'issues', 'evidence', 'notes')
+# Children embedded in the node list response. They are diffed on their own and excluded from the node hash.
+NODE_CHILDREN = ('evidence', 'notes')
+
+
+def content_hash(record: dict) -> str:
+    """
+    Stable hash of a record's content, independent of key order.
+    """
+    payload = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def fingerprint(record: dict) -> list:
+    """
+    Manifest entry of a record: [updated_at, content hash].
+    """
+    return [record.get('updated_at'), content_hash(record)]
+
+
+def empty_manifest(pid: int) -> dict:
+    manifest = {'pid': pid, 'synced_at': None, 'retry': []}
+    manifest.update({resource: {} for resource in RESOURCES})
+    return manifest
+
+
+class ProjectSync:
+    """
+    Mirrors a project incrementally. A manifest stores updated_at and a content hash of every node, issue,
+    evidence and note seen by the previous run. A run lists nodes and issues (page by page) and fetches the evidence
+    and notes only of nodes that are new or whose updated_at changed, unless the node list already embeds them.
+    This relies on Dradis touching a node's updated_at whenever one of its evidence or notes is created, updated or
+    deleted; run(deep=True) fetches the children of every node for servers that do not.
+
+    @manifest_path: JSON file holding the manifest between runs. Without it the manifest only lives in memory.
+    @workers: number of nodes whose evidence and notes are fetched in parallel.
+    @manifest: start from this manifest (e.g. one kept elsewhere) instead of loading manifest_path.
+    """
+
+    def __init__(self, client, pid: int, manifest_path=None, workers=8, manifest=None):
+        self.client = client
+        self.pid = pid
+        self.manifest_path = manifest_path
+        self.workers = workers
+        if manifest is not None and manifest.get('pid') == pid:
+            self.manifest = manifest
+        else:
+            self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        if self.manifest_path is None or not os.path.exists(self.manifest_path):
+            return empty_manifest(self.pid)
+
+        with open(self.manifest_path, 'r') as manifest_file:
+            manifest = json.load(manifest_file)
+
+        if manifest.get('pid') != self.pid:
+            return empty_manifest(self.pid)
+        return manifest
+
+    def save(self):
+        if self.manifest_path is None:
+            return
+
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as manifest_file:
+            json.dump(self.manifest, manifest_file)
+        os.replace(temp_path, self.manifest_path)
+
+    @staticmethod
+    def _diff(old: dict, new: dict, report: dict, records: dict, fetched: dict):
+        """
+        Compares fingerprints of one resource type and fills the report and the changed records.
+        """
+        for record_id, entry in new.items():
+            if record_id not in old:
+                report['created'].append(int(record_id))
+            elif old[record_id][-2:] != entry[-2:]:
+                report['updated'].append(int(record_id))
+            else:
+                report['unchanged'] += 1
+                continue
+            records[int(record_id)] = fetched[record_id]
+
+        report['deleted'].extend(int(record_id) for record_id in old if record_id not in new)
+
+    def run(self, deep=False) -> dict:
+        """
+        Synchronizes the project and updates the manifest.
+
+        @deep: Fetch the evidence and notes of every node, not only of new or changed nodes.
+        Returns {'nodes': {'created': [ids], 'updated': [ids], 'deleted': [ids], 'unchanged': int}, 'issues': ...,
+        'evidence': ..., 'notes': ..., 'records': {'nodes': {id: record}, ...}, 'failed': [node ids],
+        'seconds': float}. records holds the freshly fetched content of all created and updated items. failed lists
+        the nodes whose evidence or notes could not be fetched; their previous state is kept and fetched again on
+        the next run.
+
+        Raises DradisAPIError if the node or issue listing fails. The manifest is left untouched then, as a cut-off
+        listing would report the missing items as deleted.
+        """
+        start = time.perf_counter()
+        report = {resource: {'created': [], 'updated': [], 'deleted': [], 'unchanged': 0} for resource in RESOURCES}
+        report['records'] = {resource: {} for resource in RESOURCES}
+        new = {resource: {} for resource in RESOURCES}
+        fetched = {resource: {} for resource in RESOURCES}
+
+        retry = set(self.manifest.get('retry', ()))
+        old_children = self._children_by_node()
+        refetch = []
+        for node in self.client.iter_nodes(self.pid):
+            node_id = str(node['id'])
+            children = {child: node.get(child) for child in NODE_CHILDREN}
+            record = {key: value for key, value in node.items() if key not in NODE_CHILDREN}
+            new['nodes'][node_id] = fingerprint(record)
+            fetched['nodes'][node_id] = node
+
+            old = self.manifest['nodes'].get(node_id)
+            if all(value is not None for value in children.values()):
+                self._collect_children(node_id, children, new, fetched)
+            elif deep or old is None or old[0] != new['nodes'][node_id][0] or node_id in retry:
+                refetch.append(node_id)
+            else:
+                self._carry_children(node_id, old_children, new)
+
+        for issue in self.client.iter_issues(self.pid):
+            new['issues'][str(issue['id'])] = fingerprint(issue)
+            fetched['issues'][str(issue['id'])] = issue
+
+        def fetch_children(node_id):
+            return {'evidence': list(self.client.iter_evidence(self.pid, int(node_id))),
+                    'notes': list(self.client.iter_notes(self.pid, int(node_id)))}
+
+        failed = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for node_id, (children, error) in zip(refetch, run_parallel(executor, fetch_children, refetch)):
+                if error is not None:
+                    # Keep the previous state of this node's children and retry on the next run.
+                    self._carry_children(node_id, old_children, new)
+                    failed.append(node_id)
+                else:
+                    self._collect_children(node_id, children, new, fetched)
+
+        for resource in RESOURCES:
+            self._diff(self.manifest[resource], new[resource], report[resource], report['records'][resource],
+                       fetched[resource])
+
+        new['pid'] = self.pid
+        new['retry'] = failed
+        new['synced_at'] = time.time()
+        self.manifest = new
+        self.save()
+
+        report['failed'] = [int(node_id) for node_id in failed]
+        report['seconds'] = time.perf_counter() - start
+        return report
+
+    @staticmethod
+    def _collect_children(node_id: str, children: dict, new: dict, fetched: dict):
+        for resource in NODE_CHILDREN:
+            for child in children.get(resource) or []:
+                new[resource][str(child['id'])] = [node_id] + fingerprint(child)
+                fetched[resource][str(child['id'])] = child
+
+    def _children_by_node(self) -> dict:
+        """
+        Groups the evidence and notes of the manifest by node: node id -> [(resource, child id, entry)].
+        """
+        grouped = {}
+        for resource in NODE_CHILDREN:
+            for child_id, entry in self.manifest[resource].items():
+                grouped.setdefault(entry[0], []).append((resource, child_id, entry))
+        return grouped
+
+    @staticmethod
+    def _carry_children(node_id: str, old_children: dict, new: dict):
+        for resource, child_id, entry in old_children.get(node_id, ()):
+            new[resource][child_id] = entry
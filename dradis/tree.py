@@ -0,0 +1,176 @@
+#####################################################################################
+#               Dradis-Client: Compact in-memory tree of a project's nodes          #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+from array import array
+from bisect import bisect_left, bisect_right
+
+PATH_SEPARATOR = ' > '
+
+
+class NodeTree:
+    """
+    The node hierarchy of a project, built in O(n) (plus sorting) from one node listing.
+
+    Nodes are stored column-wise in typed arrays ordered by id, so a node is addressed by its position in these
+    arrays. Children are kept in CSR form: the children of the node at position i are
+    child_list[child_offsets[i]:child_offsets[i + 1]], ordered by position. A node costs about 40 bytes plus its
+    label, instead of a dict per node.
+
+    @records: iterable of node dicts with 'id', 'label', 'parent_id', 'type_id' and 'position', e.g.
+    DradisClient.iter_nodes(pid). Only these fields are kept.
+    """
+
+    def __init__(self, records=()):
+        rows = sorted((record['id'], record.get('parent_id'), record.get('type_id'), record.get('position'),
+                       record.get('label')) for record in records)
+
+        self.__ids = array('q', (row[0] for row in rows))
+        self.__labels = [row[4] for row in rows]
+        self.__type_ids = array('l', (row[2] or 0 for row in rows))
+        self.__positions = array('l', (row[3] or 0 for row in rows))
+        # Position of the parent in the arrays, -1 for top-level nodes and nodes whose parent is not listed.
+        self.__parents = array('l', (self.__index(row[1]) if row[1] is not None else -1 for row in rows))
+        del rows
+
+        count = len(self.__ids)
+        offsets = array('l', [0]) * (count + 1)
+        for parent in self.__parents:
+            if parent != -1:
+                offsets[parent + 1] += 1
+        for i in range(count):
+            offsets[i + 1] += offsets[i]
+
+        fill = array('l', offsets)
+        children = array('l', [0]) * offsets[count]
+        for i in sorted(range(count), key=lambda i: (self.__positions[i], self.__ids[i])):
+            parent = self.__parents[i]
+            if parent != -1:
+                children[fill[parent]] = i
+                fill[parent] += 1
+        self.__child_offsets = offsets
+        self.__child_list = children
+        self.__roots = array('l', sorted((i for i in range(count) if self.__parents[i] == -1),
+                                         key=lambda i: (self.__positions[i], self.__ids[i])))
+
+        # Label index: labels sorted, with the array position of each.
+        by_label = sorted(range(count), key=lambda i: (self.__labels[i] or '', i))
+        self.__label_keys = [self.__labels[i] or '' for i in by_label]
+        self.__label_positions = array('l', by_label)
+
+    def __len__(self):
+        return len(self.__ids)
+
+    def __contains__(self, node_id: int):
+        return self.__index(node_id) != -1
+
+    def __index(self, node_id) -> int:
+        if node_id is None:
+            return -1
+        i = bisect_left(self.__ids, node_id)
+        return i if i < len(self.__ids) and self.__ids[i] == node_id else -1
+
+    def __node(self, i: int) -> dict:
+        parent = self.__parents[i]
+        return {'id': self.__ids[i], 'label': self.__labels[i],
+                'parent_id': self.__ids[parent] if parent != -1 else None,
+                'type_id': self.__type_ids[i], 'position': self.__positions[i]}
+
+    def __children(self, i: int):
+        return self.__child_list[self.__child_offsets[i]:self.__child_offsets[i + 1]]
+
+    def get(self, node_id: int) -> dict:
+        """
+        Returns {'id', 'label', 'parent_id', 'type_id', 'position'} of a node or None.
+        """
+        i = self.__index(node_id)
+        return self.__node(i) if i != -1 else None
+
+    def roots(self) -> list:
+        """
+        Top-level nodes (and nodes whose parent is not part of the listing), ordered by position.
+        """
+        return [self.__node(i) for i in self.__roots]
+
+    def children(self, node_id: int) -> list:
+        """
+        Direct children of a node, ordered by position.
+        """
+        i = self.__index(node_id)
+        return [self.__node(child) for child in self.__children(i)] if i != -1 else []
+
+    def parent(self, node_id: int):
+        i = self.__index(node_id)
+        if i == -1 or self.__parents[i] == -1:
+            return None
+        return self.__node(self.__parents[i])
+
+    def find_by_label(self, label: str) -> list:
+        """
+        All nodes with exactly this label, in id order.
+        """
+        start = bisect_left(self.__label_keys, label)
+        end = bisect_right(self.__label_keys, label, start)
+        return [self.__node(i) for i in self.__label_positions[start:end]]
+
+    def iter_subtree(self, node_id: int, include_root=True):
+        """
+        Yields the nodes below node_id depth first, in position order, starting with the node itself.
+        """
+        for i in self.__walk(node_id, include_root):
+            yield self.__node(i)
+
+    def subtree_ids(self, node_id: int, include_root=True) -> list:
+        """
+        Ids of the nodes below node_id, as iter_subtree but without building the node dicts.
+        """
+        return [self.__ids[i] for i in self.__walk(node_id, include_root)]
+
+    def __walk(self, node_id: int, include_root: bool):
+        i = self.__index(node_id)
+        if i == -1:
+            return
+
+        stack = [i] if include_root else list(reversed(self.__children(i)))
+        seen = set()
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            yield current
+            stack.extend(reversed(self.__children(current)))
+
+    def path(self, node_id: int) -> str:
+        """
+        Label path from the top-level node, e.g. '10.0.0.0/24 > 10.0.0.5 > 443/tcp'.
+        """
+        labels = []
+        i = self.__index(node_id)
+        seen = set()
+        while i != -1 and i not in seen:
+            seen.add(i)
+            labels.append(self.__labels[i] or '')
+            i = self.__parents[i]
+        return PATH_SEPARATOR.join(reversed(labels))
+
+    def find_by_path(self, path: str):
+        """
+        Returns the node at a label path such as '10.0.0.0/24 > 10.0.0.5 > 443/tcp' or None.
+        If several siblings share a label, the first by position wins.
+        """
+        candidates = self.__roots
+        node = -1
+        for label in path.split(PATH_SEPARATOR.strip()):
+            label = label.strip()
+            node = next((i for i in candidates if self.__labels[i] == label), -1)
+            if node == -1:
+                return None
+            candidates = self.__children(node)
+        return self.__node(node) if node != -1 else None
@@ -0,0 +1,186 @@
+#####################################################################################
+#             Dradis-Client: Idempotent upsert of issues and evidence               #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+from concurrent.futures import ThreadPoolExecutor
+
+from dradis import markup
+from dradis.bulk import run_parallel
+from dradis.errors import DradisAPIError
+from dradis.sync import content_hash
+
+
+def key_function(key):
+    """
+    Turns a key option into a function of the parsed fields of an item:
+    'title' (the Title field), 'hash' (a hash of all fields), any other field name, a callable or None (no key).
+    """
+    if key is None:
+        return lambda fields: None
+    if callable(key):
+        return key
+    if key == 'hash':
+        return content_hash
+    if key == 'title':
+        key = 'Title'
+    return lambda fields: fields.get(key)
+
+
+def _result(index: int, key, item_id=-1, action='failed', error=None) -> dict:
+    return {'index': index, 'key': key, 'id': item_id, 'action': action, 'error': error}
+
+
+def _plan(specs: list, existing: dict, desired_fields, spec_key) -> tuple:
+    """
+    Splits specs into creates, updates and no-ops. Returns (report, writes) where writes holds
+    (index, spec, key, existing id or None) for every item that has to be sent. For duplicate keys the last spec wins.
+    Specs without a key (e.g. the key field is missing) can not be matched and fail.
+    """
+    report = [None] * len(specs)
+    last = {}
+    for index, spec in enumerate(specs):
+        key = spec_key(spec, desired_fields[index])
+        if key is None:
+            report[index] = _result(index, key, error='The key field is missing, the item can not be matched.')
+            continue
+        if key in last:
+            report[last[key]] = _result(last[key], key, action='skipped', error='Duplicate key, a later item wins.')
+        last[key] = index
+
+    writes = []
+    for key, index in last.items():
+        record = existing.get(key)
+        if record is None:
+            writes.append((index, specs[index], key, None))
+        elif record[1] == desired_fields[index]:
+            report[index] = _result(index, key, record[0], 'unchanged')
+        else:
+            writes.append((index, specs[index], key, record[0]))
+    return report, writes
+
+
+def _write(executor, report: list, writes: list, create, update):
+    def send(item):
+        index, spec, key, item_id = item
+        return create(spec) if item_id is None else update(item_id, spec)
+
+    for (index, spec, key, item_id), (value, error) in zip(writes, run_parallel(executor, send, writes)):
+        action = 'created' if item_id is None else 'updated'
+        if error is not None:
+            report[index] = _result(index, key, error=str(error))
+        elif value == -1:
+            report[index] = _result(index, key, error='Dradis rejected the request.')
+        else:
+            report[index] = _result(index, key, value, action)
+
+
+def upsert_issues(client, pid: int, issues: list, key='title', workers=8) -> list:
+    """
+    Creates or updates issues so that the project matches the given specs. The existing issues are listed once and
+    indexed by key; issues whose fields and tags already match are not written.
+
+    @issues: list of dicts with 'title', 'issue_properties' and optional 'tags' (as for create_issue).
+    @key: 'title', the name of a field such as 'Plugin ID', 'hash' (only identical issues match) or a callable
+    receiving the parsed fields of an issue, including 'Title'.
+    @workers: number of writes sent in parallel.
+
+    Returns one entry per spec, in input order: {'index', 'key', 'id', 'action', 'error'} where action is one of
+    'created', 'updated', 'unchanged', 'skipped' or 'failed'. Specs whose key is None (e.g. without the key field)
+    fail. If the existing issues can not be listed, every spec fails and nothing is written.
+    """
+    key_of = key_function(key)
+    desired = [markup.loads(client._issue_data(spec['title'], spec.get('issue_properties', {}),
+                                               spec.get('tags'))['issue']['text']) for spec in issues]
+
+    existing = {}
+    try:
+        for issue in client.iter_issues(pid):
+            fields = markup.loads(issue.get('text'))
+            issue_key = key_of(fields)
+            if issue_key is not None:
+                existing.setdefault(issue_key, (issue['id'], fields))
+    except DradisAPIError as err:
+        # Without the complete listing every create could duplicate an existing issue.
+        return [_result(index, key_of(fields), error=f'Could not list the existing issues: {err}')
+                for index, fields in enumerate(desired)]
+
+    report, writes = _plan(issues, existing, desired, lambda spec, fields: key_of(fields))
+
+    def create(spec):
+        return client.create_issue(pid=pid, title=spec['title'], issue_properties=spec.get('issue_properties', {}),
+                                   tags=spec.get('tags'))
+
+    def update(issue_id, spec):
+        return client.update_issue(pid=pid, issue_id=issue_id, title=spec['title'],
+                                   issue_properties=spec.get('issue_properties', {}), tags=spec.get('tags'))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        _write(executor, report, writes, create, update)
+    return report
+
+
+def upsert_evidence(client, pid: int, evidence: list, key=None, workers=8) -> list:
+    """
+    Creates or updates evidence so that the project matches the given specs. Evidence is matched on
+    (node id, issue id, key): the evidence of every node in the specs is listed once, evidence whose content already
+    matches is not written.
+
+    @evidence: list of dicts with 'node_id', 'issue_id', 'evidence_properties' and optional 'tags'.
+    @key: None (one piece of evidence per node and issue), the name of a field such as 'Port', 'hash' or a callable
+    receiving the parsed fields of a piece of evidence.
+    @workers: number of requests sent in parallel.
+
+    Returns one entry per spec, in input order, as upsert_issues does. With a key, specs without the key field fail.
+    Specs of nodes whose evidence can not be listed fail and are not written.
+    """
+    key_of = key_function(key)
+    node_ids = list(dict.fromkeys(spec['node_id'] for spec in evidence))
+
+    existing = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = run_parallel(executor, lambda node_id: list(client.iter_evidence(pid, node_id)), node_ids)
+        failed_nodes = {}
+        for node_id, (items, error) in zip(node_ids, listings):
+            if error is not None:
+                failed_nodes[int(node_id)] = error
+            for item in items or []:
+                issue = item.get('issue')
+                issue_id = issue.get('id') if isinstance(issue, dict) else item.get('issue_id')
+                fields = markup.loads(item.get('content'))
+                existing.setdefault((int(node_id), int(issue_id or 0), key_of(fields)), (item['id'], fields))
+
+        desired = [markup.loads(client._evidence_data(spec['issue_id'], spec.get('evidence_properties', {}),
+                                                      spec.get('tags'))['evidence']['content']) for spec in evidence]
+
+        def spec_key(spec, fields):
+            item_key = key_of(fields)
+            if key is not None and item_key is None:
+                return None  # Would collapse with every other keyless spec of the node and issue
+            return int(spec['node_id']), int(spec['issue_id']), item_key
+
+        report, writes = _plan(evidence, existing, desired, spec_key)
+        for index, spec, item_key, _ in writes:
+            if int(spec['node_id']) in failed_nodes:
+                report[index] = _result(index, item_key, error='Could not list the evidence of the node: '
+                                                               f'{failed_nodes[int(spec["node_id"])]}')
+        writes = [write for write in writes if int(write[1]['node_id']) not in failed_nodes]
+
+        def create(spec):
+            return client.create_evidence(pid=pid, node_id=spec['node_id'], issue_id=spec['issue_id'],
+                                          evidence_properties=spec.get('evidence_properties', {}),
+                                          tags=spec.get('tags'))
+
+        def update(evidence_id, spec):
+            return client.update_evidence(pid=pid, node_id=spec['node_id'], issue_id=spec['issue_id'],
+                                          evidence_id=evidence_id,
+                                          evidence_properties=spec.get('evidence_properties', {}),
+                                          tags=spec.get('tags'))
+
+        _write(executor, report, writes, create, update)
+    return report
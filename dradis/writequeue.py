@@ -0,0 +1,251 @@
+#####################################################################################
+#               Dradis-Client: Write-behind queue for creates and updates           #
+#####################################################################################
+# This file is part of Pydradis.                                                    #
+#                                                                                   #
+#     Pydradis is free software: you can redistribute it and/or modify              #
+#     it under the terms of the GNU Lesser General Public License as published by   #
+#     the Free Software Foundation, either version 3 of the License, or             #
+#     (at your option) any later version.                                           #
+#####################################################################################
+import itertools
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from dradis.retry import RetryPolicy
+
+
+class _Write:
+    __slots__ = ('method', 'http_method', 'args', 'kwargs', 'key', 'futures', 'attempt', 'not_before', 'deadline')
+
+    def __init__(self, method: str, http_method: str, args: tuple, kwargs: dict, key, deadline: float):
+        self.method = method
+        self.http_method = http_method
+        self.args = args
+        self.kwargs = kwargs
+        self.key = key
+        self.futures = [Future()]
+        self.attempt = 0
+        self.not_before = 0.0  # Earliest dispatch time (retry backoff)
+        self.deadline = deadline  # Latest dispatch time (flush interval)
+
+
+class WriteQueue:
+    """
+    Sends creates and updates in the background so the calling threads do not wait on the Dradis API.
+
+    Every call returns a concurrent.futures.Future resolving to what the client method returns (the new id, or -1
+    if the write failed for good). Queued updates of the same resource are coalesced: only the last one is sent and
+    all of their futures receive its result. Writes of the same resource are never sent concurrently, so they reach
+    the server in submission order.
+
+    @workers: number of requests sent in parallel, see pool_maxsize of DradisClient._create_session.
+    @batch_size: number of queued writes that triggers a flush.
+    @flush_interval: seconds a write may wait in the queue before it is sent.
+    @retry: RetryPolicy for writes that failed with a status in its status_forcelist or a connection error. Creates
+    are only retried if retry_post is set, as the server may have created the item already.
+    @max_pending: block submitting threads while this many writes are queued (None: unbounded).
+    """
+
+    def __init__(self, client, workers=4, batch_size=50, flush_interval=1.0, retry: RetryPolicy = None,
+                 max_pending=None):
+        self.__client = client
+        self.__batch_size = batch_size
+        self.__flush_interval = flush_interval
+        self.__retry = retry if retry is not None else RetryPolicy(max_retries=3)
+        self.__max_pending = max_pending
+        self.__logger = logging.getLogger('PyDradis3ng')
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__cond = threading.Condition()
+        self.__pending = OrderedDict()  # key -> _Write, in submission order
+        self.__in_flight = {}  # key -> _Write
+        self.__unique = itertools.count()
+        self.__flushing = 0
+        self.__closed = False
+        self.__stats = Counter()
+        self.__dispatcher = threading.Thread(target=self._dispatch_loop, name='dradis-write-queue', daemon=True)
+        self.__dispatcher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Counters: submitted, coalesced, sent (requests), retried, succeeded, failed.
+        """
+        with self.__cond:
+            return dict(self.__stats)
+
+    def __len__(self):
+        with self.__cond:
+            return len(self.__pending) + len(self.__in_flight)
+
+    ####################################
+    #             Submitting           #
+    ####################################
+
+    def submit(self, method: str, *args, key=None, **kwargs) -> Future:
+        """
+        Queues client.<method>(*args, **kwargs).
+
+        @key: hashable identifying the resource a full update replaces, e.g. ('note', pid, note_id). A queued write
+        with the same key is replaced by this one. None for writes that must all be sent (creates).
+        """
+        http_method = 'POST' if method.startswith('create_') else 'PUT'
+        with self.__cond:
+            if self.__closed:
+                raise RuntimeError('The write queue is closed.')
+            if self.__max_pending is not None:
+                self.__cond.wait_for(lambda: len(self.__pending) < self.__max_pending or self.__closed)
+                if self.__closed:
+                    raise RuntimeError('The write queue is closed.')
+
+            self.__stats['submitted'] += 1
+            queued = self.__pending.get(key) if key is not None else None
+            if queued is not None:
+                queued.args, queued.kwargs = args, kwargs
+                queued.futures.append(Future())
+                self.__stats['coalesced'] += 1
+                return queued.futures[-1]
+
+            if key is None:
+                key = ('unique', next(self.__unique))
+            write = _Write(method, http_method, args, kwargs, key, time.monotonic() + self.__flush_interval)
+            self.__pending[key] = write
+            if len(self.__pending) == 1 or len(self.__pending) >= self.__batch_size:
+                self.__cond.notify_all()  # Start the flush timer or flush right away
+            return write.futures[0]
+
+    def create_node(self, pid: int, label: str, type_id=0, parent_id=None, position=1) -> Future:
+        return self.submit('create_node', pid, label, type_id=type_id, parent_id=parent_id, position=position)
+
+    def create_issue(self, pid: int, title: str, issue_properties: dict, tags=None) -> Future:
+        return self.submit('create_issue', pid, title, issue_properties, tags=tags)
+
+    def update_issue(self, pid: int, issue_id: int, title: str, issue_properties: dict, tags) -> Future:
+        return self.submit('update_issue', pid, issue_id, title, issue_properties, tags, key=('issue', pid, issue_id))
+
+    def create_evidence(self, pid: int, node_id: int, issue_id: int, evidence_properties: dict, tags=None) -> Future:
+        return self.submit('create_evidence', pid, node_id, issue_id, evidence_properties, tags=tags)
+
+    def update_evidence(self, pid: int, node_id: int, issue_id: int, evidence_id: int, evidence_properties: dict,
+                        tags=None) -> Future:
+        return self.submit('update_evidence', pid, node_id, issue_id, evidence_id, evidence_properties, tags=tags,
+                           key=('evidence', pid, evidence_id))
+
+    def create_note(self, pid: int, node_id: int, note_properties: dict, category=0) -> Future:
+        return self.submit('create_note', pid, node_id, note_properties, category=category)
+
+    def update_note(self, pid: int, node_id: int, note_id: int, note_properties: dict, category=0) -> Future:
+        return self.submit('update_note', pid, node_id, note_id, note_properties, category=category,
+                           key=('note', pid, note_id))
+
+    ####################################
+    #              Flushing            #
+    ####################################
+
+    def flush(self, timeout=None) -> bool:
+        """
+        Sends all queued writes right away and waits until they are done (including their retries).
+        Returns False if the timeout (seconds) expired first.
+        """
+        with self.__cond:
+            futures = [future for write in itertools.chain(self.__pending.values(), self.__in_flight.values())
+                       for future in write.futures]
+            self.__flushing += 1
+            self.__cond.notify_all()
+        try:
+            return not wait(futures, timeout=timeout).not_done
+        finally:
+            with self.__cond:
+                self.__flushing -= 1
+
+    def close(self, timeout=None):
+        """
+        Flushes the queue and stops its threads. Writes submitted afterwards raise RuntimeError.
+        """
+        with self.__cond:
+            if self.__closed:
+                return
+        self.flush(timeout)
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+        self.__dispatcher.join(timeout)
+        if not self.__dispatcher.is_alive():
+            self.__executor.shutdown()
+
+    def _dispatch_loop(self):
+        with self.__cond:
+            while True:
+                if self.__closed and not self.__pending and not self.__in_flight:
+                    return
+
+                now = time.monotonic()
+                ready = [write for key, write in self.__pending.items()
+                         if write.not_before <= now and key not in self.__in_flight]
+                if ready and (self.__flushing or self.__closed or len(self.__pending) >= self.__batch_size
+                              or min(write.deadline for write in ready) <= now):
+                    for write in ready:
+                        del self.__pending[write.key]
+                        self.__in_flight[write.key] = write
+                        self.__executor.submit(self._send, write)
+                    self.__cond.notify_all()
+                    continue
+
+                wake_at = [max(write.not_before, write.deadline) for key, write in self.__pending.items()
+                           if key not in self.__in_flight]
+                self.__cond.wait(max(0.0, min(wake_at) - now) if wake_at else None)
+
+    def _send(self, write: _Write):
+        """
+        Runs on a worker thread: sends the write once and either resolves its futures or schedules a retry.
+        """
+        client = self.__client
+        client.pop_last_failure()
+        result, error, retryable = -1, None, self.__retry.is_retryable(write.http_method)
+        try:
+            result = getattr(client, write.method)(*write.args, **write.kwargs)
+            if result == -1:
+                failure = client.pop_last_failure()
+                error = str(failure) if failure is not None else f'{write.method} failed.'
+                # A 404 or 422 fails the same way on every attempt.
+                retryable = retryable and failure is not None and failure.status in self.__retry.status_forcelist
+        except Exception as err:  # Connection errors once the client's own retries are exhausted
+            error = str(err) or type(err).__name__
+
+        with self.__cond:
+            self.__stats['sent'] += 1
+            del self.__in_flight[write.key]
+
+            if error is not None and retryable and write.attempt < self.__retry.max_retries:
+                self.__stats['retried'] += 1
+                delay = self.__retry.backoff(write.attempt)
+                self.__logger.warning(f'Queued {write.method} failed ({error}), retrying in {delay:.2f}s.')
+                write.attempt += 1
+                write.not_before = write.deadline = time.monotonic() + delay
+                newer = self.__pending.get(write.key)
+                if newer is None:
+                    self.__pending[write.key] = write
+                else:
+                    # A newer full update of the same resource was queued meanwhile and supersedes this one.
+                    newer.futures[:0] = write.futures
+                self.__cond.notify_all()
+                return
+
+            if error is not None:
+                self.__stats['failed'] += len(write.futures)
+                self.__logger.warning(f'Queued {write.method} failed for good: {error}')
+            else:
+                self.__stats['succeeded'] += len(write.futures)
+            self.__cond.notify_all()
+
+        for future in write.futures:
+            future.set_result(result)
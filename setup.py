@@ -13,6 +13,10 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/no-sec-marko/dradis-client",
     packages=['dradis'],
+    extras_require={
+        'async': ['aiohttp'],
+        'brotli': ['brotli'],
+    },
     classifiers=(
         'Development Status :: 3 - Alpha',
         'Intended Audience :: Developers',
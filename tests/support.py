@@ -0,0 +1,55 @@
+#####################################################################################
+#                 Dradis-Client: Shared setup of the test suite                     #
+#####################################################################################
+# Run from the repository root: python -m unittest discover tests
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from dradis import DradisClient, Instrumentation  # noqa: E402
+from stub_server import StubDradisServer  # noqa: E402
+
+
+class StubTestCase(unittest.TestCase):
+    """
+    Starts a StubDradisServer per test, with a client pointed at it (.server, .dradis, .client) and a temporary
+    directory (.tmp). Project 1 is populated with populate_args.
+    """
+    server_args = {}
+    populate_args = {}
+
+    def setUp(self):
+        logging.disable(logging.WARNING)  # Injected errors are expected to be logged
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.server = StubDradisServer(**self.server_args)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.dradis = self.server.dradis
+        self.dradis.populate(1, **self.populate_args)
+        self.client = DradisClient('token', self.server.url)
+        self.addCleanup(self.client.close)
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+
+    def client_with(self, metrics: list = None, **options) -> DradisClient:
+        """
+        A further client with the given DradisClient options, closed after the test. If a list is passed as metrics,
+        the client is instrumented and the RequestMetrics of every request are appended to it.
+        """
+        if metrics is not None:
+            instrumentation = Instrumentation(histogram=False)
+            instrumentation.add_hook(metrics.append)
+            options['instrumentation'] = instrumentation
+        client = DradisClient('token', self.server.url, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp, name)
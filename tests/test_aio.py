@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import unittest
+
+from support import StubTestCase
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency (pip install dradis-client[async])
+    aiohttp = None
+
+from dradis import AsyncDradisClient
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncClientTest(StubTestCase):
+    populate_args = {'nodes': 5, 'issues': 3, 'evidence_per_node': 1}
+
+    def run_async(self, coroutine_function):
+        loop = asyncio.new_event_loop()
+        try:
+            async def run():
+                async with AsyncDradisClient('token', self.server.url, concurrency=4) as client:
+                    return await coroutine_function(client)
+            return loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+    def test_same_results_as_sync_client(self):
+        async def calls(client):
+            return await asyncio.gather(client.get_project_list(), client.get_node_list(1),
+                                        client.get_issue_list(1), client.get_team(1))
+
+        projects, nodes, issues, team = self.run_async(calls)
+        self.assertEqual(projects, self.client.get_project_list())
+        self.assertEqual(nodes, self.client.get_node_list(1))
+        self.assertEqual(issues, self.client.get_issue_list(1))
+        self.assertEqual(team, self.client.get_team(1))
+
+    def test_writes(self):
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        notes = len(self.dradis.children(1, node_id)['notes'])
+
+        async def calls(client):
+            issue_id = await client.create_issue(1, 'Async issue', {'Rating': 'Low'})
+            note_ids = await asyncio.gather(*[client.create_note(1, node_id, {'Title': f'Note {i}'})
+                                              for i in range(10)])
+            return issue_id, note_ids, await client.delete_note(1, node_id, note_ids[0])
+
+        issue_id, note_ids, deleted = self.run_async(calls)
+        self.assertIn(issue_id, self.dradis.data[1]['issues'])
+        self.assertEqual(len(set(note_ids)), 10)
+        self.assertTrue(deleted)
+        self.assertEqual(len(self.dradis.children(1, node_id)['notes']), notes + 9)
+
+    def test_failed_request(self):
+        self.server.fail_next(1, 500, match=r'GET .*/issues$')
+        self.assertEqual(self.run_async(lambda client: client.get_issue_list(1)), [])
+
+    def test_debug_logs_responses(self):
+        logging.disable(logging.NOTSET)
+        logger = logging.getLogger('PyDradis3ng')
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.INFO)
+
+        async def calls():
+            async with AsyncDradisClient('token', self.server.url, debug=True) as client:
+                await client.get_issue_list(1)
+                client.debug(False)
+                await client.get_node_list(1)
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        with self.assertLogs('PyDradis3ng', logging.DEBUG) as logs:
+            loop.run_until_complete(calls())
+        self.assertEqual(len(logs.records), 1)
+        self.assertTrue(logs.output[0].startswith('DEBUG:PyDradis3ng:Server Response:\nGET 200'))
+
+    def test_download_attachment(self):
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        self.dradis.data[1]['attachments'][node_id] = {'shot.png': b'PNG' * 1000}
+        output = self.path('shot.png')
+
+        def download(client):
+            return client.download_attachment(1, node_id, 'shot.png', 'cookie', output_file=output)
+
+        self.assertTrue(self.run_async(download))
+        with open(output, 'rb') as file:
+            self.assertEqual(file.read(), b'PNG' * 1000)
+        os.remove(output)
+
+        for status in (401, 404, 500):
+            self.server.fail_next(1, status, match=r'GET /pro/projects/')
+            self.assertFalse(self.run_async(download), status)
+            self.assertFalse(os.path.exists(output), status)
+            self.assertFalse(os.path.exists(output + '.part'), status)
+
+    def test_cancelled_download_leaves_no_file(self):
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        self.dradis.data[1]['attachments'][node_id] = {'dump.bin': b'x' * 4000000}
+        output = self.path('dump.bin')
+
+        async def cancel(client):
+            task = asyncio.ensure_future(client.download_attachment(1, node_id, 'dump.bin', 'cookie',
+                                                                    output_file=output, chunk_size=1024))
+            while not os.path.exists(output + '.part'):
+                await asyncio.sleep(0.001)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        self.assertTrue(self.run_async(cancel))
+        self.assertEqual((os.path.exists(output), os.path.exists(output + '.part')), (False, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import base64
+import hashlib
+import json
+import os
+import unittest
+
+from support import StubTestCase
+
+from dradis import RetryPolicy, TokenBucket
+
+
+class UploadTest(StubTestCase):
+    populate_args = {'nodes': 3}
+
+    def setUp(self):
+        super().setUp()
+        self.nodes = list(self.dradis.data[1]['nodes'])
+        self.files = {}
+        for index, size in enumerate((1, 70000, 200000)):
+            path = self.path(f'file{index}.bin')
+            with open(path, 'wb') as file:
+                file.write(bytes(range(256)) * (size // 256) + b'x' * (size % 256))
+            self.files[path] = size
+
+    def stored(self, node_id: int) -> dict:
+        return {name: len(content) for name, content in self.dradis.data[1]['attachments'].get(node_id, {}).items()}
+
+    def test_create_attachments(self):
+        report = self.client.create_attachments(1, {node_id: list(self.files) for node_id in self.nodes},
+                                                files_per_request=2, workers=2)
+        self.assertEqual([entry['error'] for entry in report['requests']], [None] * 6)
+        self.assertGreater(report['bytes'], 3 * sum(self.files.values()))
+        for node_id in self.nodes:
+            self.assertEqual(self.stored(node_id), {os.path.basename(path): size for path, size in self.files.items()})
+
+    def test_upload_uses_retry_rate_limit_and_instrumentation(self):
+        metrics = []
+        client = self.client_with(metrics=metrics, retry=RetryPolicy(backoff_factor=0.01, retry_post=True),
+                                  rate_limit=TokenBucket(rate=1000))
+
+        self.server.fail_next(1, 503, match=r'POST .*/attachments$')
+        report = client.create_attachments(1, {self.nodes[0]: list(self.files)})
+        self.assertEqual([entry['error'] for entry in report['requests']], [None])
+        self.assertEqual(self.stored(self.nodes[0]), {os.path.basename(path): size for path, size in self.files.items()})
+        self.assertEqual([metric.status_code for metric in metrics], [503, 201])
+        self.assertGreater(metrics[-1].request_bytes, sum(self.files.values()))
+
+
+class DownloadTest(StubTestCase):
+    populate_args = {'nodes': 3}
+
+    def setUp(self):
+        super().setUp()
+        self.nodes = list(self.dradis.data[1]['nodes'])
+        for index, node_id in enumerate(self.nodes):
+            self.dradis.data[1]['attachments'][node_id] = {f'{name}.bin': bytes([index]) * size
+                                                           for name, size in (('small', 10), ('large', 300000))}
+        self.content = self.dradis.data[1]['attachments'][self.nodes[0]]['large.bin']
+        self.output = os.path.join(self.tmp, str(self.nodes[0]), 'large.bin')
+
+    def download(self) -> dict:
+        report = self.client.download_attachments(1, self.nodes, self.tmp, 'cookie', chunk_size=4096, workers=3)
+        return {(entry['node_id'], entry['filename']): entry for entry in report['files']}
+
+    def read(self, path: str) -> bytes:
+        with open(path, 'rb') as file:
+            return file.read()
+
+    def interrupted(self, size: int, validator: str):
+        os.makedirs(os.path.dirname(self.output))
+        with open(self.output + '.part', 'wb') as file:
+            file.write(self.content[:size])
+        with open(self.output + '.part.json', 'w') as file:
+            json.dump({'validator': validator,
+                       'md5': base64.b64encode(hashlib.md5(self.content).digest()).decode()}, file)
+
+    def test_download_and_skip(self):
+        files = self.download()
+        self.assertEqual({entry['status'] for entry in files.values()}, {'downloaded'})
+        for (node_id, filename), entry in files.items():
+            self.assertEqual(self.read(entry['path']), self.dradis.data[1]['attachments'][node_id][filename])
+        self.assertEqual({entry['status'] for entry in self.download().values()}, {'skipped'})
+
+    def test_resume(self):
+        self.interrupted(100000, f'"{hashlib.md5(self.content).hexdigest()}"')
+        entry = self.download()[(self.nodes[0], 'large.bin')]
+        self.assertEqual((entry['status'], entry['bytes']), ('resumed', 200000))
+        self.assertEqual(self.read(self.output), self.content)
+        self.assertFalse(os.path.exists(self.output + '.part.json'))
+
+    def test_changed_file_is_downloaded_again(self):
+        self.interrupted(100000, '"previous version"')
+        entry = self.download()[(self.nodes[0], 'large.bin')]
+        self.assertEqual((entry['status'], entry['bytes']), ('downloaded', 300000))
+        self.assertEqual(self.read(self.output), self.content)
+
+    def test_failures(self):
+        self.server.fail_next(1, 503, match=fr'GET .*/nodes/{self.nodes[1]}/attachments$')
+        self.server.fail_next(1, 500, match=fr'GET /pro/projects/1/nodes/{self.nodes[0]}/attachments/large.bin$')
+        files = self.download()
+        self.assertIn('503', files[(self.nodes[1], None)]['error'])
+        self.assertEqual(files[(self.nodes[0], 'large.bin')]['status'], 'failed')
+        self.assertIn('500', files[(self.nodes[0], 'large.bin')]['error'])
+        del files[(self.nodes[1], None)], files[(self.nodes[0], 'large.bin')]
+        self.assertEqual([entry['status'] for entry in files.values()], ['downloaded'] * 3)
+
+    def test_unsatisfiable_range_without_a_partial_file(self):
+        self.server.fail_next(1, 416, match=fr'GET /pro/projects/1/nodes/{self.nodes[0]}/attachments/large.bin$')
+        entry = self.download()[(self.nodes[0], 'large.bin')]
+        self.assertEqual(entry['status'], 'failed')
+        self.assertIn('416', entry['error'])
+        self.assertFalse(os.path.exists(self.output) or os.path.exists(self.output + '.part'))
+
+
+if __name__ == '__main__':
+    unittest.main()
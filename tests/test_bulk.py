@@ -0,0 +1,59 @@
+import unittest
+
+from support import StubTestCase
+
+
+class BulkImportTest(StubTestCase):
+    populate_args = {'nodes': 0, 'issues': 0, 'content_blocks': 0}
+
+    def setUp(self):
+        super().setUp()
+        self.nodes = [{'label': 'host', 'ref': 'host'},
+                      {'label': 'port 80', 'ref': 'http', 'parent_ref': 'host'},
+                      {'label': 'path', 'ref': 'path', 'parent_ref': 'http'},
+                      {'label': 'other host', 'ref': 'other'}]
+        self.issues = [{'title': f'Issue {i}', 'ref': f'issue-{i}', 'issue_properties': {'Rating': 'Low'}}
+                       for i in range(3)]
+        self.evidence = [{'node_ref': ref, 'issue_ref': f'issue-{i}', 'evidence_properties': {'Port': '80/tcp'}}
+                         for i, ref in enumerate(('http', 'path', 'other'))]
+
+    def errors(self, entries: list) -> list:
+        return [entry['error'] for entry in entries]
+
+    def test_refs_are_resolved(self):
+        report = self.client.bulk_import(1, nodes=self.nodes, issues=self.issues, evidence=self.evidence, workers=4)
+        self.assertEqual(self.errors(report['nodes']), [None] * 4)
+        self.assertEqual(self.errors(report['issues']) + self.errors(report['evidence']), [None] * 6)
+
+        data = self.dradis.data[1]
+        ids = {entry['ref']: entry['id'] for entry in report['nodes'] + report['issues']}
+        self.assertEqual([data['nodes'][ids[ref]]['parent_id'] for ref in ('host', 'http', 'path', 'other')],
+                         [None, ids['host'], ids['http'], None])
+        self.assertCountEqual([(item['node_id'], item['issue_id']) for item in data['evidence'].values()],
+                              [(ids['http'], ids['issue-0']), (ids['path'], ids['issue-1']),
+                               (ids['other'], ids['issue-2'])])  # Created in parallel, in any order
+
+    def test_failures_skip_dependent_items(self):
+        self.server.fail_next(1, 500, match=r'POST /pro/api/nodes$')
+        report = self.client.bulk_import(1, nodes=self.nodes, issues=self.issues, evidence=self.evidence, workers=1)
+        self.assertEqual(self.errors(report['nodes']), ['Dradis rejected the request.',
+                                                        'Parent node host was not created.',
+                                                        'Parent node http was not created.', None])
+        self.assertEqual([entry['id'] for entry in report['nodes'][:3]], [-1] * 3)
+        self.assertEqual(self.errors(report['issues']), [None] * 3)
+        self.assertEqual(self.errors(report['evidence'])[2], None)
+        self.assertEqual(self.errors(report['evidence'])[:2], ['Referenced node or issue was not created.'] * 2)
+        self.assertEqual(len(self.dradis.data[1]['nodes']), 1)
+        self.assertEqual(len(self.dradis.data[1]['evidence']), 1)
+
+    def test_circular_and_unknown_parents(self):
+        nodes = [{'label': 'a', 'ref': 'a', 'parent_ref': 'b'}, {'label': 'b', 'ref': 'b', 'parent_ref': 'a'},
+                 {'label': 'c', 'parent_ref': 'missing'}]
+        report = self.client.bulk_import(1, nodes=nodes)
+        self.assertEqual(self.errors(report['nodes']), ['Circular parent_ref.', 'Circular parent_ref.',
+                                                        'Parent node missing was not created.'])
+        self.assertEqual(self.dradis.data[1]['nodes'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
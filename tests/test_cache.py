@@ -0,0 +1,68 @@
+import time
+import unittest
+
+from support import StubTestCase
+
+from dradis import ResponseCache
+
+
+class ResponseCacheTest(StubTestCase):
+    populate_args = {'nodes': 3, 'issues': 2, 'evidence_per_node': 1}
+
+    def setUp(self):
+        super().setUp()
+        self.node_id = next(iter(self.dradis.data[1]['nodes']))
+
+    def requests(self, endpoint: str) -> int:
+        return self.dradis.counts[f'GET {endpoint}']
+
+    def test_repeated_reads_are_served_locally(self):
+        client = self.client_with(cache=ResponseCache())
+        node = client.get_node(1, self.node_id)
+        for _ in range(5):
+            self.assertEqual(client.get_node(1, self.node_id), node)
+        self.assertEqual(client.get_issue_list(1), client.get_issue_list(1))
+        self.assertEqual(self.requests('/pro/api/nodes/{id}'), 1)
+        self.assertEqual(self.requests('/pro/api/issues'), 1)
+        self.assertEqual(client.cache.stats(), {'hits': 6, 'misses': 2, 'hit_ratio': 0.75, 'size': 2})
+
+    def test_writes_invalidate_related_resources(self):
+        client = self.client_with(cache=ResponseCache())
+        issue_id = next(iter(self.dradis.data[1]['issues']))
+        evidence = len(client.get_node(1, self.node_id)['evidence'])
+        client.get_project(1)
+
+        client.create_evidence(1, self.node_id, issue_id, {'Port': '443/tcp'})
+        self.assertEqual(len(client.get_node(1, self.node_id)['evidence']), evidence + 1)  # Embedded in the node
+        client.get_project(1)
+        self.assertEqual(self.requests('/pro/api/nodes/{id}'), 2)
+        self.assertEqual(self.requests('/pro/api/projects/{id}'), 1)
+
+    def test_ttl(self):
+        client = self.client_with(cache=ResponseCache(ttl=0.2, resource_ttl={'issues': 0}))
+        for _ in range(2):
+            client.get_node(1, self.node_id)
+            client.get_issue_list(1)
+        self.assertEqual((self.requests('/pro/api/nodes/{id}'), self.requests('/pro/api/issues')), (1, 2))
+        time.sleep(0.3)
+        client.get_node(1, self.node_id)
+        self.assertEqual(self.requests('/pro/api/nodes/{id}'), 2)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        client = self.client_with(cache=ResponseCache(maxsize=2))
+        first, second, third = self.dradis.data[1]['nodes']
+        for node_id in (first, second, first, third, first, second):
+            client.get_node(1, node_id)
+        self.assertEqual(client.cache.stats()['hits'], 2)  # first twice, second was evicted by third
+        self.assertEqual(len(client.cache), 2)
+
+    def test_failed_responses_are_not_cached(self):
+        client = self.client_with(cache=ResponseCache())
+        self.server.fail_next(1, 500, match=r'GET .*/nodes/\d+$')
+        self.assertEqual(client.get_node(1, self.node_id), {})
+        self.assertEqual(client.get_node(1, self.node_id)['id'], self.node_id)
+        self.assertEqual(len(client.cache), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
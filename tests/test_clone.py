@@ -0,0 +1,66 @@
+import shutil
+import unittest
+
+from support import StubTestCase
+
+from dradis import markup
+
+
+class CloneTest(StubTestCase):
+    server_args = {'embed_children': False}
+    populate_args = {'nodes': 20, 'issues': 10, 'evidence_per_node': 1, 'notes_per_node': 1, 'content_blocks': 2}
+
+    def assertComplete(self, report: dict):
+        self.assertEqual(report['errors'], [])
+        source, clone = self.dradis.data[1], self.dradis.data[report['pid']]
+        for resource in ('nodes', 'issues', 'evidence', 'notes', 'content_blocks'):
+            self.assertEqual(len(clone[resource]), len(source[resource]), resource)
+        self.assertEqual(clone['document_properties'], source['document_properties'])
+        self.assertEqual(sorted((node['label'], node['position']) for node in clone['nodes'].values()),
+                         sorted((node['label'], node['position']) for node in source['nodes'].values()))
+
+    def test_clone(self):
+        issue = self.dradis.create_issue(1, markup.dumps({'Title': 'Tagged', 'Rating': 'High'}))
+        issue['tags'] = [{'name': '!9467bd_critical'}, {'name': 'web'}]  # As listed by the API, not in the text
+        report = self.client.clone_project(1, 'Clone', workers=4)
+        self.assertComplete(report)
+        self.assertEqual(report['copied']['nodes'], 20)
+        tagged = [issue for issue in self.dradis.data[report['pid']]['issues'].values() if issue['title'] == 'Tagged']
+        self.assertEqual([issue['tags'] for issue in tagged], [[{'name': '!9467bd_critical'}, {'name': 'web'}]])
+        self.assertEqual(tagged[0]['fields'], {'Title': 'Tagged', 'Rating': 'High', 'Tags': '!9467bd_critical,web'})
+
+    def test_resume_after_interruption(self):
+        checkpoint, crashed = self.path('checkpoint.json'), self.path('crashed.json')
+        create_node = self.client.create_node
+        calls = []
+
+        def interrupted_create_node(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 15:
+                # The process dies here: only what the checkpoint file holds at this point survives, and nothing
+                # the first run sends afterwards reaches the server.
+                shutil.copy(checkpoint, crashed)
+                self.server.configure(error_rate=1.0)
+            return create_node(*args, **kwargs)
+
+        self.client.create_node = interrupted_create_node
+        self.client.clone_project(1, 'Clone', checkpoint_path=checkpoint, workers=1)
+        del self.client.create_node
+        self.server.configure(error_rate=0.0)
+
+        report = self.client.clone_project(1, 'Clone', checkpoint_path=crashed, workers=4)
+        self.assertComplete(report)
+        self.assertEqual(len(self.dradis.projects), 2)
+
+    def test_failed_listing_copies_nothing(self):
+        checkpoint = self.path('checkpoint.json')
+        self.server.fail_next(1, 503, match=r'GET .*/nodes$')
+        report = self.client.clone_project(1, 'Clone', checkpoint_path=checkpoint)
+        self.assertEqual([error['resource'] for error in report['errors']], ['project'])
+        self.assertEqual(len(self.dradis.data[report['pid']]['nodes']), 0)
+
+        self.assertComplete(self.client.clone_project(1, 'Clone', checkpoint_path=checkpoint))
+
+
+if __name__ == '__main__':
+    unittest.main()
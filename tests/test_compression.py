@@ -0,0 +1,34 @@
+import unittest
+
+from support import StubTestCase
+
+
+class CompressionTest(StubTestCase):
+    populate_args = {'nodes': 10, 'field_size': 2000}
+
+    def test_compressed_responses_are_decoded(self):
+        metrics = []
+        client = self.client_with(metrics=metrics)
+        self.server.configure(compress=False)
+        plain = client.get_node_list(1, full=True)
+        self.server.configure(compress=True)
+        compressed = client.get_node_list(1, full=True)
+        self.assertEqual([node.raw for node in compressed], [node.raw for node in plain])
+        self.assertLess(metrics[1].response_bytes * 5, metrics[0].response_bytes)  # Bytes on the wire
+
+    def test_request_bodies_are_compressed_above_the_threshold(self):
+        plain = []
+        plain_client = self.client_with(metrics=plain)
+        compressed = []
+        client = self.client_with(metrics=compressed, compress_min_size=1024)
+        text = 'The remote service accepts connections encrypted using TLS 1.0. ' * 50
+        for dradis in (plain_client, client):
+            issue_id = dradis.create_issue(1, 'Large', {'Description': text})
+            self.assertEqual(self.dradis.data[1]['issues'][issue_id]['fields']['Description'], text.strip())
+            dradis.create_issue(1, 'Small', {'Description': 'Short'})
+        self.assertLess(compressed[0].request_bytes * 5, plain[0].request_bytes)
+        self.assertEqual(compressed[1].request_bytes, plain[1].request_bytes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import unittest
+
+from support import StubTestCase
+
+from dradis import DradisAPIError
+
+
+class FanOutTest(StubTestCase):
+    populate_args = {'nodes': 3, 'issues': 1}
+
+    def setUp(self):
+        super().setUp()
+        self.pids = [1]
+        for i in range(2, 5):
+            pid = self.client.create_project(f'Project {i}')
+            self.dradis.populate(pid, nodes=3, issues=i)
+            self.pids.append(pid)
+
+    def test_all_projects(self):
+        results = {item['pid']: item for item in self.client.fan_out('get_issue_list', max_workers=4, full=True)}
+        self.assertEqual(sorted(results), self.pids)
+        self.assertEqual({pid: len(item['result']) for pid, item in results.items()},
+                         {pid: len(self.dradis.data[pid]['issues']) for pid in self.pids})
+        self.assertEqual({item['error'] for item in results.values()}, {None})
+
+    def test_failed_project_listing(self):
+        self.server.fail_next(1, 503, match=r'GET /pro/api/projects$')
+        with self.assertRaises(DradisAPIError) as raised:
+            self.client.fan_out('get_issue_list')
+        self.assertEqual(raised.exception.status, 503)
+
+    def test_callable_and_duplicates(self):
+        results = list(self.client.fan_out(lambda pid: pid * 10, pids=[2, 3, 2]))
+        self.assertEqual(sorted(item['result'] for item in results), [20, 30])
+
+    def test_failures(self):
+        self.server.fail_next(1, 500, match=fr'GET .*/projects/{self.pids[1]}$')
+        results = {item['pid']: item for item in self.client.fan_out('get_project', pids=self.pids[:3])}
+        self.assertIsNone(results[self.pids[1]]['result'])
+        self.assertIn('500', results[self.pids[1]]['error'])
+        self.assertEqual(results[self.pids[2]]['result']['id'], self.pids[2])
+
+        def fail(pid):
+            raise ValueError(f'No project {pid}')
+
+        self.assertEqual([item['error'] for item in self.client.fan_out(fail, pids=[7])], ['No project 7'])
+
+    def test_timeout(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow(pid):
+            if pid == 2:
+                release.wait(5)
+            return pid
+
+        results = {item['pid']: item for item in self.client.fan_out(slow, pids=[1, 2, 3], timeout=0.2)}
+        self.assertEqual((results[1]['result'], results[3]['result']), (1, 3))
+        self.assertEqual(results[2]['error'], 'Timed out after 0.2 seconds.')
+        self.assertGreaterEqual(results[2]['seconds'], 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
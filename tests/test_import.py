@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import unittest
+
+from support import ROOT
+
+from dradis import _csrf_token
+
+# Modules that only the optional features need; "import dradis" must not load them.
+DEFERRED = ('dradis.aio', 'dradis.attachments', 'dradis.clone', 'dradis.snapshot', 'dradis.sync', 'dradis.upsert',
+            'dradis.writequeue', 'aiohttp', 'asyncio', 'concurrent.futures', 'gzip', 'html.parser', 'sqlite3')
+
+
+class ImportTest(unittest.TestCase):
+
+    def loaded(self, code: str) -> list:
+        probe = f'import sys\n{code}\nprint(",".join(name for name in {DEFERRED!r} if name in sys.modules))'
+        output = subprocess.run([sys.executable, '-c', probe], cwd=ROOT, check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        return [name for name in output.strip().split(',') if name]
+
+    def test_import_is_lean(self):
+        self.assertEqual(self.loaded('import dradis'), [])
+
+    def test_lazy_exports(self):
+        loaded = self.loaded('from dradis import ProjectSnapshot, WriteQueue\n'
+                             'assert ProjectSnapshot.__module__ == "dradis.snapshot"\n'
+                             'assert WriteQueue.__module__ == "dradis.writequeue"')
+        self.assertIn('dradis.snapshot', loaded)
+        self.assertIn('dradis.writequeue', loaded)
+        self.assertNotIn('dradis.aio', loaded)
+
+        import dradis
+        with self.assertRaises(AttributeError):
+            dradis.NoSuchName
+
+
+# Head of the Dradis Pro login page (Rails csrf_meta_tags), with a token that needs HTML escaping.
+LOGIN_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <meta name="viewport" content="width=device-width, initial-scale=1.0">
+  <title>Dradis Professional Edition</title>
+  <meta name="csrf-param" content="authenticity_token" />
+<meta name="csrf-token" content="Zm9v&#43;YmFy/K2x3Q==" />
+  <link rel="stylesheet" media="all" href="/assets/application-4f1c.css" />
+</head>
+<body class="login">
+  <form class="new_session" action="/pro/session" accept-charset="UTF-8" method="post">
+    <input name="utf8" type="hidden" value="&#x2713;" />
+    <input type="hidden" name="authenticity_token" value="form-token" />
+    <input type="text" name="login" id="login" /><input type="password" name="password" id="password" />
+  </form>
+</body>
+</html>
+"""
+
+
+class CsrfTokenTest(unittest.TestCase):
+
+    def test_login_page(self):
+        self.assertEqual(_csrf_token(LOGIN_PAGE), 'Zm9v+YmFy/K2x3Q==')
+
+    def test_attribute_order_and_case(self):
+        self.assertEqual(_csrf_token('<head><META content="abc" NAME="csrf-token"></head>'), 'abc')
+
+    def test_first_token_wins(self):
+        self.assertEqual(_csrf_token('<meta name="csrf-token" content="a"><meta name="csrf-token" content="b">'), 'a')
+
+    def test_missing_token(self):
+        self.assertIsNone(_csrf_token(LOGIN_PAGE.replace('name="csrf-token"', 'name="description"')))
+        self.assertIsNone(_csrf_token('<meta name="csrf-token">'))
+        self.assertIsNone(_csrf_token(''))
+
+
+if __name__ == '__main__':
+    unittest.main()
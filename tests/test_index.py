@@ -0,0 +1,46 @@
+import unittest
+
+from support import StubTestCase
+
+
+class NameIndexTest(StubTestCase):
+    populate_args = {'nodes': 50}
+
+    def requests(self, endpoint: str) -> int:
+        return self.dradis.counts[f'GET {endpoint}']
+
+    def test_lookups_share_one_listing(self):
+        for i in range(20):
+            self.assertEqual(self.client.find_node_by_label(1, f'node-{i}')['label'], f'node-{i}')
+        self.assertEqual(self.client.find_node_by_label(1, 'missing'), {})
+        self.assertEqual(self.client.resolve_nodes(1, ['node-3', 'missing']),
+                         {'node-3': self.client.find_node_by_label(1, 'node-3')['id'], 'missing': None})
+        self.assertEqual(len(self.client.find_nodes_by_prefix(1, 'NODE-1')), 11)  # node-1, node-10 ... node-19
+        self.assertEqual(self.requests('/pro/api/nodes'), 3)  # Two full pages of 25 and the empty third one
+
+    def test_teams_and_projects(self):
+        self.assertEqual(self.client.find_team_by_name('Stub Team')['id'], 1)
+        self.assertEqual(self.client.find_project_by_name('Stub Project')['id'], 1)
+        self.assertEqual(self.client.resolve_projects(['Stub Project', 'Other']), {'Stub Project': 1, 'Other': None})
+        self.assertEqual(self.client.find_team_by_name('Nope'), {})
+        self.assertEqual((self.requests('/pro/api/teams'), self.requests('/pro/api/projects')), (1, 1))
+
+    def test_writes_invalidate_the_index(self):
+        self.assertEqual(self.client.find_project_by_name('New Project'), {})
+        pid = self.client.create_project('New Project')
+        self.assertEqual(self.client.find_project_by_name('New Project')['id'], pid)
+
+        node_id = self.client.create_node(1, 'fresh node')
+        self.assertEqual(self.client.find_node_by_label(1, 'fresh node')['id'], node_id)
+        self.client.update_node(1, node_id, label='renamed node')
+        self.assertEqual(self.client.find_node_by_label(1, 'fresh node'), {})
+        self.assertEqual(self.client.find_node_by_label(1, 'renamed node')['id'], node_id)
+
+    def test_failed_listing_is_not_cached(self):
+        self.server.fail_next(1, 503, match=r'GET .*/nodes$')
+        self.assertEqual(self.client.find_node_by_label(1, 'node-1'), {})
+        self.assertEqual(self.client.find_node_by_label(1, 'node-1')['label'], 'node-1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import random
+import unittest
+
+from dradis.jsonstream import iter_array
+
+
+def split(data: bytes, sizes) -> list:
+    chunks, start = [], 0
+    for size in sizes:
+        chunks.append(data[start:start + size])
+        start += size
+    return chunks + [data[start:]] if start < len(data) else chunks
+
+
+class IterArrayTest(unittest.TestCase):
+
+    def test_number_split_across_chunks(self):
+        self.assertEqual(list(iter_array([b'[7.', b'5]'])), [7.5])
+        self.assertEqual(list(iter_array([b'[1e', b'10, 1e', b'10]'])), [1e10, 1e10])
+        self.assertEqual(list(iter_array([b'[-', b'1', b'2', b'0.', b'5e', b'-', b'3]'])), [-0.1205])
+        self.assertEqual(list(iter_array([b'[1', b'2 ', b',3', b']'])), [12, 3])
+
+    def test_literal_split_across_chunks(self):
+        self.assertEqual(list(iter_array([b'[tr', b'ue,nu', b'll,f', b'alse]'])), [True, None, False])
+
+    def test_multibyte_character_split_across_chunks(self):
+        data = json.dumps(['é€\U0001f600'], ensure_ascii=False).encode()
+        self.assertEqual(list(iter_array([data[i:i + 1] for i in range(len(data))])), ['é€\U0001f600'])
+
+    def test_fields(self):
+        data = json.dumps([{'id': 1, 'title': 'a', 'text': 'x'}, 2]).encode()
+        self.assertEqual(list(iter_array(split(data, [5, 5]), fields=('id', 'title'))),
+                         [{'id': 1, 'title': 'a'}, 2])
+
+    def test_random_chunk_boundaries(self):
+        rnd = random.Random(0)
+        values = [0, -7, 10 ** 12, 7.5, -0.25, 1e-10, 6.02e23, True, False, None, '', 'x"y\\z', 'é€',
+                  {}, [], {'a': [1.5, {'b': None}], 'c': 'd'}, [[1e5], [-2.5e-3]]]
+        for _ in range(2000):
+            items = [rnd.choice(values) for _ in range(rnd.randint(0, 12))]
+            data = json.dumps(items, ensure_ascii=rnd.random() < 0.5, indent=rnd.choice([None, 1])).encode()
+            chunks = split(data, [rnd.randint(1, 6) for _ in range(len(data))])
+            self.assertEqual(list(iter_array(chunks)), items, chunks)
+
+    def test_invalid_bodies(self):
+        for chunks in ([], [b''], [b'  '], [b'{}'], [b'[1,'], [b'[1.'], [b'[1', b'2'], [b'["a']):
+            with self.assertRaises(ValueError, msg=chunks):
+                list(iter_array(chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
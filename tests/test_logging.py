@@ -0,0 +1,45 @@
+import contextlib
+import io
+import logging
+import unittest
+
+from support import StubTestCase
+
+from dradis import DradisClient
+
+
+class LoggingTest(StubTestCase):
+    populate_args = {'nodes': 30, 'field_size': 1000}
+
+    def setUp(self):
+        super().setUp()
+        logging.disable(logging.NOTSET)
+        self.logger = logging.getLogger('PyDradis3ng')
+        self.addCleanup(self.logger.setLevel, self.logger.level)
+
+    def test_quiet_without_debug(self):
+        self.logger.setLevel(logging.INFO)
+        records = []
+        handler = logging.Handler(logging.DEBUG)
+        handler.emit = records.append
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            self.assertEqual(len(self.client.get_node_list(1)), 30)
+        self.assertEqual((records, stdout.getvalue()), ([], ''))
+
+    def test_debug_log_truncates_bodies(self):
+        client = self.client_with(debug=True, log_body_limit=100)
+        with self.assertLogs('PyDradis3ng', logging.DEBUG) as logs:
+            client.get_node_list(1)
+        self.assertEqual(len(logs.records), 1)
+        self.assertRegex(logs.output[0], r"GET 200\n---\nb'.{100}\.\.\. \(\d+ bytes\)'$")
+
+    def test_one_handler_for_all_clients(self):
+        for _ in range(3):
+            DradisClient('token', self.server.url).close()
+        self.assertEqual(sum(getattr(handler, '_dradis_handler', False) for handler in self.logger.handlers), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from dradis import markup
+
+
+class MarkupTest(unittest.TestCase):
+    fields = {'Title': 'Weak TLS', 'Rating': 'High', 'Description': 'Line one\r\n\r\nLine two'}
+
+    def test_dumps(self):
+        self.assertEqual(markup.dumps({'Title': 'A', 'Rating': 'Low'}, tags=['en', 'web']),
+                         '#[Title]#\r\nA\r\n\r\n#[Rating]#\r\nLow\r\n\r\n#[Tags]#\r\nen,web')
+        self.assertEqual(markup.dumps([('B', 2), ('A', 1)]), '#[B]#\r\n2\r\n\r\n#[A]#\r\n1\r\n\r\n')
+        self.assertEqual(markup.dumps({'A': 1}, tags=[]), '#[A]#\r\n1\r\n\r\n')
+
+    def test_round_trip(self):
+        self.assertEqual(markup.loads(markup.dumps(self.fields, tags=['en'])), dict(self.fields, Tags='en'))
+        self.assertEqual(dict(markup.loads(markup.dumps(self.fields), lazy=True)), self.fields)
+
+    def test_header_lines_in_values_are_rejected(self):
+        fields = {'Output': 'see #[Rating]# above\r\n #[Rating]#'}
+        self.assertEqual(markup.loads(markup.dumps(fields)), fields)
+        for value in ('#[Rating]#\r\nHigh', 'Line one\n#[Rating]#'):
+            with self.assertRaises(ValueError):
+                markup.dumps({'Output': value})
+
+    def test_loads(self):
+        text = 'preamble\n#[Rating]#\nLow\n#[Rating]#  \nHigh\n\n#[Output]#\nsee #[Rating]# above\n#[Empty]#'
+        self.assertEqual(markup.loads(text), {'Rating': 'High', 'Output': 'see #[Rating]# above', 'Empty': ''})
+        self.assertEqual(markup.loads(''), {})
+        self.assertEqual(markup.loads(None), {})
+
+    def test_lazy_fields(self):
+        fields = markup.loads(markup.dumps(self.fields), lazy=True)
+        self.assertIsNone(fields._spans)
+        self.assertEqual(fields['Rating'], 'High')
+        self.assertEqual(list(fields._values), ['Rating'])
+        self.assertEqual((len(fields), list(fields)), (3, list(self.fields)))
+        self.assertNotIn('Tags', fields)
+        with self.assertRaises(KeyError):
+            fields['Tags']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis import Instrumentation
+from dradis.metrics import LatencyHistogram, RequestMetrics, endpoint_template
+
+
+def sample(total: float, status_code=200) -> RequestMetrics:
+    return RequestMetrics('GET', 'http://dradis/pro/api/nodes/1', '/pro/api/nodes/{id}', status_code, total / 2,
+                          total, 0, 100)
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_endpoint_template(self):
+        self.assertEqual(endpoint_template('/pro/api/nodes/5/evidence/7?page=2'), '/pro/api/nodes/{id}/evidence/{id}')
+        self.assertEqual(endpoint_template('/pro/api/document_properties/dradis.client'),
+                         '/pro/api/document_properties/{name}')
+        self.assertEqual(endpoint_template('/pro/projects/1/nodes/2/attachments/scan 1.png'),
+                         '/pro/projects/{id}/nodes/{id}/attachments/{name}')
+
+    def test_quantiles(self):
+        histogram = LatencyHistogram(sample_size=100)
+        for i in range(1, 201):
+            histogram(sample(i / 1000, 500 if i % 50 == 0 else 200))
+        stats = histogram.to_dict()['GET /pro/api/nodes/{id}']
+        self.assertEqual((stats['count'], stats['errors'], stats['response_bytes']), (200, 4, 20000))
+        self.assertAlmostEqual(stats['sum'], 20.1)
+        self.assertEqual((stats['p50'], stats['p99']), (0.151, 0.199))  # Only the latest 100 samples are kept
+
+        text = histogram.to_prometheus()
+        self.assertIn('dradis_client_request_seconds_count{method="GET",endpoint="/pro/api/nodes/{id}"} 200', text)
+        self.assertIn('dradis_client_request_errors_total{method="GET",endpoint="/pro/api/nodes/{id}"} 4', text)
+        for metric in ('request_seconds', 'request_errors_total'):
+            self.assertIn(f'# HELP dradis_client_{metric} ', text)
+            self.assertIn(f'# TYPE dradis_client_{metric} ', text)
+
+    def test_failing_hook_does_not_stop_the_others(self):
+        instrumentation = Instrumentation()
+        received = []
+        instrumentation.add_hook(lambda metrics: 1 / 0)
+        instrumentation.add_hook(received.append)
+        with self.assertLogs('PyDradis3ng', 'WARNING'):
+            instrumentation.emit(sample(0.1))
+        self.assertEqual(len(received), 1)
+        self.assertEqual(instrumentation.histogram.to_dict()['GET /pro/api/nodes/{id}']['count'], 1)
+
+
+class ClientMetricsTest(StubTestCase):
+    populate_args = {'nodes': 3}
+
+    def test_every_request_is_measured(self):
+        instrumentation = Instrumentation()
+        metrics = []
+        instrumentation.add_hook(metrics.append)
+        client = self.client_with(instrumentation=instrumentation)
+
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        client.get_node(1, node_id)
+        client.update_node(1, node_id, label='renamed')
+        self.server.fail_next(1, 404, match='GET')
+        client.get_node(1, node_id)
+
+        self.assertEqual([(metric.method, metric.endpoint, metric.status_code) for metric in metrics],
+                         [('GET', '/pro/api/nodes/{id}', 200), ('PUT', '/pro/api/nodes/{id}', 200),
+                          ('GET', '/pro/api/nodes/{id}', 404)])
+        self.assertIsNotNone(metrics[0].connect)
+        self.assertIsNone(metrics[1].connect)
+        self.assertTrue(all(0 < metric.ttfb <= metric.total for metric in metrics))
+        self.assertGreater(metrics[1].request_bytes, 0)
+        self.assertEqual(instrumentation.histogram.to_dict()['GET /pro/api/nodes/{id}']['errors'], 1)
+
+    def test_streamed_pages_are_measured_once_read(self):
+        metrics = []
+        client = self.client_with(metrics=metrics)
+        sent = self.server.traffic['bytes_out']
+        self.assertEqual(len(list(client.iter_nodes(1, stream=True))), 3)
+        self.assertEqual({metric.endpoint for metric in metrics}, {'/pro/api/nodes'})
+        self.assertEqual(sum(metric.response_bytes for metric in metrics), self.server.traffic['bytes_out'] - sent)
+        self.assertGreater(metrics[0].response_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis import DradisAPIError
+
+
+class IterPagesTest(StubTestCase):
+    populate_args = {'nodes': 60}
+
+    def test_complete_listing(self):
+        for options in ({}, {'prefetch': True}, {'stream': True}):
+            self.assertEqual(len(list(self.client.iter_nodes(1, **options))), 60, options)
+
+    def test_failed_page_raises(self):
+        for options in ({}, {'prefetch': True}, {'stream': True}):
+            for page in (1, 2):
+                nodes = self.client.iter_nodes(1, **options)
+                received = [next(nodes) for _ in range(25 * (page - 1))]
+                self.server.fail_next(1, 503, match=r'GET .*/nodes$')
+                with self.assertRaises(DradisAPIError, msg=(options, page)) as raised:
+                    received.extend(nodes)
+                self.assertEqual(raised.exception.status, 503)
+                self.assertLess(len(received), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
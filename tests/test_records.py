@@ -0,0 +1,62 @@
+import copy
+import pickle
+import unittest
+
+from support import StubTestCase
+
+from dradis import markup, records
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_record(self):
+        raw = {'id': 3, 'label': 'host', 'parent_id': None}
+        node = records.Node(raw)
+        self.assertEqual((node.id, node['label'], node.parent_id), (3, 'host', None))
+        self.assertEqual((dict(node), len(node), repr(node)), (raw, 3, "Node(id=3, label='host')"))
+        self.assertIs(node.raw, raw)
+        self.assertIsNot(node.to_dict(), raw)
+        with self.assertRaises(AttributeError):
+            node.position
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
+    def test_issue_fields(self):
+        self.assertEqual(records.Issue({'fields': {'Rating': 'Low'}}).fields, {'Rating': 'Low'})
+        issue = records.Issue({'id': 1, 'title': 'A', 'text': markup.dumps({'Title': 'A', 'Rating': 'High'})})
+        self.assertEqual(issue.fields['Rating'], 'High')
+        self.assertIs(issue.fields, issue.fields)
+
+    def test_copy_and_pickle(self):
+        issue = records.Issue({'id': 1, 'title': 'A', 'text': markup.dumps({'Title': 'A', 'Rating': 'High'})})
+        issue.fields['Rating']
+        for clone in (copy.copy(issue), copy.deepcopy(issue), pickle.loads(pickle.dumps(issue))):
+            self.assertIsInstance(clone, records.Issue)
+            self.assertEqual((clone.raw, clone.title, clone.fields['Rating']), (issue.raw, 'A', 'High'))
+        self.assertIs(copy.copy(issue).raw, issue.raw)
+        self.assertIsNot(copy.deepcopy(issue).raw, issue.raw)
+        with self.assertRaises(AttributeError):
+            issue.__missing__
+
+
+class FullListTest(StubTestCase):
+    populate_args = {'nodes': 5, 'issues': 3}
+
+    def test_full_records(self):
+        nodes = self.client.get_node_list(1, full=True)
+        self.assertEqual({node.id: node.parent_id for node in nodes},
+                         {node_id: node['parent_id'] for node_id, node in self.dradis.data[1]['nodes'].items()})
+        self.assertEqual(len(nodes[0].evidence), 3)  # Embedded in the listing
+        self.assertEqual([[[node.label, node.id]] for node in nodes], self.client.get_node_list(1))
+
+        issues = self.client.get_issue_list(1, full=True)
+        self.assertEqual([[[issue.title, issue.id]] for issue in issues], self.client.get_issue_list(1))
+        self.assertEqual({issue.fields['Rating'] for issue in issues}, {'High'})
+
+        self.assertEqual([team.name for team in self.client.get_teams_list(full=True)], ['Stub Team'])
+        self.assertEqual([project.id for project in self.client.get_project_list(full=True)], [1])
+        self.assertEqual(len(self.client.get_users_list(full=True)), len(self.client.get_users_list()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import time
+import unittest
+from email.utils import formatdate
+from types import SimpleNamespace
+
+from support import StubTestCase
+
+from dradis import RetryPolicy, TokenBucket
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def retry_after(self, value, **policy):
+        return RetryPolicy(**policy).retry_after(SimpleNamespace(headers={'Retry-After': value} if value else {}))
+
+    def test_retry_after(self):
+        self.assertIsNone(self.retry_after(None))
+        self.assertIsNone(self.retry_after('soon'))
+        self.assertEqual(self.retry_after('2'), 2.0)
+        self.assertEqual(self.retry_after('-5'), 0.0)
+        self.assertAlmostEqual(self.retry_after(formatdate(usegmt=True)), 0.0, delta=1.0)
+
+    def test_retry_after_is_not_capped(self):
+        self.assertEqual(self.retry_after('120', max_backoff=30), 120.0)
+
+    def test_post_needs_retry_post(self):
+        self.assertTrue(RetryPolicy().is_retryable('put'))
+        self.assertFalse(RetryPolicy().is_retryable('POST'))
+        self.assertTrue(RetryPolicy(retry_post=True).is_retryable('POST'))
+
+
+class ClientRetryTest(StubTestCase):
+    populate_args = {'nodes': 1, 'issues': 1}
+
+    def requests(self, endpoint: str) -> int:
+        return self.dradis.counts[endpoint]
+
+    def test_server_errors_are_retried(self):
+        client = self.client_with(retry=RetryPolicy(max_retries=2, backoff_factor=0.01))
+        self.server.fail_next(2, 503, match='GET')
+        self.assertEqual(client.get_project(1)['id'], 1)
+        self.assertEqual(self.requests('GET /pro/api/projects/{id}'), 3)
+
+        self.server.fail_next(3, 500, match='GET')
+        self.assertEqual(client.get_project(1), {})
+        self.assertEqual(client.pop_last_failure().status, 500)
+        self.assertEqual(self.requests('GET /pro/api/projects/{id}'), 6)
+
+    def test_client_errors_and_posts_are_not_retried(self):
+        client = self.client_with(retry=RetryPolicy(backoff_factor=0.01))
+        self.server.fail_next(1, 404, match='GET')
+        self.assertEqual(client.get_project(1), {})
+        self.assertEqual(self.requests('GET /pro/api/projects/{id}'), 1)
+
+        self.server.fail_next(1, 503, match='POST')
+        self.assertEqual(client.create_issue(1, 'Issue', {'Rating': 'Low'}), -1)
+        self.assertEqual(self.requests('POST /pro/api/issues'), 1)
+
+    def test_rate_limit(self):
+        client = self.client_with(rate_limit=TokenBucket(rate=20, capacity=1))
+        started = time.monotonic()
+        for _ in range(11):
+            client.get_project(1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.45)  # The first token is there, 10 more at 20/s
+
+
+if __name__ == '__main__':
+    unittest.main()
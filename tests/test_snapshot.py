@@ -0,0 +1,63 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis import DradisAPIError
+from dradis.snapshot import ProjectSnapshot
+
+
+class SnapshotTest(StubTestCase):
+    server_args = {'embed_children': False}
+    populate_args = {'nodes': 30, 'evidence_per_node': 2, 'notes_per_node': 1, 'content_blocks': 3}
+
+    def setUp(self):
+        super().setUp()
+        self.snapshot = self.client.snapshot_project(1, self.path('snapshot.db'))
+        self.addCleanup(self.snapshot.close)
+        self.counts = self.snapshot.counts()
+        self.assertEqual(self.counts['nodes'], 30)
+        self.assertEqual(self.counts['evidence'], 60)
+
+    def test_failed_dump_keeps_rows(self):
+        for match in (r'GET .*/nodes$', r'GET .*/nodes/\d+/evidence$', r'GET .*/nodes/\d+/attachments$',
+                      r'GET .*/content_blocks$', r'GET .*/document_properties$'):
+            self.server.fail_next(1, 503, match=match)
+            with self.assertRaises(DradisAPIError, msg=match):
+                self.snapshot.dump(self.client, 1)
+            self.assertEqual(self.snapshot.counts(), self.counts, match)
+
+    def test_failed_refresh_keeps_rows(self):
+        node = next(iter(self.dradis.data[1]['nodes'].values()))
+        label = node['label']
+        self.dradis.update_node(node, {'label': 'renamed'})
+        self.server.fail_next(1, 503, match=fr'GET .*/nodes/{node["id"]}/attachments$')
+        with self.assertRaises(DradisAPIError):
+            self.snapshot.refresh(self.client)
+        self.assertEqual(self.snapshot.counts(), self.counts)
+        self.assertEqual(self.snapshot.query('SELECT label FROM nodes WHERE id = ?', (node['id'],)),
+                         [{'label': label}])
+
+        self.snapshot.refresh(self.client)
+        self.assertEqual(self.snapshot.query('SELECT label FROM nodes WHERE id = ?', (node['id'],)),
+                         [{'label': 'renamed'}])
+
+    def test_failed_children_are_refetched(self):
+        node = next(iter(self.dradis.data[1]['nodes'].values()))
+        self.dradis.update_node(node, {'label': 'renamed'})
+        self.server.fail_next(1, 503, match=fr'GET .*/nodes/{node["id"]}/notes$')
+        report = self.snapshot.refresh(self.client)
+        self.assertEqual(report['failed'], [node['id']])
+        self.assertEqual(self.snapshot.counts(), self.counts)
+
+        report = self.snapshot.refresh(self.client)
+        self.assertEqual(report['failed'], [])
+        self.assertEqual(self.snapshot.counts(), self.counts)
+
+    def test_reopen(self):
+        reopened = ProjectSnapshot(self.path('snapshot.db'))
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.counts(), self.counts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis import DradisAPIError
+
+
+def counts(report: dict) -> dict:
+    return {resource: (len(report[resource]['created']), len(report[resource]['deleted']),
+                       report[resource]['unchanged'])
+            for resource in ('nodes', 'evidence', 'notes')}
+
+
+class EmbeddedChildrenSyncTest(StubTestCase):
+    # The node list embeds evidence and notes, as Dradis does.
+    populate_args = {'nodes': 30, 'evidence_per_node': 2, 'notes_per_node': 1}
+
+    def setUp(self):
+        super().setUp()
+        self.manifest = self.path('manifest.json')
+        report = self.client.sync_project(1, self.manifest)
+        self.assertEqual(counts(report), {'nodes': (30, 0, 0), 'evidence': (60, 0, 0), 'notes': (30, 0, 0)})
+
+    def test_edited_note_is_synced_through_its_node(self):
+        node_id, note_id = next((node_id, note_id) for node_id, children in self.dradis.data[1]['children'].items()
+                                for note_id in children['notes'])
+        self.assertEqual(self.client.update_note(1, node_id, note_id, {'Title': 'Edited'}), note_id)
+        report = self.client.sync_project(1, self.manifest)
+        self.assertEqual(report['nodes']['updated'], [node_id])  # Dradis touches the node of a changed note
+        self.assertEqual(report['notes']['updated'], [note_id])
+        self.assertEqual(report['records']['notes'][note_id]['title'], 'Edited')
+        self.assertEqual(counts(report), {'nodes': (0, 0, 29), 'evidence': (0, 0, 60), 'notes': (0, 0, 29)})
+
+
+class SyncTest(EmbeddedChildrenSyncTest):
+    # Evidence and notes are listed per node, only for new or changed nodes.
+    server_args = {'embed_children': False}
+
+    def test_failed_node_listing_keeps_manifest(self):
+        with open(self.manifest) as file:
+            before = file.read()
+        self.server.fail_next(1, 503, match=r'GET .*/nodes$')
+        with self.assertRaises(DradisAPIError):
+            self.client.sync_project(1, self.manifest)
+        with open(self.manifest) as file:
+            self.assertEqual(file.read(), before)
+        self.assertEqual(counts(self.client.sync_project(1, self.manifest)),
+                         {'nodes': (0, 0, 30), 'evidence': (0, 0, 60), 'notes': (0, 0, 30)})
+
+    def test_failed_child_listing_is_retried(self):
+        node = next(iter(self.dradis.data[1]['nodes'].values()))
+        self.dradis.update_node(node, {'label': 'renamed'})
+        self.server.fail_next(1, 503, match=fr'GET .*/nodes/{node["id"]}/notes$')
+
+        report = self.client.sync_project(1, self.manifest)
+        self.assertEqual(report['failed'], [node['id']])
+        self.assertEqual(report['notes']['deleted'], [])
+
+        report = self.client.sync_project(1, self.manifest)
+        self.assertEqual(report['failed'], [])
+        self.assertEqual(counts(report), {'nodes': (0, 0, 30), 'evidence': (0, 0, 60), 'notes': (0, 0, 30)})
+
+
+if __name__ == '__main__':
+    unittest.main()
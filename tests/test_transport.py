@@ -0,0 +1,57 @@
+import threading
+import unittest
+
+from support import StubTestCase
+
+
+class PooledTransportTest(StubTestCase):
+    populate_args = {'nodes': 10}
+
+    @staticmethod
+    def connections(metrics: list) -> int:
+        return sum(metric.connect is not None for metric in metrics)  # Only set when a new connection was opened
+
+    def test_sequential_calls_reuse_one_connection(self):
+        metrics = []
+        client = self.client_with(metrics=metrics)
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        for _ in range(20):
+            self.assertEqual(client.get_node(1, node_id)['id'], node_id)
+        client.create_issue(1, 'Issue', {'Rating': 'Low'})
+        self.assertEqual(len(metrics), 21)
+        self.assertEqual(self.connections(metrics), 1)
+
+    def test_threads_share_the_pool(self):
+        metrics = []
+        client = self.client_with(metrics=metrics, pool_maxsize=4)
+        expected = self.client.get_node_list(1)
+        results, errors = [], []
+
+        def work():
+            try:
+                for _ in range(10):
+                    results.append(client.get_node_list(1))
+            except Exception as err:  # Reported by the main thread
+                errors.append(err)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [expected] * 40)
+        self.assertLessEqual(self.connections(metrics), 4)
+
+    def test_close(self):
+        metrics = []
+        client = self.client_with(metrics=metrics)
+        with client:
+            client.get_project(1)
+        self.assertEqual(client.get_project(1)['id'], 1)  # A closed session opens a new connection on demand
+        self.assertEqual(self.connections(metrics), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
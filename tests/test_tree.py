@@ -0,0 +1,63 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis.tree import NodeTree
+
+
+def node(node_id: int, label: str, parent_id=None, position=0) -> dict:
+    return {'id': node_id, 'label': label, 'parent_id': parent_id, 'type_id': 1, 'position': position}
+
+
+class NodeTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = NodeTree([node(5, '443/tcp', 2, 1), node(1, '10.0.0.0/24'), node(2, '10.0.0.5', 1, 1),
+                              node(3, '10.0.0.6', 1, 0), node(4, '80/tcp', 2, 0), node(6, '80/tcp', 3),
+                              node(7, 'orphan', 99), node(8, 'a', 9), node(9, 'b', 8)])
+
+    def labels(self, nodes: list) -> list:
+        return [item['label'] for item in nodes]
+
+    def test_hierarchy(self):
+        self.assertEqual((len(self.tree), 2 in self.tree, 99 in self.tree), (9, True, False))
+        self.assertEqual(self.tree.get(5), node(5, '443/tcp', 2, 1))
+        self.assertEqual(self.tree.get(7)['parent_id'], None)  # The parent is not part of the listing
+        self.assertEqual(self.labels(self.tree.roots()), ['10.0.0.0/24', 'orphan'])
+        self.assertEqual(self.labels(self.tree.children(1)), ['10.0.0.6', '10.0.0.5'])
+        self.assertEqual(self.tree.parent(4)['id'], 2)
+        self.assertIsNone(self.tree.parent(1))
+        self.assertEqual(self.tree.children(99), [])
+
+    def test_subtree(self):
+        self.assertEqual(self.tree.subtree_ids(1), [1, 3, 6, 2, 4, 5])
+        self.assertEqual(self.labels(self.tree.iter_subtree(2, include_root=False)), ['80/tcp', '443/tcp'])
+        self.assertEqual(self.tree.subtree_ids(8), [8, 9])  # Cycles end instead of looping
+        self.assertEqual(self.tree.subtree_ids(99), [])
+
+    def test_labels_and_paths(self):
+        self.assertEqual([item['id'] for item in self.tree.find_by_label('80/tcp')], [4, 6])
+        self.assertEqual(self.tree.find_by_label('missing'), [])
+        self.assertEqual(self.tree.path(5), '10.0.0.0/24 > 10.0.0.5 > 443/tcp')
+        self.assertEqual(self.tree.path(9), 'a > b')
+        self.assertEqual(self.tree.find_by_path('10.0.0.0/24>10.0.0.6 > 80/tcp')['id'], 6)
+        self.assertIsNone(self.tree.find_by_path('10.0.0.0/24 > 10.0.0.7'))
+
+
+class NodeTreeClientTest(StubTestCase):
+    populate_args = {'nodes': 60}
+
+    def test_get_node_tree(self):
+        tree = self.client.get_node_tree(1)
+        self.assertEqual(len(tree), 60)
+        self.assertEqual(self.dradis.counts['GET /pro/api/nodes'], 3)  # The third page is short and ends the listing
+        for node_id, record in self.dradis.data[1]['nodes'].items():
+            self.assertEqual(tree.get(node_id)['parent_id'], record['parent_id'])
+        root = tree.roots()[0]
+        self.assertEqual(sum(len(tree.subtree_ids(item['id'])) for item in tree.roots()), 60)
+        child = tree.children(root['id'])[0]
+        self.assertEqual(tree.find_by_path(tree.path(child['id'])), child)
+
+
+if __name__ == '__main__':
+    unittest.main()
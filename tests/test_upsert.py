@@ -0,0 +1,64 @@
+import unittest
+
+from support import StubTestCase
+
+
+class UpsertTest(StubTestCase):
+    populate_args = {'nodes': 3, 'issues': 0}
+
+    def setUp(self):
+        super().setUp()
+        self.specs = [{'title': f'Issue {i}', 'issue_properties': {'Rating': 'Low'}} for i in range(5)]
+
+    def actions(self, results: list) -> list:
+        return [result['action'] for result in results]
+
+    def test_issues(self):
+        self.assertEqual(self.actions(self.client.upsert_issues(1, self.specs)), ['created'] * 5)
+        self.assertEqual(self.actions(self.client.upsert_issues(1, self.specs)), ['unchanged'] * 5)
+        self.specs[0]['issue_properties']['Rating'] = 'High'
+        self.assertEqual(self.actions(self.client.upsert_issues(1, self.specs)), ['updated'] + ['unchanged'] * 4)
+
+    def test_missing_key_field_is_not_collapsed(self):
+        for spec in self.specs[:3]:
+            spec['issue_properties']['Plugin ID'] = spec['title']
+        results = self.client.upsert_issues(1, self.specs, key='Plugin ID')
+        self.assertEqual(self.actions(results), ['created'] * 3 + ['failed'] * 2)
+        self.assertIn('key field', results[3]['error'])
+        self.assertEqual(len(self.dradis.data[1]['issues']), 3)
+
+    def test_failed_issue_listing_creates_nothing(self):
+        self.client.upsert_issues(1, self.specs)
+        self.server.fail_next(1, 503, match=r'GET .*/issues$')
+        results = self.client.upsert_issues(1, self.specs)
+        self.assertEqual(self.actions(results), ['failed'] * 5)
+        self.assertIn('503', results[0]['error'])
+        self.assertEqual(len(self.dradis.data[1]['issues']), 5)
+        self.assertEqual(self.actions(self.client.upsert_issues(1, self.specs)), ['unchanged'] * 5)
+
+    def test_failed_evidence_listing_fails_its_node_only(self):
+        issue_id = self.client.upsert_issues(1, self.specs[:1])[0]['id']
+        nodes = list(self.dradis.data[1]['nodes'])
+        evidence = [{'node_id': node_id, 'issue_id': issue_id, 'evidence_properties': {'Port': '80/tcp'}}
+                    for node_id in nodes]
+        self.server.fail_next(1, 503, match=fr'GET .*/nodes/{nodes[0]}/evidence$')
+        results = self.client.upsert_evidence(1, evidence)
+        self.assertEqual(self.actions(results), ['failed', 'created', 'created'])
+        self.assertIn('503', results[0]['error'])
+
+        self.assertEqual(self.actions(self.client.upsert_evidence(1, evidence)), ['created', 'unchanged', 'unchanged'])
+
+    def test_evidence_without_the_key_field_is_not_collapsed(self):
+        issue_id = self.client.upsert_issues(1, self.specs[:1])[0]['id']
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        evidence = [{'node_id': node_id, 'issue_id': issue_id, 'evidence_properties': {'Port': '80/tcp'}},
+                    {'node_id': node_id, 'issue_id': issue_id, 'evidence_properties': {'Output': 'first'}},
+                    {'node_id': node_id, 'issue_id': issue_id, 'evidence_properties': {'Output': 'second'}}]
+        results = self.client.upsert_evidence(1, evidence, key='Port')
+        self.assertEqual(self.actions(results), ['created', 'failed', 'failed'])
+        self.assertIn('key field', results[1]['error'])
+        self.assertEqual(len(self.dradis.data[1]['evidence']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from support import StubTestCase
+
+from dradis import ResponseCache, ValidatorStore
+
+
+class EvictingValidatorStore(ValidatorStore):
+    """
+    Loses every entry between sending the conditional request and reading the 304, as concurrent GETs filling a
+    small store would.
+    """
+
+    def not_modified(self, key):
+        self.clear()
+        return super().not_modified(key)
+
+
+class ConditionalRequestTest(StubTestCase):
+    populate_args = {'nodes': 3}
+
+    def test_revalidation(self):
+        client = self.client_with(validators=ValidatorStore())
+        project = client.get_project(1)
+        self.assertEqual(client.get_project(1), project)
+        self.assertEqual(client.get_project(1), project)
+        stats = client.validators.stats()
+        self.assertEqual((stats['revalidated'], stats['modified'], stats['hit_ratio']), (2, 0, 1.0))
+        self.assertGreater(stats['bytes_saved'], 0)
+
+        client.update_project(1, 'Renamed')
+        self.assertEqual(client.get_project(1)['name'], 'Renamed')
+        self.assertEqual(client.validators.stats()['modified'], 1)
+
+    def test_changes_by_other_clients_are_seen(self):
+        client = self.client_with(validators=ValidatorStore())
+        node_id = next(iter(self.dradis.data[1]['nodes']))
+        client.get_node(1, node_id)
+        self.client.update_node(1, node_id, label='changed elsewhere')
+        self.assertEqual(client.get_node(1, node_id)['label'], 'changed elsewhere')
+
+    def test_evicted_entry_is_refetched_without_counting(self):
+        client = self.client_with(validators=EvictingValidatorStore())
+        project = client.get_project(1)
+        self.assertEqual(client.get_project(1), project)
+        stats = client.validators.stats()
+        self.assertEqual((stats['revalidated'], stats['modified'], stats['size']), (0, 0, 1))
+
+    def test_combined_with_cache(self):
+        client = self.client_with(validators=ValidatorStore(), cache=ResponseCache(ttl=0))
+        client.get_project(1)
+        client.get_project(1)
+        self.assertEqual(client.validators.stats()['revalidated'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import threading
+import unittest
+
+from support import StubTestCase
+
+from dradis import RetryPolicy
+from dradis.writequeue import WriteQueue
+
+
+class WriteQueueTest(StubTestCase):
+    populate_args = {'nodes': 1, 'issues': 1, 'evidence_per_node': 0, 'notes_per_node': 0}
+
+    def setUp(self):
+        super().setUp()
+        self.node_id = next(iter(self.dradis.data[1]['nodes']))
+        self.note_id = self.client.create_note(1, self.node_id, {'Title': 'Note'})
+
+    def queue(self, **options) -> WriteQueue:
+        queue = WriteQueue(self.client, **options)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_creates_are_sent_in_the_background(self):
+        queue = self.queue(batch_size=10, flush_interval=60)
+        futures = [queue.create_note(1, self.node_id, {'Title': f'Note {i}'}) for i in range(25)]
+        for future in futures[:20]:
+            self.assertNotEqual(future.result(10), -1)  # Two full batches are sent without waiting for the interval
+        self.assertTrue(queue.flush(10))
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(len({future.result() for future in futures}), 25)
+        self.assertEqual(len(self.dradis.data[1]['notes']), 26)
+        self.assertEqual(queue.stats, {'submitted': 25, 'sent': 25, 'succeeded': 25})
+
+    def test_flush_interval(self):
+        queue = self.queue(flush_interval=0.1)
+        future = queue.create_node(1, 'late')
+        self.assertFalse(future.done())
+        self.assertNotEqual(future.result(5), -1)
+
+    def test_updates_of_one_resource_are_coalesced(self):
+        queue = self.queue(flush_interval=60)
+        futures = [queue.update_note(1, self.node_id, self.note_id, {'Title': f'Version {i}'}) for i in range(5)]
+        queue.flush(10)
+        self.assertEqual({future.result() for future in futures}, {self.note_id})
+        self.assertEqual(self.dradis.data[1]['notes'][self.note_id]['title'], 'Version 4')
+        self.assertEqual(self.dradis.counts['PUT /pro/api/nodes/{id}/notes/{id}'], 1)
+        self.assertEqual((queue.stats['coalesced'], queue.stats['succeeded']), (4, 5))
+
+    def test_max_pending_blocks_submitters(self):
+        queue = self.queue(flush_interval=0.2, max_pending=2)
+        queue.create_node(1, 'one')
+        queue.create_node(1, 'two')
+        submitted = threading.Event()
+        threading.Thread(target=lambda: (queue.create_node(1, 'three'), submitted.set()), daemon=True).start()
+        self.assertFalse(submitted.wait(0.05))
+        self.assertTrue(submitted.wait(5))
+
+    def test_close(self):
+        queue = self.queue(flush_interval=60)
+        future = queue.create_node(1, 'last')
+        queue.close()
+        self.assertNotEqual(future.result(0), -1)
+        with self.assertRaises(RuntimeError):
+            queue.create_node(1, 'too late')
+
+    def test_client_queue_is_flushed_on_close(self):
+        queue = self.client.write_queue(flush_interval=60)
+        self.assertIs(self.client.write_queue(), queue)
+        future = queue.create_note(1, self.node_id, {'Title': 'On close'})
+        self.client.close()
+        self.assertNotEqual(future.result(0), -1)
+
+
+class WriteQueueRetryTest(StubTestCase):
+    populate_args = {'nodes': 1, 'issues': 0}
+
+    def setUp(self):
+        super().setUp()
+        self.node_id = next(iter(self.dradis.data[1]['nodes']))
+        self.note_id = self.client.create_note(1, self.node_id, {'Title': 'Note'})
+
+    def send(self, method: str, *args, retry_post=False, **kwargs):
+        with WriteQueue(self.client, retry=RetryPolicy(max_retries=2, backoff_factor=0.01,
+                                                       retry_post=retry_post)) as queue:
+            future = getattr(queue, method)(*args, **kwargs)
+            queue.flush(10)
+            return future.result(), queue.stats
+
+    def test_client_errors_are_not_retried(self):
+        self.server.fail_next(1, 404, match='PUT')
+        result, stats = self.send('update_note', 1, self.node_id, self.note_id, {'Title': 'Changed'})
+        self.assertEqual(result, -1)
+        self.assertEqual((stats['sent'], stats.get('retried', 0)), (1, 0))
+
+    def test_updates_are_retried(self):
+        self.server.fail_next(1, 503, match='PUT')
+        result, stats = self.send('update_note', 1, self.node_id, self.note_id, {'Title': 'Changed'})
+        self.assertNotEqual(result, -1)
+        self.assertEqual((stats['sent'], stats['retried']), (2, 1))
+
+    def test_creates_are_retried_with_retry_post_only(self):
+        self.server.fail_next(1, 503, match='POST')
+        result, stats = self.send('create_node', 1, 'new')
+        self.assertEqual(result, -1)
+        self.assertEqual((stats['sent'], stats.get('retried', 0)), (1, 0))
+
+        self.server.fail_next(1, 503, match='POST')
+        result, stats = self.send('create_node', 1, 'new', retry_post=True)
+        self.assertNotEqual(result, -1)
+        self.assertEqual((stats['sent'], stats['retried']), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()